@@ -0,0 +1,57 @@
+"""Add indexes for child lookups, listing order and analytics filters
+
+Revision ID: 3f1c2a9b7d41
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - must match the model declarations
+INDEXES = [
+    ("ix_sub_requirements_requirement_id_order", "sub_requirements", ["requirement_id", "order"]),
+    ("ix_checklist_items_requirement_id_order", "checklist_items", ["requirement_id", "order"]),
+    ("ix_checklist_items_sub_requirement_id_order", "checklist_items", ["sub_requirement_id", "order"]),
+    ("ix_requirements_created_at_id", "requirements", ["created_at", "id"]),
+    ("ix_requirements_status", "requirements", ["status"]),
+    ("ix_requirements_priority", "requirements", ["priority"]),
+    ("ix_requirements_category", "requirements", ["category"]),
+    ("ix_requirements_owner_id", "requirements", ["owner_id"]),
+    ("ix_requirements_desired_deadline", "requirements", ["desired_deadline"]),
+    ("ix_requirement_tags_requirement_id", "requirement_tags", ["requirement_id"]),
+]
+
+
+def existing_indexes():
+    """Index names per existing table (tables are created from the models on first startup)."""
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {index["name"] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade() -> None:
+    existing = existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns)
+    # Refresh planner statistics so the new indexes are chosen
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    existing = existing_indexes()
+    for name, table, columns in reversed(INDEXES):
+        if name in existing.get(table, ()):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,51 @@
+"""Add FTS5 full-text index over requirements and attachment text
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f1c2a9b7d41
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models.search import (
+    CREATE_FTS_TABLE,
+    REQUIREMENT_TRIGGERS,
+    ATTACHMENT_TRIGGERS,
+    REBUILD_FTS,
+    DROP_FTS_TABLE,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a93'
+down_revision = '3f1c2a9b7d41'
+branch_labels = None
+depends_on = None
+
+TRIGGERS = [
+    "requirements_fts_insert",
+    "requirements_fts_update",
+    "requirements_fts_delete",
+    "attachments_fts_insert",
+    "attachments_fts_update",
+    "attachments_fts_delete",
+]
+
+
+def upgrade() -> None:
+    # SQLite only; tables missing here are created with their index on first startup
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if not {"requirements", "attachments"} <= tables:
+        return
+    for statement in [CREATE_FTS_TABLE] + REQUIREMENT_TRIGGERS + ATTACHMENT_TRIGGERS + REBUILD_FTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute(DROP_FTS_TABLE)
@@ -0,0 +1,37 @@
+"""Add heartbeat to background jobs
+
+Revision ID: a7d3f1c9e482
+Revises: e1a5c3f8d207
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3f1c9e482'
+down_revision = 'e1a5c3f8d207'
+branch_labels = None
+depends_on = None
+
+
+def job_columns():
+    """Column names of jobs, or None if the table does not exist yet."""
+    inspector = sa.inspect(op.get_bind())
+    if "jobs" not in inspector.get_table_names():
+        return None
+    return {column["name"] for column in inspector.get_columns("jobs")}
+
+
+def upgrade() -> None:
+    # Tables missing here are created with the column on first startup
+    columns = job_columns()
+    if columns is not None and "heartbeat_at" not in columns:
+        op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    if "heartbeat_at" in (job_columns() or ()):
+        with op.batch_alter_table("jobs") as batch_op:
+            batch_op.drop_column("heartbeat_at")
@@ -0,0 +1,39 @@
+"""Add index on sub_requirements.parent_id for tree reads
+
+Revision ID: c4d7e9a2b615
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7e9a2b615'
+down_revision = '8b2e4d6f1a93'
+branch_labels = None
+depends_on = None
+
+
+INDEX = "ix_sub_requirements_parent_id"
+
+
+def existing_indexes():
+    """Index names on sub_requirements, or None if the table does not exist yet."""
+    inspector = sa.inspect(op.get_bind())
+    if "sub_requirements" not in inspector.get_table_names():
+        return None
+    return {index["name"] for index in inspector.get_indexes("sub_requirements")}
+
+
+def upgrade() -> None:
+    # Tables missing here are created with the index on first startup
+    existing = existing_indexes()
+    if existing is not None and INDEX not in existing:
+        op.create_index(INDEX, "sub_requirements", ["parent_id"])
+
+
+def downgrade() -> None:
+    if INDEX in (existing_indexes() or ()):
+        op.drop_index(INDEX, table_name="sub_requirements")
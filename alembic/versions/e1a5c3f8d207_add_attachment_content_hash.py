@@ -0,0 +1,44 @@
+"""Add content hash to attachments
+
+Revision ID: e1a5c3f8d207
+Revises: c4d7e9a2b615
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models.search import ATTACHMENT_TRIGGERS
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a5c3f8d207'
+down_revision = 'c4d7e9a2b615'
+branch_labels = None
+depends_on = None
+
+
+def attachment_columns():
+    """Column names of attachments, or None if the table does not exist yet."""
+    inspector = sa.inspect(op.get_bind())
+    if "attachments" not in inspector.get_table_names():
+        return None
+    return {column["name"] for column in inspector.get_columns("attachments")}
+
+
+def upgrade() -> None:
+    # Tables missing here are created with the column on first startup
+    columns = attachment_columns()
+    if columns is not None and "content_hash" not in columns:
+        op.add_column("attachments", sa.Column("content_hash", sa.String(64), nullable=True))
+        op.create_index("ix_attachments_content_hash", "attachments", ["content_hash"])
+
+
+def downgrade() -> None:
+    if "content_hash" in (attachment_columns() or ()):
+        op.drop_index("ix_attachments_content_hash", table_name="attachments")
+        with op.batch_alter_table("attachments") as batch_op:
+            batch_op.drop_column("content_hash")
+        # SQLite rebuilds the table, dropping the search index triggers on it
+        if op.get_bind().dialect.name == "sqlite":
+            for statement in ATTACHMENT_TRIGGERS:
+                op.execute(statement)
@@ -2,7 +2,7 @@
 API v1 routes.
 """
 from fastapi import APIRouter
-from app.api.v1 import requirements, sub_requirements, checklist, uploads, analytics, auth
+from app.api.v1 import requirements, sub_requirements, checklist, uploads, jobs, analytics, auth
 
 api_router = APIRouter()
 
@@ -10,6 +10,7 @@ api_router.include_router(requirements.router, prefix="/requirements", tags=["re
 api_router.include_router(sub_requirements.router, prefix="/requirements", tags=["sub-requirements"])
 api_router.include_router(checklist.router, prefix="/requirements", tags=["checklist"])
 api_router.include_router(uploads.router, prefix="/upload", tags=["uploads"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 
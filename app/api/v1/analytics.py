@@ -1,45 +1,49 @@
 """
 Analytics API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, List
-from app.core.database import get_db
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import get_async_db, SessionLocal
 from app.services.analytics_engine import AnalyticsEngine, MLEngine
 from app.services.requirement_service import RequirementService
+from app.schemas.analytics import (
+    RevalidationRequest,
+    RevalidationResponse,
+    PredictionRequest,
+    PredictionResponse,
+)
+from app.services.bulk_validation import RevalidationFilters, RevalidationRun, revalidation_runner
+from app.services.ml_model import model_registry
+from app.repositories.requirement_repository import requirement_cache
 
 router = APIRouter()
 
 
 @router.get("/summary", response_model=Dict)
-def get_analytics_summary(db: Session = Depends(get_db)):
+async def get_analytics_summary(db: AsyncSession = Depends(get_async_db)):
     """Get summary statistics for all requirements."""
-    return AnalyticsEngine.get_summary_stats(db)
+    return await db.run_sync(AnalyticsEngine.get_summary_stats)
 
 
-@router.get("/suggestions/{requirement_id}", response_model=Dict)
-def get_suggestions(requirement_id: int, db: Session = Depends(get_db)):
-    """Get suggestions to improve a requirement."""
+def build_suggestions(db: Session, requirement_id: int) -> Optional[Dict]:
+    """Suggestions, validation and success probability for a requirement (None if not found)."""
     requirement = RequirementService.get_requirement(db, requirement_id)
     if not requirement:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Requirement not found"
-        )
-    
-    # Validate and get quality score
-    validation_result = AnalyticsEngine.validate_requirement(requirement)
+        return None
     
-    # Update quality score in database
-    if requirement.quality_score != validation_result["quality_score"]:
-        requirement.quality_score = validation_result["quality_score"]
-        db.commit()
+    # Stored validation results (recomputed in memory only if stale)
+    validation_result = AnalyticsEngine.get_validation(db, requirement)
     
     # Get suggestions
-    suggestions = AnalyticsEngine.get_suggestions(requirement)
+    suggestions = AnalyticsEngine.get_suggestions(requirement, validation_result)
     
-    # Get ML prediction (placeholder)
-    success_probability = MLEngine.predict_success_probability(requirement)
+    # Get ML prediction
+    success_probability = MLEngine.predict_success_probability(db, requirement)
     
     return {
         "requirement_id": requirement_id,
@@ -52,22 +56,167 @@ def get_suggestions(requirement_id: int, db: Session = Depends(get_db)):
     }
 
 
-@router.post("/validate/{requirement_id}", response_model=Dict)
-def validate_requirement(requirement_id: int, db: Session = Depends(get_db)):
-    """Validate a requirement and update quality score."""
+@router.get("/suggestions/{requirement_id}", response_model=Dict)
+async def get_suggestions(requirement_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get suggestions to improve a requirement."""
+    result = await db.run_sync(build_suggestions, requirement_id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requirement not found"
+        )
+    return result
+
+
+def revalidate_one(db: Session, requirement_id: int) -> Optional[Dict]:
+    """Re-validate a requirement and store results and quality score (None if not found)."""
     requirement = RequirementService.get_requirement(db, requirement_id)
     if not requirement:
+        return None
+    return AnalyticsEngine.refresh_validation(db, requirement)
+
+
+@router.post("/validate/{requirement_id}", response_model=Dict)
+async def validate_requirement(requirement_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Validate a requirement and update quality score."""
+    result = await db.run_sync(revalidate_one, requirement_id)
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Requirement not found"
         )
+    return result
+
+
+def revalidation_response(run: RevalidationRun) -> Dict:
+    """Status and progress of a background re-validation."""
+    progress = run.progress
+    return {
+        "id": run.id,
+        "status": run.status,
+        "total": progress.total,
+        "processed": progress.processed,
+        "updated": progress.updated,
+        "last_id": progress.last_id,
+        "percent": progress.percent,
+        "finished": progress.finished,
+        "error": run.error,
+    }
+
+
+@router.post("/revalidate", response_model=RevalidationResponse, status_code=status.HTTP_202_ACCEPTED)
+def revalidate_requirements(request: RevalidationRequest, response: Response):
+    """
+    Start rescoring all requirements matching the filters, in keyset-ordered
+    chunks in the background (one run at a time). Poll the URL in the
+    Location header for progress.
+    """
+    filters = RevalidationFilters(
+        project_name=request.project_name,
+        status=request.status,
+        modified_since=request.modified_since,
+    )
+    workers = settings.REVALIDATION_WORKERS if request.workers is None else request.workers
+    run = revalidation_runner.start(filters, request.chunk_size, workers, resume=request.resume)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A bulk re-validation is already running"
+        )
+    response.headers["Location"] = f"/api/v1/analytics/revalidate/{run.id}"
+    return revalidation_response(run)
+
+
+@router.get("/revalidate/{run_id}", response_model=RevalidationResponse)
+def get_revalidation(run_id: int):
+    """Get the status and progress of a background re-validation."""
+    run = revalidation_runner.get(run_id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Re-validation run not found"
+        )
+    return revalidation_response(run)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Decimal places kept in returned probabilities
+PREDICTION_PRECISION = 4
+
+
+async def iter_prediction_chunks(bind, requirement_ids: Optional[List[int]],
+                                 filters: Dict) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Yield (ids, probabilities) chunks (see MLEngine.iter_predictions) from a
+    session this generator opens on `bind` and closes when it finishes or is
+    closed. Each chunk is computed in its own run_sync call.
+    """
+    async with AsyncSession(bind) as session:
+        predictions = await session.run_sync(
+            lambda sync_session: MLEngine.iter_predictions(sync_session, requirement_ids, **filters)
+        )
+        try:
+            while (chunk := await session.run_sync(lambda _: next(predictions, None))) is not None:
+                yield chunk
+        finally:
+            await session.run_sync(lambda _: predictions.close())
+
+
+@router.post("/predict", response_model=PredictionResponse)
+async def predict_success(
+    request: PredictionRequest,
+    accept: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Predict success probabilities for many requirements at once.
+    Send `Accept: application/x-ndjson` to stream one line per requirement
+    instead of building the whole response in memory.
+    """
+    filters = {
+        "project_name": request.project_name,
+        "status": request.status,
+        "category": request.category,
+    }
+    # A session of its own: a streamed response outlives the request-scoped one
+    chunks = iter_prediction_chunks(db.bind, request.requirement_ids, filters)
     
-    validation_result = AnalyticsEngine.validate_requirement(requirement)
-    
-    # Update quality score
-    requirement.quality_score = validation_result["quality_score"]
-    db.commit()
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        async def lines():
+            async for ids, probabilities in chunks:
+                rounded = probabilities.round(PREDICTION_PRECISION).tolist()
+                yield "".join(
+                    json.dumps({"id": requirement_id, "probability": probability}) + "\n"
+                    for requirement_id, probability in zip(ids.tolist(), rounded)
+                )
+        
+        return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
     
-    return validation_result
+    result = {}
+    async for ids, probabilities in chunks:
+        result.update(zip(ids.tolist(), probabilities.round(PREDICTION_PRECISION).tolist()))
+    return {
+        "model_version": model_registry.status()["version"],
+        "count": len(result),
+        "predictions": result,
+    }
+
+
+@router.get("/cache", response_model=Dict)
+async def get_cache_stats():
+    """Get size and hit/miss metrics of the requirement response cache (this process)."""
+    return {"requirements": requirement_cache.stats()}
+
+
+@router.get("/model", response_model=Dict)
+def get_model_status():
+    """Get the version and training state of the success-probability model."""
+    return model_registry.status()
 
 
+@router.post("/model/retrain", response_model=Dict, status_code=status.HTTP_202_ACCEPTED)
+def retrain_model(full: bool = False):
+    """Retrain the success-probability model in the background and hot-swap it when done."""
+    started = model_registry.trigger_retrain(SessionLocal, full=full)
+    return {"started": started, **model_registry.status()}
@@ -0,0 +1,25 @@
+"""
+Background job API endpoints.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.repositories.job_repository import JobRepository
+from app.schemas.job import JobResponse
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the status of a background job (and the created requirement once done)."""
+    job = await db.run_sync(JobRepository.get, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
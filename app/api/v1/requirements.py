@@ -1,42 +1,220 @@
 """
 Requirements API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import get_db, get_async_db
+from app.services.async_requirement_service import AsyncRequirementService
 from app.services.requirement_service import RequirementService
-from app.schemas.requirement import RequirementCreate, RequirementUpdate, RequirementResponse
+from app.schemas.requirement import (
+    RequirementCreate,
+    RequirementUpdate,
+    RequirementResponse,
+    RequirementSummary,
+    BulkCreateResponse,
+    RequirementSearchResponse,
+    requirement_projection,
+)
+from app.models.requirement import RequirementStatus
 
 router = APIRouter()
 
 
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse the `fields` projection parameter: "summary" for RequirementSummary,
+    or a comma-separated list of RequirementResponse fields. None means full responses.
+    """
+    if not fields or fields == "full":
+        return None
+    if fields == "summary":
+        return tuple(RequirementSummary.model_fields)
+    
+    names = tuple(dict.fromkeys(["id"] + [name.strip() for name in fields.split(",") if name.strip()]))
+    unknown = [name for name in names if name not in RequirementResponse.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return names
+
+
 @router.post("/", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED)
-def create_requirement(
+async def create_requirement(
     requirement: RequirementCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new requirement."""
-    return RequirementService.create_requirement(db, requirement)
+    return await AsyncRequirementService.create_requirement(db, requirement)
 
 
-@router.get("/", response_model=List[RequirementResponse])
-def get_requirements(
-    skip: int = 0,
-    limit: int = 100,
+def parse_bulk_body(body: bytes, content_type: str) -> List[Any]:
+    """
+    Parse a bulk request body: a JSON array, or NDJSON (one object per line).
+    Unparseable NDJSON lines are returned as ValueError instances so they are
+    reported per item.
+    """
+    if "ndjson" in content_type:
+        items = []
+        for line in body.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(e)
+        return items
+    
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+    return items
+
+
+def validate_bulk_items(items: List[Any]) -> Tuple[List[Tuple[int, RequirementCreate]], List[Dict[str, Any]]]:
+    """Validate every item up front. Returns (index, requirement) pairs and per-item errors."""
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        if isinstance(item, ValueError):
+            errors.append({"index": index, "errors": [{"type": "json_invalid", "msg": str(item)}]})
+            continue
+        try:
+            valid.append((index, RequirementCreate.model_validate(item)))
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.errors(include_url=False, include_context=False)})
+    return valid, errors
+
+
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_requirements(
+    request: Request,
+    atomic: bool = Query(True, description="Reject the whole request if any item is invalid"),
     db: Session = Depends(get_db)
 ):
-    """Get all requirements."""
-    return RequirementService.get_all_requirements(db, skip, limit)
+    """
+    Create many requirements in one transaction.
+    The body is a JSON array of requirements, or NDJSON with
+    `Content-Type: application/x-ndjson`. Every item is validated before
+    anything is written. With `atomic=false`, valid items are created and
+    invalid ones are reported by index.
+    Parsing, validation and scoring run in the threadpool, on a sync session,
+    so a large batch does not block the event loop.
+    """
+    items = await run_in_threadpool(parse_bulk_body, await request.body(), request.headers.get("content-type", ""))
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request"
+        )
+    
+    valid, errors = await run_in_threadpool(validate_bulk_items, items)
+    if errors and atomic:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=jsonable_encoder(errors)
+        )
+    
+    ids = await run_in_threadpool(
+        RequirementService.bulk_create_requirements,
+        db,
+        [requirement for _, requirement in valid],
+        chunk_size=settings.BULK_INSERT_CHUNK_SIZE,
+    )
+    return {"created": len(ids), "ids": ids, "errors": errors}
+
+
+@router.get("/", response_model=List[RequirementResponse])
+async def get_requirements(
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0, description="Legacy offset pagination; prefer cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = Query(
+        None, description='"summary", or comma-separated fields to return (default: full responses)'
+    ),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get requirements, newest first.
+    Pages are cursor-based: pass the X-Next-Cursor header of a response as
+    `cursor` to get the next page (the header is absent on the last page).
+    With `fields`, only those columns and relationships are loaded and returned.
+    """
+    projection = parse_fields(fields)
+    load = projection or "response"
+    
+    next_cursor = None
+    if skip is not None:
+        requirements = await AsyncRequirementService.get_all_requirements(db, skip, limit, load=load)
+    else:
+        try:
+            requirements, next_cursor = await AsyncRequirementService.get_requirements_page(
+                db, cursor, limit, load=load
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if projection is None:
+        return requirements
+    
+    # Projected items bypass response_model, which requires every field
+    model = requirement_projection(projection)
+    return JSONResponse(
+        content=jsonable_encoder([model.model_validate(requirement) for requirement in requirements]),
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+    )
+
+
+@router.get("/search", response_model=RequirementSearchResponse)
+async def search_requirements(
+    q: str = Query(..., min_length=1, description="Words to find; a trailing * matches prefixes"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    project_name: Optional[str] = None,
+    status_filter: Optional[RequirementStatus] = Query(None, alias="status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over requirement title, description, success criteria,
+    constraints and attachment text, best match first, with highlighted snippets.
+    """
+    try:
+        total, hits = await AsyncRequirementService.search_requirements(
+            db, q, limit, offset, project_name=project_name, status=status_filter
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query has no searchable words"
+        )
+    return {"query": q, "total": total, "limit": limit, "offset": offset, "results": hits}
 
 
 @router.get("/{requirement_id}", response_model=RequirementResponse)
-def get_requirement(
+async def get_requirement(
     requirement_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a requirement by ID."""
-    requirement = RequirementService.get_requirement(db, requirement_id)
+    requirement = await AsyncRequirementService.get_requirement_response(db, requirement_id)
     if not requirement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -46,13 +224,13 @@ def get_requirement(
 
 
 @router.put("/{requirement_id}", response_model=RequirementResponse)
-def update_requirement(
+async def update_requirement(
     requirement_id: int,
     requirement_update: RequirementUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a requirement."""
-    requirement = RequirementService.update_requirement(db, requirement_id, requirement_update)
+    requirement = await AsyncRequirementService.update_requirement(db, requirement_id, requirement_update)
     if not requirement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,12 +240,12 @@ def update_requirement(
 
 
 @router.delete("/{requirement_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_requirement(
+async def delete_requirement(
     requirement_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a requirement."""
-    success = RequirementService.delete_requirement(db, requirement_id)
+    success = await AsyncRequirementService.delete_requirement(db, requirement_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,24 +1,34 @@
 """
 Sub-requirements API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import get_db, get_async_db
+from app.services.async_requirement_service import AsyncRequirementService
 from app.services.requirement_service import RequirementService
-from app.schemas.requirement import SubRequirementCreate, SubRequirementUpdate, SubRequirementResponse
+from app.schemas.requirement import (
+    SubRequirementCreate,
+    SubRequirementUpdate,
+    SubRequirementResponse,
+    RequirementTreeCreate,
+    RequirementTreeResponse,
+    RequirementTree,
+)
 
 router = APIRouter()
 
 
 @router.post("/{requirement_id}/sub-requirements", response_model=SubRequirementResponse, status_code=status.HTTP_201_CREATED)
-def create_sub_requirement(
+async def create_sub_requirement(
     requirement_id: int,
     sub_requirement: SubRequirementCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new sub-requirement."""
-    result = RequirementService.create_sub_requirement(db, requirement_id, sub_requirement)
+    result = await AsyncRequirementService.create_sub_requirement(db, requirement_id, sub_requirement)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -27,23 +37,71 @@ def create_sub_requirement(
     return result
 
 
-@router.get("/{requirement_id}/sub-requirements", response_model=List[SubRequirementResponse])
-def get_sub_requirements(
+@router.post("/{requirement_id}/tree", response_model=RequirementTreeResponse, status_code=status.HTTP_201_CREATED)
+def create_requirement_tree(
     requirement_id: int,
+    tree: RequirementTreeCreate,
     db: Session = Depends(get_db)
+):
+    """
+    Create a whole work breakdown in one request: nested sub-requirements
+    (`children`) with their checklist items, plus requirement-level checklist items.
+    A sync handler on a sync session, so building a large tree runs in the
+    threadpool rather than on the event loop.
+    """
+    if tree.node_count() > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} nodes per request"
+        )
+    
+    result = RequirementService.create_requirement_tree(
+        db, requirement_id, tree, chunk_size=settings.BULK_INSERT_CHUNK_SIZE
+    )
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parent requirement not found"
+        )
+    return result
+
+
+@router.get("/{requirement_id}/tree", response_model=RequirementTree)
+async def get_requirement_tree(
+    requirement_id: int,
+    depth: Optional[int] = Query(None, ge=1, le=settings.TREE_MAX_DEPTH, description="Levels of sub-requirements to return"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a requirement's whole work breakdown in one query: nested sub-requirements
+    with their checklist items, and roll-up counts per node (which also cover
+    levels cut off by `depth`).
+    """
+    tree = await AsyncRequirementService.get_requirement_tree(db, requirement_id, depth)
+    if not tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Requirement not found"
+        )
+    return tree
+
+
+@router.get("/{requirement_id}/sub-requirements", response_model=List[SubRequirementResponse])
+async def get_sub_requirements(
+    requirement_id: int,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all sub-requirements for a requirement."""
-    return RequirementService.get_sub_requirements(db, requirement_id)
+    return await AsyncRequirementService.get_sub_requirements(db, requirement_id, load="response")
 
 
 @router.get("/sub-requirements/{sub_requirement_id}", response_model=SubRequirementResponse)
-def get_sub_requirement(
+async def get_sub_requirement(
     sub_requirement_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a sub-requirement by ID."""
-    from app.repositories.requirement_repository import SubRequirementRepository
-    sub_req = SubRequirementRepository.get(db, sub_requirement_id)
+    sub_req = await AsyncRequirementService.get_sub_requirement(db, sub_requirement_id)
     if not sub_req:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,13 +111,13 @@ def get_sub_requirement(
 
 
 @router.put("/sub-requirements/{sub_requirement_id}", response_model=SubRequirementResponse)
-def update_sub_requirement(
+async def update_sub_requirement(
     sub_requirement_id: int,
     sub_requirement_update: SubRequirementUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a sub-requirement."""
-    result = RequirementService.update_sub_requirement(
+    result = await AsyncRequirementService.update_sub_requirement(
         db, sub_requirement_id, sub_requirement_update.dict(exclude_unset=True)
     )
     if not result:
@@ -71,12 +129,12 @@ def update_sub_requirement(
 
 
 @router.delete("/sub-requirements/{sub_requirement_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_sub_requirement(
+async def delete_sub_requirement(
     sub_requirement_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a sub-requirement."""
-    success = RequirementService.delete_sub_requirement(db, sub_requirement_id)
+    success = await AsyncRequirementService.delete_sub_requirement(db, sub_requirement_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
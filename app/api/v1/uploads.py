@@ -1,19 +1,21 @@
 """
 File upload API endpoints.
 """
-import os
-import shutil
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
-from app.services.document_parser import DocumentParser
+from app.models.job import JobKind
+from app.models.requirement import Priority
 from app.services.image_processor import ImageProcessor
-from app.services.requirement_service import RequirementService
-from app.schemas.requirement import RequirementCreate, RequirementResponse
-from app.models.attachment import Attachment
+from app.services.job_queue import JobQueueFullError, job_queue
+from app.services.upload_processing import ingest_document, ingest_image, upload_payload
+from app.services.upload_storage import StoredUpload, UploadTooLargeError, store_upload
+from app.schemas.job import JobResponse
+from app.schemas.requirement import RequirementResponse
 
 router = APIRouter()
 
@@ -21,15 +23,61 @@ router = APIRouter()
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Documented response of uploads processed in the background
+ACCEPTED_RESPONSE = {
+    status.HTTP_202_ACCEPTED: {"model": JobResponse, "description": "Queued for background processing"}
+}
 
-@router.post("/document", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED)
+
+async def save_upload(file: UploadFile) -> StoredUpload:
+    """Stream an uploaded file into the upload directory, enforcing MAX_UPLOAD_SIZE."""
+    try:
+        return await store_upload(file, UPLOAD_DIR)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error saving file: {str(e)}"
+        )
+
+
+async def queue_upload(db: AsyncSession, kind: JobKind, stored: StoredUpload, project_name: str,
+                       business_owner: str, priority: Priority) -> JSONResponse:
+    """Queue a stored upload for processing; 202 with the job, whose status URL is in Location."""
+    try:
+        job = await job_queue.submit(db, kind, upload_payload(stored, project_name, business_owner), priority)
+    except JobQueueFullError as e:
+        # The blob may be shared with other attachments; garbage collection removes it if unused
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(JobResponse.model_validate(job)),
+        headers={"Location": f"/api/v1/jobs/{job.id}"}
+    )
+
+
+@router.post("/document", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED,
+             responses=ACCEPTED_RESPONSE)
 async def upload_document(
     file: UploadFile = File(...),
     project_name: str = Form(...),
     business_owner: str = Form(...),
-    db: Session = Depends(get_db)
+    background: bool = Form(False),
+    priority: Priority = Form(Priority.MEDIUM),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Upload and parse a requirement document in special format."""
+    """
+    Upload and parse a requirement document in special format.
+    With `background`, parsing is queued (at `priority`) and a job is returned with 202.
+    """
     # Validate file type
     allowed_extensions = {'.pdf', '.docx', '.doc', '.txt'}
     file_ext = Path(file.filename).suffix.lower()
@@ -40,61 +88,33 @@ async def upload_document(
             detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
         )
     
-    # Save file
-    file_path = UPLOAD_DIR / f"{file.filename}"
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error saving file: {str(e)}"
-        )
+    stored = await save_upload(file)
+    if background:
+        return await queue_upload(db, JobKind.DOCUMENT, stored, project_name, business_owner, priority)
     
-    # Parse document
     try:
-        parsed_data = DocumentParser.parse_document(str(file_path))
-        requirement_data = DocumentParser.map_to_requirement_create(
-            parsed_data, project_name, business_owner
-        )
-    except Exception as e:
-        # Clean up file on error
-        if file_path.exists():
-            file_path.unlink()
+        return await ingest_document(db, stored, project_name, business_owner)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error parsing document: {str(e)}"
+            detail=str(e)
         )
-    
-    # Create requirement
-    requirement_create = RequirementCreate(**requirement_data)
-    requirement = RequirementService.create_requirement(db, requirement_create)
-    
-    # Create attachment record
-    attachment = Attachment(
-        requirement_id=requirement.id,
-        filename=file.filename,
-        file_path=str(file_path),
-        file_type=file_ext[1:],  # Remove dot
-        file_size=file_path.stat().st_size,
-        mime_type=file.content_type,
-        is_image="False",
-        processing_status="processed"
-    )
-    db.add(attachment)
-    db.commit()
-    
-    return requirement
 
 
-@router.post("/image", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/image", response_model=RequirementResponse, status_code=status.HTTP_201_CREATED,
+             responses=ACCEPTED_RESPONSE)
 async def upload_image(
     file: UploadFile = File(...),
     project_name: str = Form(...),
     business_owner: str = Form(...),
-    db: Session = Depends(get_db)
+    background: bool = Form(False),
+    priority: Priority = Form(Priority.MEDIUM),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Upload an image, perform OCR, and create requirement from extracted text."""
+    """
+    Upload an image, perform OCR, and create requirement from extracted text.
+    With `background`, OCR is queued (at `priority`) and a job is returned with 202.
+    """
     # Validate file type
     if not ImageProcessor.is_image_file(file.filename):
         raise HTTPException(
@@ -102,55 +122,9 @@ async def upload_image(
             detail="File is not a valid image"
         )
     
-    # Save file
-    file_path = UPLOAD_DIR / f"{file.filename}"
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error saving file: {str(e)}"
-        )
-    
-    # Process image (OCR)
-    processing_result = ImageProcessor.process_image_upload(str(file_path))
-    extracted_text = processing_result.get("extracted_text", "")
-    processing_status = processing_result.get("processing_status", "unknown")
-    
-    if not extracted_text:
-        # Still create requirement but with note about OCR failure
-        description = f"[OCR processing failed: {processing_status}] Please review the uploaded image manually."
-    else:
-        description = f"Extracted from image via OCR:\n\n{extracted_text}"
+    stored = await save_upload(file)
+    if background:
+        return await queue_upload(db, JobKind.IMAGE, stored, project_name, business_owner, priority)
     
-    # Create requirement from extracted text
-    requirement_data = {
-        "project_name": project_name,
-        "business_owner": business_owner,
-        "title": extracted_text[:100] if extracted_text else "Requirement from Image",
-        "description": description,
-        "category": "image_import",
-    }
-    
-    requirement_create = RequirementCreate(**requirement_data)
-    requirement = RequirementService.create_requirement(db, requirement_create)
-    
-    # Create attachment record
-    attachment = Attachment(
-        requirement_id=requirement.id,
-        filename=file.filename,
-        file_path=str(file_path),
-        file_type=Path(file.filename).suffix[1:].lower(),
-        file_size=file_path.stat().st_size,
-        mime_type=file.content_type,
-        is_image="True",
-        extracted_text=extracted_text,
-        processing_status=processing_status
-    )
-    db.add(attachment)
-    db.commit()
-    
-    return requirement
-
+    return await ingest_image(db, stored, project_name, business_owner)
 
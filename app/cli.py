@@ -0,0 +1,136 @@
+"""
+Command-line maintenance tasks.
+
+Usage:
+    python -m app.cli rebuild-analytics [--check-only]
+    python -m app.cli revalidate [--project NAME] [--status STATUS] [--since DATE]
+                                 [--workers N] [--chunk-size N] [--checkpoint FILE] [--resume]
+    python -m app.cli train-model [--full]
+    python -m app.cli collect-uploads [--grace-seconds SECONDS]
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from app.core.config import settings
+from app.core.database import SessionLocal, engine, Base
+from app.models.requirement import RequirementStatus
+from app.repositories.analytics_repository import AnalyticsSummaryRepository
+from app.services.analytics_engine import MLEngine
+from app.services.bulk_validation import BulkRevalidator, RevalidationFilters
+from app.services.upload_storage import collect_garbage
+
+
+def rebuild_analytics(args) -> int:
+    """Check the analytics summary for drift and rebuild it from scratch."""
+    db = SessionLocal()
+    try:
+        drift = AnalyticsSummaryRepository.check_drift(db)
+        for item in drift:
+            print(
+                f"drift: {item['dimension']}/{item['bucket']} {item['field']} "
+                f"stored={item['stored']} actual={item['actual']}"
+            )
+        print(f"{len(drift)} drifted counter(s) found")
+        
+        if args.check_only:
+            return 1 if drift else 0
+        
+        buckets = AnalyticsSummaryRepository.rebuild(db)
+        print(f"Analytics summary rebuilt: {buckets} bucket(s)")
+        return 0
+    finally:
+        db.close()
+
+
+def revalidate(args) -> int:
+    """Rescore requirement quality across the corpus."""
+    filters = RevalidationFilters(
+        project_name=args.project,
+        status=RequirementStatus(args.status) if args.status else None,
+        modified_since=datetime.fromisoformat(args.since) if args.since else None,
+    )
+    
+    def report(progress):
+        print(
+            f"{progress.processed}/{progress.total} ({progress.percent}%) processed, "
+            f"{progress.updated} updated, last id {progress.last_id}"
+        )
+    
+    db = SessionLocal()
+    try:
+        revalidator = BulkRevalidator(
+            db,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            progress_callback=report,
+        )
+        progress = revalidator.run(filters, resume=args.resume)
+        print(f"Done: {progress.processed} processed, {progress.updated} updated")
+        return 0
+    finally:
+        db.close()
+
+
+def train_model(args) -> int:
+    """Train the success-probability model and save a new version."""
+    db = SessionLocal()
+    try:
+        result = MLEngine.train_model(db, full=args.full)
+        if not result["trained"]:
+            print("No new outcomes to train on")
+        print(f"Model version {result['version']}: {result['trained_samples']} sample(s) trained")
+        return 0
+    finally:
+        db.close()
+
+
+def collect_uploads(args) -> int:
+    """Delete stored upload files that no attachment references any more."""
+    db = SessionLocal()
+    try:
+        result = collect_garbage(db, Path(settings.UPLOAD_DIR), args.grace_seconds)
+        print(f"{result['blobs_removed']} unused blob(s) and {result['files_removed']} file(s) removed")
+        return 0
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    """Entry point for maintenance commands."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="PRATT maintenance tasks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    rebuild = subparsers.add_parser("rebuild-analytics", help="Recompute the analytics summary table")
+    rebuild.add_argument("--check-only", action="store_true", help="Only report drift, do not rebuild")
+    rebuild.set_defaults(func=rebuild_analytics)
+    
+    rescore = subparsers.add_parser("revalidate", help="Rescore requirement quality in bulk")
+    rescore.add_argument("--project", help="Only requirements of this project")
+    rescore.add_argument("--status", choices=[s.value for s in RequirementStatus], help="Only requirements with this status")
+    rescore.add_argument("--since", help="Only requirements modified since this ISO date/time")
+    rescore.add_argument("--workers", type=int, default=0, help="Worker processes for rule evaluation (0 = in-process)")
+    rescore.add_argument("--chunk-size", type=int, default=500, help="Requirements per chunk")
+    rescore.add_argument("--checkpoint", help="Checkpoint file for resuming an interrupted run")
+    rescore.add_argument("--resume", action="store_true", help="Resume from the checkpoint file")
+    rescore.set_defaults(func=revalidate)
+    
+    train = subparsers.add_parser("train-model", help="Train the success-probability model")
+    train.add_argument("--full", action="store_true", help="Retrain from scratch instead of incrementally")
+    train.set_defaults(func=train_model)
+    
+    collect = subparsers.add_parser("collect-uploads", help="Delete stored files no attachment uses")
+    collect.add_argument(
+        "--grace-seconds", type=float, default=settings.UPLOAD_GC_GRACE_SECONDS,
+        help="Keep files touched within this many seconds (uploads in progress)"
+    )
+    collect.set_defaults(func=collect_uploads)
+    
+    args = parser.parse_args(argv)
+    Base.metadata.create_all(bind=engine)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,9 +11,29 @@ class Settings(BaseSettings):
     # App
     APP_NAME: str = "PRATT - IDCC Requirements Assistant"
     DEBUG: bool = True
+    ENVIRONMENT: str = "development"  # "production" turns SQL echo off unless DATABASE_ECHO is set
     
     # Database
     DATABASE_URL: str = "sqlite:///./pratt.db"
+    DATABASE_ECHO: Optional[bool] = None  # Log every SQL statement (default: DEBUG, never in production)
+    DATABASE_POOL_SIZE: int = 5  # Connections kept open per engine (pooled drivers only)
+    DATABASE_MAX_OVERFLOW: int = 10  # Extra connections allowed under load
+    DATABASE_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced (-1: never)
+    
+    # SQLite connection pragmas (applied on every new connection)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers no longer block on a writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; fsync at checkpoints only
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for a lock instead of "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # Page cache per connection
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # Bytes of the file read via memory mapping (0: off)
+    SQLITE_FOREIGN_KEYS: bool = True
+    QUERY_COUNT_WARNING: int = 50  # Log requests that execute more SQL statements than this
+    BULK_MAX_ITEMS: int = 10000  # Maximum items per bulk create request
+    BULK_INSERT_CHUNK_SIZE: int = 500  # Rows per executemany INSERT batch
+    REQUIREMENT_CACHE_SIZE: int = 1000  # Requirement responses cached per process (0 disables)
+    REQUIREMENT_CACHE_TTL_SECONDS: float = 30  # Bounds staleness across worker processes
+    TREE_MAX_DEPTH: int = 32  # Deepest sub-requirement level read by the tree endpoint
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -26,13 +46,47 @@ class Settings(BaseSettings):
     # File uploads
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes read and written per step while streaming an upload
+    UPLOAD_GC_GRACE_SECONDS: float = 3600  # Unreferenced files younger than this survive garbage collection
+    
+    # Document parsing
+    PARSER_WORKERS: int = 2  # Parser processes (0 parses in threads, without timeouts or memory caps)
+    PARSER_TIMEOUT_SECONDS: float = 120  # A parse running longer is killed
+    PARSER_MEMORY_LIMIT_MB: int = 1024  # Address space per parser process (0: unlimited; Unix only)
+    PARSER_MAX_TASKS_PER_WORKER: int = 100  # Parses before a parser process is replaced (0: never)
+    PDF_MAX_PAGES: int = 0  # Pages read from an uploaded PDF (0: all)
+    PDF_PAGES_PER_TASK: int = 25  # Pages per parser task; longer PDFs are split across the parser processes
+    PDF_STOP_WHEN_SECTIONS_FOUND: bool = False  # Stop reading a PDF after the page where the last section heading appears
+    
+    # Background jobs
+    JOB_DOCUMENT_WORKERS: int = 2  # Concurrent document parsing jobs
+    JOB_IMAGE_WORKERS: int = 1  # Concurrent OCR jobs
+    JOB_QUEUE_MAX_SIZE: int = 100  # Waiting jobs per kind before uploads get 503
+    JOB_MAX_ATTEMPTS: int = 3  # Starts allowed for a job interrupted by restarts
+    JOB_LEASE_SECONDS: float = 60  # A running job without a heartbeat for this long is queued again
     
     # OCR
     TESSERACT_CMD: Optional[str] = None  # Will use system default if None
     
+    # Analytics
+    AMBIGUOUS_TERMS: List[str] = []  # Extra ambiguous words/phrases for the clarity rule
+    REVALIDATION_WORKERS: int = 0  # Default worker processes for API-started bulk re-validation (0 = in its thread)
+    REVALIDATION_CHECKPOINT: str = "./revalidate.checkpoint.json"  # Progress of API-started runs, for resuming
+    
+    # ML models
+    MODEL_DIR: str = "./models"
+    MODEL_RELOAD_SECONDS: int = 30  # How often workers check for a newer model version
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
+    
+    @property
+    def sql_echo(self) -> bool:
+        """Whether engines log SQL statements."""
+        if self.DATABASE_ECHO is not None:
+            return self.DATABASE_ECHO
+        return self.DEBUG and self.ENVIRONMENT != "production"
 
 
 settings = Settings()
@@ -1,21 +1,93 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.config import settings
 
-# Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG,
+# Async drivers for the sync database URLs
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Get the async-driver form of a database URL (unchanged if it already names a driver)."""
+    scheme, _, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMA settings for new SQLite connections, from the database profile."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # Negative: size in KiB rather than pages
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "foreign_keys": "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF",
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect event: apply the SQLite pragmas to a new DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Keyword arguments for create_engine/create_async_engine from the database profile."""
+    options: Dict[str, Any] = {"echo": settings.sql_echo}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.get_driver_name() == "pysqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    pool_class = parsed.get_dialect().get_pool_class(parsed)
+    if parsed.get_driver_name() == "aiosqlite" and pool_class is NullPool:
+        # aiosqlite opens file databases unpooled; pool them so connects and pragmas are paid once
+        pool_class = options["poolclass"] = AsyncAdaptedQueuePool
+    if issubclass(pool_class, QueuePool):
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        )
+    return options
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """Register the SQLite pragmas on a (sync) engine; other backends are unchanged."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+# Create engine (sync: scripts, CLI, Alembic, background threads)
+engine = configure_engine(create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)))
+
+# Async engine (API and web handlers)
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(async_database_url(settings.DATABASE_URL)),
 )
+configure_engine(async_engine.sync_engine)
 
-# Session factory
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Objects stay usable after commit: async handlers cannot lazy-load during serialization
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -29,3 +101,7 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,43 @@
+"""
+SQL statement counting, used to detect N+1 query regressions.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Collects the SQL statements executed while it is active."""
+    
+    def __init__(self):
+        self.statements: List[str] = []
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+# Counters active in the current context (request, test, ...)
+_active_counters: ContextVar[Tuple[QueryCounter, ...]] = ContextVar("active_query_counters", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_counters.get():
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count statements executed on any engine within the block (and in threads
+    or tasks started from it that copy the context, e.g. FastAPI's threadpool).
+    """
+    counter = QueryCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
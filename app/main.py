@@ -6,9 +6,15 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import logging
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, async_engine, Base, SessionLocal
+from app.core.query_counter import count_queries
+from app.repositories.analytics_repository import AnalyticsSummaryRepository
+from app.repositories.search_repository import SearchRepository
+from app.services.job_queue import job_queue
+from app.services.parsing_executor import parsing_executor
 from app.api.v1 import api_router
 
 
@@ -17,8 +23,25 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     # Create tables on startup
     Base.metadata.create_all(bind=engine)
+    # Populate the analytics summary for databases created before it existed
+    db = SessionLocal()
+    try:
+        if not AnalyticsSummaryRepository.get_all(db):
+            AnalyticsSummaryRepository.rebuild(db)
+        # Build the full-text search index for databases created before it existed
+        SearchRepository.ensure_index(db)
+    finally:
+        db.close()
+    # Start background job workers, resuming jobs left unfinished by the last run
+    await job_queue.start()
     yield
-    # Cleanup on shutdown if needed
+    await job_queue.stop()
+    parsing_executor.shutdown()
+    # Close pooled async connections; their aiosqlite threads would otherwise keep the process alive
+    await async_engine.dispose()
+
+
+logger = logging.getLogger(__name__)
 
 
 app = FastAPI(
@@ -37,6 +60,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Query count guard
+@app.middleware("http")
+async def query_count_guard(request: Request, call_next):
+    """
+    Count SQL statements per request and flag endpoints that exceed the budget (likely N+1).
+    The count is checked once the response body is finished, so statements run
+    while a streamed body is produced are included. X-Query-Count (with DEBUG)
+    is sent with the headers and so only covers statements run before them.
+    """
+    with count_queries() as counter:
+        response = await call_next(request)
+    body = response.body_iterator
+    
+    async def counted_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            if counter.count > settings.QUERY_COUNT_WARNING:
+                logger.warning("%s %s executed %d SQL statements", request.method, request.url.path, counter.count)
+    
+    response.body_iterator = counted_body()
+    if settings.DEBUG:
+        response.headers["X-Query-Count"] = str(counter.count)
+    return response
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -2,18 +2,29 @@
 Database models.
 """
 from app.models.user import User
-from app.models.requirement import Requirement, SubRequirement, ChecklistItem
+from app.models.requirement import Requirement, SubRequirement, ChecklistItem, RequirementValidation
 from app.models.attachment import Attachment
+from app.models.blob import Blob, ProcessingResult
 from app.models.tag import Tag, RequirementTag
+from app.models.analytics import AnalyticsSummary
+from app.models.job import Job, JobKind, JobStatus
+from app.models import search  # Registers the full-text index DDL with the tables
 
 __all__ = [
     "User",
     "Requirement",
     "SubRequirement",
     "ChecklistItem",
+    "RequirementValidation",
     "Attachment",
+    "Blob",
+    "ProcessingResult",
     "Tag",
     "RequirementTag",
+    "AnalyticsSummary",
+    "Job",
+    "JobKind",
+    "JobStatus",
 ]
 
 
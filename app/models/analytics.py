@@ -0,0 +1,26 @@
+"""
+Analytics summary model.
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AnalyticsSummary(Base):
+    """
+    Materialized analytics counters, one row per dimension bucket.
+    The "total" dimension has a single "all" bucket covering every requirement.
+    """
+    
+    __tablename__ = "analytics_summary"
+    
+    dimension = Column(String, primary_key=True)  # total, priority, status, category, project
+    bucket = Column(String, primary_key=True)
+    requirement_count = Column(Integer, default=0, nullable=False)
+    quality_score_sum = Column(Integer, default=0, nullable=False)
+    quality_score_count = Column(Integer, default=0, nullable=False)
+    sub_requirement_count = Column(Integer, default=0, nullable=False)
+    checklist_item_count = Column(Integer, default=0, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
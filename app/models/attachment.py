@@ -19,6 +19,7 @@ class Attachment(Base):
     file_type = Column(String, nullable=False)  # pdf, docx, image, etc.
     file_size = Column(Integer, nullable=False)  # in bytes
     mime_type = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the file contents
     
     # For image processing
     is_image = Column(String, default="False")  # Boolean-like string for SQLite compatibility
@@ -0,0 +1,57 @@
+"""
+Content-addressed upload storage models.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, event, update
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.attachment import Attachment
+
+
+class Blob(Base):
+    """
+    An uploaded file stored once under its SHA-256, however many attachments
+    reference it. `ref_count` tracks the referencing attachments.
+    """
+    
+    __tablename__ = "blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)  # in bytes
+    ref_count = Column(Integer, default=0, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class ProcessingResult(Base):
+    """Cached output of a document parser or OCR run, per content hash and processor version."""
+    
+    __tablename__ = "processing_results"
+    
+    content_hash = Column(String(64), primary_key=True)
+    processor = Column(String, primary_key=True)  # document_parser<extension> (e.g. document_parser.pdf), ocr
+    version = Column(String, primary_key=True)  # Changes whenever the processor's output would
+    result = Column(JSON, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def _add_references(connection, content_hash, count: int) -> None:
+    if content_hash:
+        connection.execute(
+            update(Blob).where(Blob.sha256 == content_hash).values(ref_count=Blob.ref_count + count)
+        )
+
+
+# Keep reference counts in step with attachment writes (including cascaded deletes)
+@event.listens_for(Attachment, "after_insert")
+def _attachment_inserted(mapper, connection, target):
+    _add_references(connection, target.content_hash, 1)
+
+
+@event.listens_for(Attachment, "after_delete")
+def _attachment_deleted(mapper, connection, target):
+    _add_references(connection, target.content_hash, -1)
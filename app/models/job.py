@@ -0,0 +1,53 @@
+"""
+Background job model.
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Index
+from sqlalchemy.sql import func
+import enum
+from app.core.database import Base
+from app.models.requirement import Priority
+
+
+class JobKind(str, enum.Enum):
+    """Kinds of background job (one worker pool each)."""
+    DOCUMENT = "document"  # Parse an uploaded document into a requirement
+    IMAGE = "image"  # OCR an uploaded image into a requirement
+
+
+class JobStatus(str, enum.Enum):
+    """Job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """
+    Persisted background job. A worker claims a queued job by moving it to
+    running, then renews `heartbeat_at` while it works; running jobs whose
+    heartbeat is older than JOB_LEASE_SECONDS (their process died) are
+    queued again.
+    """
+    
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(Enum(JobKind), nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    priority = Column(Enum(Priority), default=Priority.MEDIUM, nullable=False)
+    payload = Column(JSON, nullable=False)  # Input of the job handler
+    attempts = Column(Integer, default=0, nullable=False)  # Times the job was started
+    requirement_id = Column(Integer, ForeignKey("requirements.id", ondelete="SET NULL"), nullable=True)  # Result
+    error = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Renewed while running (UTC)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # Queued jobs and expired leases
+        Index("ix_jobs_status", "status"),
+    )
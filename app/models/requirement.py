@@ -1,7 +1,7 @@
 """
 Requirement models.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -36,20 +36,20 @@ class Requirement(Base):
     business_unit = Column(String, nullable=True)
     title = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=False)
-    priority = Column(Enum(Priority), default=Priority.MEDIUM, nullable=False)
-    status = Column(Enum(RequirementStatus), default=RequirementStatus.DRAFT, nullable=False)
+    priority = Column(Enum(Priority), default=Priority.MEDIUM, nullable=False, index=True)
+    status = Column(Enum(RequirementStatus), default=RequirementStatus.DRAFT, nullable=False, index=True)
     expected_outcome = Column(Text, nullable=True)
     success_criteria = Column(Text, nullable=True)
     constraints = Column(Text, nullable=True)
     dependencies = Column(Text, nullable=True)
-    desired_deadline = Column(DateTime(timezone=True), nullable=True)
-    category = Column(String, nullable=True)
+    desired_deadline = Column(DateTime(timezone=True), nullable=True, index=True)
+    category = Column(String, nullable=True, index=True)
     
     # Quality score from analytics engine
     quality_score = Column(Integer, nullable=True)  # 0-100
     
     # Ownership
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     created_by = Column(String, nullable=True)  # For non-authenticated users
     
     # Timestamps
@@ -62,6 +62,13 @@ class Requirement(Base):
     checklist_items = relationship("ChecklistItem", back_populates="requirement", cascade="all, delete-orphan")
     attachments = relationship("Attachment", back_populates="requirement", cascade="all, delete-orphan")
     tags = relationship("RequirementTag", back_populates="requirement", cascade="all, delete-orphan")
+    validation = relationship("RequirementValidation", back_populates="requirement", uselist=False,
+                              cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination order: newest first, id as tie-breaker
+        Index("ix_requirements_created_at_id", "created_at", "id"),
+    )
 
 
 class SubRequirement(Base):
@@ -88,6 +95,13 @@ class SubRequirement(Base):
     requirement = relationship("Requirement", back_populates="sub_requirements")
     parent = relationship("SubRequirement", remote_side=[id], backref="children")
     checklist_items = relationship("ChecklistItem", back_populates="sub_requirement", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Children of a requirement in display order
+        Index("ix_sub_requirements_requirement_id_order", "requirement_id", "order"),
+        # Nested subtasks (tree reads)
+        Index("ix_sub_requirements_parent_id", "parent_id"),
+    )
 
 
 class ChecklistItem(Base):
@@ -110,5 +124,28 @@ class ChecklistItem(Base):
     # Relationships
     requirement = relationship("Requirement", back_populates="checklist_items")
     sub_requirement = relationship("SubRequirement", back_populates="checklist_items")
+    
+    __table_args__ = (
+        # Items of a requirement / sub-requirement in display order
+        Index("ix_checklist_items_requirement_id_order", "requirement_id", "order"),
+        Index("ix_checklist_items_sub_requirement_id_order", "sub_requirement_id", "order"),
+    )
 
 
+class RequirementValidation(Base):
+    """Validation results stored when a requirement or its children change."""
+    
+    __tablename__ = "requirement_validations"
+    
+    requirement_id = Column(Integer, ForeignKey("requirements.id"), primary_key=True)
+    content_hash = Column(String(64), nullable=False)  # Hash of the validated content, detects stale results
+    quality_score = Column(Integer, nullable=False)
+    valid = Column(Boolean, nullable=False)
+    result = Column(JSON, nullable=False)  # warnings, errors, rule_results and child counts
+    valid_until = Column(DateTime(timezone=True), nullable=True)  # When time-dependent rules may change outcome
+    
+    # Timestamps
+    validated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    requirement = relationship("Requirement", back_populates="validation")
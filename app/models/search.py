@@ -0,0 +1,78 @@
+"""
+Full-text search index (SQLite FTS5).
+One row per requirement (rowid = requirement id) over its text fields and the
+extracted text of its attachments, kept in sync by triggers so every write
+path (ORM, bulk inserts, raw SQL) is covered.
+"""
+from sqlalchemy import DDL, event
+from app.models.requirement import Requirement
+from app.models.attachment import Attachment
+
+FTS_TABLE = "requirements_fts"
+
+# Indexed columns, in FTS table order
+FTS_COLUMNS = ("title", "description", "success_criteria", "constraints", "attachment_text")
+
+# Attachment text of one requirement
+_ATTACHMENT_TEXT = (
+    "(SELECT group_concat(extracted_text, ' ') FROM attachments "
+    "WHERE requirement_id = {id} AND extracted_text IS NOT NULL)"
+)
+
+CREATE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5({', '.join(FTS_COLUMNS)}, tokenize='porter unicode61')"
+)
+
+REQUIREMENT_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS requirements_fts_insert AFTER INSERT ON requirements BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, title, description, success_criteria, constraints, attachment_text)
+        VALUES (new.id, new.title, new.description, new.success_criteria, new.constraints, '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS requirements_fts_update
+        AFTER UPDATE OF title, description, success_criteria, constraints ON requirements BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, description = new.description,
+            success_criteria = new.success_criteria, constraints = new.constraints
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS requirements_fts_delete AFTER DELETE ON requirements BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+]
+
+ATTACHMENT_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS attachments_fts_insert AFTER INSERT ON attachments BEGIN
+        UPDATE {FTS_TABLE} SET attachment_text = {_ATTACHMENT_TEXT.format(id="new.requirement_id")}
+        WHERE rowid = new.requirement_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS attachments_fts_update
+        AFTER UPDATE OF extracted_text, requirement_id ON attachments BEGIN
+        UPDATE {FTS_TABLE} SET attachment_text = {_ATTACHMENT_TEXT.format(id="old.requirement_id")}
+        WHERE rowid = old.requirement_id;
+        UPDATE {FTS_TABLE} SET attachment_text = {_ATTACHMENT_TEXT.format(id="new.requirement_id")}
+        WHERE rowid = new.requirement_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS attachments_fts_delete AFTER DELETE ON attachments BEGIN
+        UPDATE {FTS_TABLE} SET attachment_text = {_ATTACHMENT_TEXT.format(id="old.requirement_id")}
+        WHERE rowid = old.requirement_id;
+    END""",
+]
+
+# Rebuild the index from the source tables (new index on an existing database)
+REBUILD_FTS = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"""INSERT INTO {FTS_TABLE} (rowid, title, description, success_criteria, constraints, attachment_text)
+        SELECT id, title, description, success_criteria, constraints,
+            coalesce({_ATTACHMENT_TEXT.format(id="requirements.id")}, '')
+        FROM requirements""",
+]
+
+DROP_FTS_TABLE = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+
+# Created and dropped with the tables it indexes (SQLite only; other backends have no search index)
+for statement in [CREATE_FTS_TABLE] + REQUIREMENT_TRIGGERS:
+    event.listen(Requirement.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in ATTACHMENT_TRIGGERS:
+    event.listen(Attachment.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Requirement.__table__, "before_drop", DDL(DROP_FTS_TABLE).execute_if(dialect="sqlite"))
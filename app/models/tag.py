@@ -30,7 +30,7 @@ class RequirementTag(Base):
     __tablename__ = "requirement_tags"
     
     id = Column(Integer, primary_key=True, index=True)
-    requirement_id = Column(Integer, ForeignKey("requirements.id"), nullable=False)
+    requirement_id = Column(Integer, ForeignKey("requirements.id"), nullable=False, index=True)
     tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False)
     
     # Timestamps
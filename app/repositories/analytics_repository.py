@@ -0,0 +1,282 @@
+"""
+Repository for the materialized analytics summary.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.analytics import AnalyticsSummary
+from app.models.requirement import Requirement, SubRequirement, ChecklistItem
+
+COUNTER_FIELDS = (
+    "requirement_count",
+    "quality_score_sum",
+    "quality_score_count",
+    "sub_requirement_count",
+    "checklist_item_count",
+)
+
+TOTAL_DIMENSION = "total"
+TOTAL_BUCKET = "all"
+
+# INSERT ... ON CONFLICT DO UPDATE constructs per dialect
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+class AnalyticsSummaryRepository:
+    """
+    Repository for analytics summary counters.
+    Counters are adjusted inside the caller's transaction; the caller commits.
+    """
+
+    DIMENSIONS = {
+        "priority": Requirement.priority,
+        "status": Requirement.status,
+        "category": Requirement.category,
+        "project": Requirement.project_name,
+    }
+
+    @staticmethod
+    def bucket_key(dimension: str, value: Any) -> str:
+        """Normalize a column value to its bucket name."""
+        if dimension == "category":
+            return value or "uncategorized"
+        if value is None:
+            return "unknown"
+        return value.value if hasattr(value, "value") else str(value)
+
+    @staticmethod
+    def requirement_buckets(requirement: Any) -> Dict[str, str]:
+        """Get the bucket a requirement (object or column dict) falls into for every dimension."""
+        buckets = {TOTAL_DIMENSION: TOTAL_BUCKET}
+        for dimension, column in AnalyticsSummaryRepository.DIMENSIONS.items():
+            if isinstance(requirement, dict):
+                value = requirement.get(column.key)
+            else:
+                value = getattr(requirement, column.key)
+            buckets[dimension] = AnalyticsSummaryRepository.bucket_key(dimension, value)
+        return buckets
+
+    @staticmethod
+    def snapshot(requirement: Requirement) -> Tuple[Dict[str, str], Optional[int]]:
+        """Capture the buckets and quality score of a requirement before it changes."""
+        return AnalyticsSummaryRepository.requirement_buckets(requirement), requirement.quality_score
+
+    @staticmethod
+    def adjust(db: Session, buckets: Dict[str, str], **deltas: int) -> None:
+        """
+        Add deltas to the counters of every given bucket.
+        Each bucket is upserted with `counter = counter + delta` in SQL, so
+        concurrent transactions never overwrite each other's changes.
+        """
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return
+
+        insert = UPSERT_INSERTS[db.get_bind().dialect.name]
+        for dimension, bucket in buckets.items():
+            statement = insert(AnalyticsSummary).values(
+                dimension=dimension, bucket=bucket, **{field: deltas.get(field, 0) for field in COUNTER_FIELDS}
+            )
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[AnalyticsSummary.dimension, AnalyticsSummary.bucket],
+                set_={
+                    **{field: getattr(AnalyticsSummary, field) + statement.excluded[field] for field in deltas},
+                    "updated_at": func.now(),
+                },
+            ))
+
+    @staticmethod
+    def child_counts(db: Session, requirement_id: int) -> Tuple[int, int]:
+        """Get the number of sub-requirements and checklist items of a requirement."""
+        sub_requirements = db.query(func.count(SubRequirement.id)).filter(
+            SubRequirement.requirement_id == requirement_id
+        ).scalar()
+        checklist_items = db.query(func.count(ChecklistItem.id)).filter(
+            ChecklistItem.requirement_id == requirement_id
+        ).scalar()
+        return sub_requirements, checklist_items
+
+    @staticmethod
+    def record_requirement(db: Session, requirement: Requirement, sign: int = 1,
+                           sub_requirements: int = 0, checklist_items: int = 0) -> None:
+        """Add (sign=1) or remove (sign=-1) a requirement from the summary."""
+        score = requirement.quality_score
+        AnalyticsSummaryRepository.adjust(
+            db,
+            AnalyticsSummaryRepository.requirement_buckets(requirement),
+            requirement_count=sign,
+            quality_score_sum=sign * (score or 0),
+            quality_score_count=sign if score is not None else 0,
+            sub_requirement_count=sign * sub_requirements,
+            checklist_item_count=sign * checklist_items,
+        )
+
+    @staticmethod
+    def record_requirement_update(db: Session, requirement: Requirement,
+                                  before: Tuple[Dict[str, str], Optional[int]]) -> None:
+        """Move a requirement between buckets after an update (see snapshot)."""
+        old_buckets, old_score = before
+        new_buckets = AnalyticsSummaryRepository.requirement_buckets(requirement)
+        new_score = requirement.quality_score
+        if old_buckets == new_buckets and old_score == new_score:
+            return
+
+        sub_requirements, checklist_items = (0, 0)
+        if old_buckets != new_buckets:
+            sub_requirements, checklist_items = AnalyticsSummaryRepository.child_counts(db, requirement.id)
+
+        for buckets, sign, score in ((old_buckets, -1, old_score), (new_buckets, 1, new_score)):
+            AnalyticsSummaryRepository.adjust(
+                db,
+                buckets,
+                requirement_count=sign if old_buckets != new_buckets else 0,
+                quality_score_sum=sign * (score or 0),
+                quality_score_count=sign if score is not None else 0,
+                sub_requirement_count=sign * sub_requirements,
+                checklist_item_count=sign * checklist_items,
+            )
+
+    @staticmethod
+    def record_quality_changes(db: Session, changes: List[Tuple[Any, Optional[int], Optional[int]]]) -> None:
+        """
+        Apply many quality score changes at once.
+        `changes` holds (requirement-like object, old score, new score); deltas are
+        summed per bucket so each bucket row is touched once.
+        """
+        deltas: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for requirement, old_score, new_score in changes:
+            buckets = AnalyticsSummaryRepository.requirement_buckets(requirement)
+            for key in buckets.items():
+                entry = deltas.setdefault(key, {"quality_score_sum": 0, "quality_score_count": 0})
+                entry["quality_score_sum"] += (new_score or 0) - (old_score or 0)
+                entry["quality_score_count"] += (new_score is not None) - (old_score is not None)
+
+        for (dimension, bucket), values in deltas.items():
+            AnalyticsSummaryRepository.adjust(db, {dimension: bucket}, **values)
+
+    @staticmethod
+    def record_new_requirements(db: Session, requirements: List[Any]) -> None:
+        """
+        Add many new (childless) requirements at once, given as objects or column dicts.
+        Counts are summed per bucket so each bucket row is touched once.
+        """
+        deltas: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for requirement in requirements:
+            score = requirement["quality_score"] if isinstance(requirement, dict) else requirement.quality_score
+            for key in AnalyticsSummaryRepository.requirement_buckets(requirement).items():
+                entry = deltas.setdefault(
+                    key, {"requirement_count": 0, "quality_score_sum": 0, "quality_score_count": 0}
+                )
+                entry["requirement_count"] += 1
+                entry["quality_score_sum"] += score or 0
+                entry["quality_score_count"] += score is not None
+        
+        for (dimension, bucket), values in deltas.items():
+            AnalyticsSummaryRepository.adjust(db, {dimension: bucket}, **values)
+    
+    @staticmethod
+    def record_children(db: Session, requirement_id: Optional[int],
+                        sub_requirements: int = 0, checklist_items: int = 0) -> None:
+        """Adjust the child counters of the requirement's buckets."""
+        if requirement_id is None:
+            return
+        requirement = db.get(Requirement, requirement_id)
+        if requirement is None:
+            return
+        AnalyticsSummaryRepository.adjust(
+            db,
+            AnalyticsSummaryRepository.requirement_buckets(requirement),
+            sub_requirement_count=sub_requirements,
+            checklist_item_count=checklist_items,
+        )
+
+    @staticmethod
+    def get_all(db: Session) -> List[AnalyticsSummary]:
+        """Get all summary rows (refreshing loaded ones, which adjust() updates behind the session's back)."""
+        return db.query(AnalyticsSummary).populate_existing().all()
+
+    @staticmethod
+    def compute(db: Session) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """Recompute all counters from the requirement tables (one query per dimension)."""
+        sub_counts = select(
+            SubRequirement.requirement_id, func.count(SubRequirement.id).label("n")
+        ).group_by(SubRequirement.requirement_id).subquery()
+        checklist_counts = select(
+            ChecklistItem.requirement_id, func.count(ChecklistItem.id).label("n")
+        ).where(ChecklistItem.requirement_id.isnot(None)).group_by(ChecklistItem.requirement_id).subquery()
+
+        aggregates = (
+            func.count(Requirement.id),
+            func.coalesce(func.sum(Requirement.quality_score), 0),
+            func.count(Requirement.quality_score),
+            func.coalesce(func.sum(sub_counts.c.n), 0),
+            func.coalesce(func.sum(checklist_counts.c.n), 0),
+        )
+
+        def base_query(*columns):
+            return db.query(*columns, *aggregates).select_from(Requirement).outerjoin(
+                sub_counts, sub_counts.c.requirement_id == Requirement.id
+            ).outerjoin(
+                checklist_counts, checklist_counts.c.requirement_id == Requirement.id
+            )
+
+        counters: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+        def accumulate(dimension: str, bucket: str, values) -> None:
+            if not values[0]:
+                return
+            entry = counters.setdefault((dimension, bucket), {field: 0 for field in COUNTER_FIELDS})
+            for field, value in zip(COUNTER_FIELDS, values):
+                entry[field] += int(value or 0)
+
+        accumulate(TOTAL_DIMENSION, TOTAL_BUCKET, base_query().one())
+        for dimension, column in AnalyticsSummaryRepository.DIMENSIONS.items():
+            for row in base_query(column).group_by(column).all():
+                bucket = AnalyticsSummaryRepository.bucket_key(dimension, row[0])
+                accumulate(dimension, bucket, row[1:])
+
+        return counters
+
+    @staticmethod
+    def check_drift(db: Session) -> List[Dict[str, Any]]:
+        """Compare stored counters against a fresh computation and list differences."""
+        expected = AnalyticsSummaryRepository.compute(db)
+        stored = {
+            (row.dimension, row.bucket): {field: getattr(row, field) for field in COUNTER_FIELDS}
+            for row in AnalyticsSummaryRepository.get_all(db)
+        }
+
+        drift = []
+        empty = {field: 0 for field in COUNTER_FIELDS}
+        for key in sorted(set(expected) | set(stored)):
+            actual = expected.get(key, empty)
+            current = stored.get(key, empty)
+            for field in COUNTER_FIELDS:
+                if actual[field] != current[field]:
+                    drift.append({
+                        "dimension": key[0],
+                        "bucket": key[1],
+                        "field": field,
+                        "stored": current[field],
+                        "actual": actual[field],
+                    })
+        return drift
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recompute the summary from scratch. Returns the number of buckets written."""
+        counters = AnalyticsSummaryRepository.compute(db)
+        db.query(AnalyticsSummary).delete(synchronize_session=False)
+        # Drop the deleted rows from the identity map so the new ones can take their keys
+        for row in [obj for obj in db.identity_map.values() if isinstance(obj, AnalyticsSummary)]:
+            db.expunge(row)
+        db.add_all([
+            AnalyticsSummary(dimension=dimension, bucket=bucket, **values)
+            for (dimension, bucket), values in counters.items()
+        ])
+        db.commit()
+        return len(counters)
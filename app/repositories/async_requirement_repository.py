@@ -0,0 +1,62 @@
+"""
+Async variants of the requirement repositories.
+Each method runs the sync repository method on the AsyncSession's underlying
+Session (AsyncSession.run_sync), so queries go through the async driver while
+the query logic and analytics bookkeeping stay in one place.
+"""
+from functools import wraps
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.requirement_repository import (
+    RequirementRepository,
+    SubRequirementRepository,
+    ChecklistItemRepository,
+)
+
+
+def async_variant(method):
+    """Wrap a sync `method(db: Session, ...)` as `await method(db: AsyncSession, ...)`."""
+    @wraps(method)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(method, *args, **kwargs)
+    return staticmethod(wrapper)
+
+
+class AsyncRequirementRepository:
+    """Async requirement CRUD operations (see RequirementRepository)."""
+    
+    create = async_variant(RequirementRepository.create)
+    bulk_create = async_variant(RequirementRepository.bulk_create)
+    get = async_variant(RequirementRepository.get)
+    get_all = async_variant(RequirementRepository.get_all)
+    get_page = async_variant(RequirementRepository.get_page)
+    count_by = async_variant(RequirementRepository.count_by)
+    get_aggregate_totals = async_variant(RequirementRepository.get_aggregate_totals)
+    update = async_variant(RequirementRepository.update)
+    set_quality_score = async_variant(RequirementRepository.set_quality_score)
+    get_feature_rows = async_variant(RequirementRepository.get_feature_rows)
+    count_for_validation = async_variant(RequirementRepository.count_for_validation)
+    get_validation_batch = async_variant(RequirementRepository.get_validation_batch)
+    bulk_update_quality_scores = async_variant(RequirementRepository.bulk_update_quality_scores)
+    delete = async_variant(RequirementRepository.delete)
+
+
+class AsyncSubRequirementRepository:
+    """Async sub-requirement operations (see SubRequirementRepository)."""
+    
+    create = async_variant(SubRequirementRepository.create)
+    create_tree = async_variant(SubRequirementRepository.create_tree)
+    get = async_variant(SubRequirementRepository.get)
+    get_by_requirement = async_variant(SubRequirementRepository.get_by_requirement)
+    update = async_variant(SubRequirementRepository.update)
+    delete = async_variant(SubRequirementRepository.delete)
+
+
+class AsyncChecklistItemRepository:
+    """Async checklist item operations (see ChecklistItemRepository)."""
+    
+    create = async_variant(ChecklistItemRepository.create)
+    get = async_variant(ChecklistItemRepository.get)
+    get_by_requirement = async_variant(ChecklistItemRepository.get_by_requirement)
+    get_by_sub_requirement = async_variant(ChecklistItemRepository.get_by_sub_requirement)
+    update = async_variant(ChecklistItemRepository.update)
+    delete = async_variant(ChecklistItemRepository.delete)
@@ -0,0 +1,78 @@
+"""
+Repository for content-addressed upload storage and the processing result cache.
+"""
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from typing import Any, List, Optional, Set
+from app.models.attachment import Attachment
+from app.models.blob import Blob, ProcessingResult
+
+
+class BlobRepository:
+    """Repository for stored upload blobs. Reference counts follow attachment writes (see app.models.blob)."""
+    
+    @staticmethod
+    def ensure(db: Session, sha256: str, path: str, size: int) -> Blob:
+        """Get or add the row of a stored blob."""
+        blob = db.get(Blob, sha256)
+        if blob is not None:
+            return blob
+        db.add(Blob(sha256=sha256, path=path, size=size, ref_count=0))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # Added concurrently
+        return db.get(Blob, sha256)
+    
+    @staticmethod
+    def recount(db: Session) -> None:
+        """Recompute every reference count from the attachments table."""
+        db.execute(
+            update(Blob).values(
+                ref_count=select(func.count(Attachment.id))
+                .where(Attachment.content_hash == Blob.sha256)
+                .scalar_subquery()
+            )
+        )
+        db.commit()
+    
+    @staticmethod
+    def get_unreferenced(db: Session) -> List[Blob]:
+        """Blobs no attachment references."""
+        return db.query(Blob).filter(Blob.ref_count <= 0).all()
+    
+    @staticmethod
+    def get_hashes(db: Session) -> Set[str]:
+        """Hashes of all stored blobs."""
+        return set(db.scalars(select(Blob.sha256)))
+    
+    @staticmethod
+    def delete(db: Session, blob: Blob) -> None:
+        """Delete a blob's row."""
+        db.delete(blob)
+        db.commit()
+
+
+class ProcessingResultRepository:
+    """Repository for cached parser and OCR results."""
+    
+    @staticmethod
+    def get(db: Session, content_hash: str, processor: str, version: str) -> Optional[Any]:
+        """Cached result for content processed by a processor version, or None."""
+        return db.scalar(
+            select(ProcessingResult.result).where(
+                ProcessingResult.content_hash == content_hash,
+                ProcessingResult.processor == processor,
+                ProcessingResult.version == version,
+            )
+        )
+    
+    @staticmethod
+    def save(db: Session, content_hash: str, processor: str, version: str, result: Any) -> None:
+        """Cache a result (keeping one stored concurrently)."""
+        db.add(ProcessingResult(content_hash=content_hash, processor=processor, version=version, result=result))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
@@ -0,0 +1,124 @@
+"""
+Repository for background jobs.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, or_, select, update
+from typing import Any, Dict, List, Optional
+from app.models.job import Job, JobKind, JobStatus
+from app.models.requirement import Priority
+
+# Run order of priorities (lower first)
+PRIORITY_RANK = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
+
+
+class JobRepository:
+    """Repository for background job operations. Every state change is committed."""
+    
+    @staticmethod
+    def create(db: Session, kind: JobKind, payload: Dict[str, Any],
+               priority: Priority = Priority.MEDIUM) -> Job:
+        """Create a queued job."""
+        job = Job(kind=kind, payload=payload, priority=priority, status=JobStatus.QUEUED)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+    
+    @staticmethod
+    def get(db: Session, job_id: int) -> Optional[Job]:
+        """Get a job by ID."""
+        return db.query(Job).filter(Job.id == job_id).first()
+    
+    @staticmethod
+    def get_unfinished(db: Session) -> List[Job]:
+        """Queued and running jobs, in run order (priority, then age)."""
+        rank = case(PRIORITY_RANK, value=Job.priority)
+        return db.query(Job).filter(
+            Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+        ).order_by(rank, Job.id).all()
+    
+    @staticmethod
+    def get_queued(db: Session) -> List[Job]:
+        """Queued jobs, in run order (priority, then age)."""
+        rank = case(PRIORITY_RANK, value=Job.priority)
+        return db.query(Job).filter(Job.status == JobStatus.QUEUED).order_by(rank, Job.id).all()
+    
+    @staticmethod
+    def claim(db: Session, job_id: int) -> Optional[Job]:
+        """
+        Move a queued job to running with a conditional UPDATE, so only one
+        worker (in any process) gets it. Returns None if the job is not queued
+        any more (claimed elsewhere, finished or gone).
+        """
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                started_at=func.now(),
+                heartbeat_at=datetime.now(timezone.utc),
+                error=None,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return JobRepository.get(db, job_id) if claimed == 1 else None
+    
+    @staticmethod
+    def heartbeat(db: Session, job_id: int) -> None:
+        """Renew a running job's lease."""
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(heartbeat_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    
+    @staticmethod
+    def requeue_expired(db: Session, lease_seconds: float) -> List[Job]:
+        """Queue running jobs whose lease expired (their worker died) again; returns them."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+        expired = (Job.status == JobStatus.RUNNING) & or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < cutoff)
+        job_ids = db.scalars(select(Job.id).where(expired)).all()
+        if not job_ids:
+            return []
+        db.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids), expired)
+            .values(status=JobStatus.QUEUED)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return db.query(Job).filter(Job.id.in_(job_ids), Job.status == JobStatus.QUEUED).all()
+    
+    @staticmethod
+    def set_requirement(db: Session, job_id: int, requirement_id: int) -> None:
+        """Record the requirement a job created (caller commits, together with the requirement)."""
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(requirement_id=requirement_id)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def mark_done(db: Session, job_id: int, requirement_id: Optional[int]) -> None:
+        """Record a job's result."""
+        job = JobRepository.get(db, job_id)
+        job.status = JobStatus.DONE
+        job.requirement_id = requirement_id
+        job.finished_at = func.now()
+        db.commit()
+    
+    @staticmethod
+    def mark_failed(db: Session, job_id: int, error: str) -> None:
+        """Record why a job failed."""
+        job = JobRepository.get(db, job_id)
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.finished_at = func.now()
+        db.commit()
+
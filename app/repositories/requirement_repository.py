@@ -1,34 +1,261 @@
 """
 Repository for requirement operations.
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List, Optional
-from app.models.requirement import Requirement, SubRequirement, ChecklistItem
-from app.schemas.requirement import RequirementCreate, RequirementUpdate
+from sqlalchemy.orm import Session, aliased, load_only, selectinload
+from sqlalchemy import (
+    Boolean, Integer, String, desc, event, func, literal, null, or_, select, update, insert, delete,
+    tuple_, type_coerce,
+)
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from app.models.requirement import (
+    Requirement,
+    SubRequirement,
+    ChecklistItem,
+    RequirementStatus,
+    RequirementValidation,
+)
+from app.schemas.requirement import RequirementCreate, RequirementUpdate, RequirementSummary, RequirementResponse
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.repositories.analytics_repository import AnalyticsSummaryRepository
+
+
+# A response shape name (see RequirementRepository.LOAD_OPTIONS) or a list of fields
+LoadSpec = Optional[Union[str, Iterable[str]]]
+
+# Eager loaders for the relationships a response can include
+RELATIONSHIP_LOADERS = {
+    "sub_requirements": selectinload(Requirement.sub_requirements).selectinload(SubRequirement.checklist_items),
+    "checklist_items": selectinload(Requirement.checklist_items),
+    "tags": selectinload(Requirement.tags),
+}
+
+
+def projection_options(fields: Iterable[str]) -> Tuple:
+    """
+    Loader options fetching only the given fields: other columns are deferred
+    (not selected unless accessed) and only the listed relationships are loaded.
+    """
+    fields = set(fields)
+    columns = [
+        column for column in Requirement.__table__.columns
+        if column.key in fields or column.key in ("id", "created_at")
+    ]
+    return (
+        load_only(*[getattr(Requirement, column.key) for column in columns]),
+        *[loader for name, loader in RELATIONSHIP_LOADERS.items() if name in fields],
+    )
+
+
+# Read-through cache of requirement responses (see RequirementRepository.get_response)
+requirement_cache = TTLCache(settings.REQUIREMENT_CACHE_SIZE, settings.REQUIREMENT_CACHE_TTL_SECONDS)
+
+_PENDING_INVALIDATIONS = "requirement_cache_invalidations"
+
+
+def invalidate_cached(db: Session, *requirement_ids: Optional[int]) -> None:
+    """
+    Drop requirements from the response cache when the session's transaction
+    commits (not before, so a concurrent read cannot re-cache the old state).
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(
+        requirement_id for requirement_id in requirement_ids if requirement_id is not None
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    requirement_ids = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if requirement_ids:
+        requirement_cache.invalidate(requirement_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+def insert_returning_ids(db: Session, model, rows: List[Dict[str, Any]], chunk_size: int = 500) -> List[int]:
+    """
+    Insert rows with chunked multi-row INSERT ... RETURNING and return the new IDs in row order.
+    RETURNING order is unspecified, but ids are assigned in row order within the
+    transaction, so ascending ids line up with the rows. (Asking for ordered
+    RETURNING makes SQLite fall back to one INSERT per row.)
+    """
+    ids: List[int] = []
+    for start in range(0, len(rows), chunk_size):
+        result = db.execute(insert(model).returning(model.id), rows[start:start + chunk_size])
+        ids.extend(sorted(result.scalars().all()))
+    return ids
 
 
 class RequirementRepository:
     """Repository for requirement CRUD operations."""
     
+    # Loader options per response shape; one SELECT per relationship level
+    # regardless of how many requirements or children are loaded
+    LOAD_OPTIONS = {
+        "flat": (),
+        "response": tuple(RELATIONSHIP_LOADERS.values()),
+        "summary": projection_options(RequirementSummary.model_fields),
+    }
+    
     @staticmethod
-    def create(db: Session, requirement: RequirementCreate, owner_id: Optional[int] = None) -> Requirement:
-        """Create a new requirement."""
+    def load_options(load: LoadSpec) -> Sequence:
+        """
+        Get the loader options for a response shape name, or for an explicit
+        list of fields (see projection_options). None loads lazily.
+        """
+        if load is None:
+            return ()
+        if isinstance(load, str):
+            return RequirementRepository.LOAD_OPTIONS[load]
+        return projection_options(load)
+    
+    @staticmethod
+    def create(db: Session, requirement: RequirementCreate, owner_id: Optional[int] = None,
+               commit: bool = True) -> Requirement:
+        """Create a new requirement (only flushed if not `commit`, so the caller can add to the transaction)."""
         db_requirement = Requirement(**requirement.dict(), owner_id=owner_id)
         db.add(db_requirement)
-        db.commit()
-        db.refresh(db_requirement)
+        db.flush()
+        AnalyticsSummaryRepository.record_requirement(db, db_requirement)
+        if commit:
+            db.commit()
+            db.refresh(db_requirement)
         return db_requirement
     
     @staticmethod
-    def get(db: Session, requirement_id: int) -> Optional[Requirement]:
-        """Get a requirement by ID."""
-        return db.query(Requirement).filter(Requirement.id == requirement_id).first()
+    def bulk_create(db: Session, rows: List[Dict[str, Any]],
+                    validations: Optional[List[Dict[str, Any]]] = None,
+                    chunk_size: int = 500) -> List[int]:
+        """
+        Insert many requirements in one transaction with chunked multi-row
+        INSERT ... RETURNING statements, and store their validation records if given
+        (one per row, same order). Returns the new IDs in row order.
+        Rows are column dicts and must include status and quality_score.
+        """
+        try:
+            ids = insert_returning_ids(db, Requirement, rows, chunk_size)
+            AnalyticsSummaryRepository.record_new_requirements(db, rows)
+            if validations:
+                RequirementValidationRepository.bulk_save(db, dict(zip(ids, validations)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return ids
+    
+    @staticmethod
+    def get(db: Session, requirement_id: int, load: LoadSpec = None,
+            refresh: bool = False) -> Optional[Requirement]:
+        """
+        Get a requirement by ID, eager-loading relationships for the `load` shape.
+        With `refresh`, an instance already in the session is reloaded from the database.
+        """
+        query = db.query(Requirement).options(*RequirementRepository.load_options(load))
+        if refresh:
+            query = query.populate_existing()
+        return query.filter(Requirement.id == requirement_id).first()
+    
+    @staticmethod
+    def get_response(db: Session, requirement_id: int) -> Optional[RequirementResponse]:
+        """
+        Get a requirement's API response (with children and tags), read through
+        the response cache. The returned model is shared; treat it as read-only.
+        """
+        def load():
+            requirement = RequirementRepository.get(db, requirement_id, load="response")
+            return RequirementResponse.model_validate(requirement) if requirement else None
+        return requirement_cache.get_or_load(requirement_id, load)
+    
+    @staticmethod
+    def get_all(db: Session, skip: int = 0, limit: int = 100, load: LoadSpec = None) -> List[Requirement]:
+        """Get all requirements with offset pagination (legacy; prefer get_page)."""
+        return db.query(Requirement).options(*RequirementRepository.load_options(load)).order_by(
+            desc(Requirement.created_at), desc(Requirement.id)
+        ).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def _created_at_key(db: Session):
+        """
+        created_at as used in cursors. On SQLite this is the raw stored text:
+        server-default timestamps and bound datetimes are formatted differently,
+        so cursors compare the stored strings (still served by the index).
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            return type_coerce(Requirement.created_at, String)
+        return Requirement.created_at
+    
+    @staticmethod
+    def get_page(db: Session, cursor: Optional[str] = None, limit: int = 100,
+                 load: LoadSpec = None) -> Tuple[List[Requirement], Optional[str]]:
+        """
+        Get a page of requirements, newest first, using keyset pagination on (created_at, id).
+        Returns the requirements and the cursor of the next page (None on the last page).
+        Raises ValueError for a malformed cursor.
+        """
+        key = RequirementRepository._created_at_key(db)
+        query = db.query(Requirement, key).options(
+            *RequirementRepository.load_options(load)
+        ).order_by(key.desc(), Requirement.id.desc())
+        
+        if cursor:
+            created_at, requirement_id = RequirementRepository._decode_page_cursor(db, cursor)
+            query = query.filter(tuple_(key, Requirement.id) < tuple_(created_at, requirement_id))
+        
+        rows = query.limit(limit + 1).all()
+        requirements = [requirement for requirement, _ in rows[:limit]]
+        if len(rows) <= limit:
+            return requirements, None
+        
+        last_created_at = rows[limit - 1][1]
+        if isinstance(last_created_at, datetime):
+            last_created_at = last_created_at.isoformat()
+        return requirements, encode_cursor([last_created_at, requirements[-1].id])
+    
+    @staticmethod
+    def _decode_page_cursor(db: Session, cursor: str) -> Tuple[Any, int]:
+        values = decode_cursor(cursor)
+        if len(values) != 2 or not isinstance(values[0], str) or not isinstance(values[1], int):
+            raise ValueError("Invalid cursor")
+        
+        created_at, requirement_id = values
+        if db.get_bind().dialect.name != "sqlite":
+            created_at = datetime.fromisoformat(created_at)
+        return created_at, requirement_id
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Requirement]:
-        """Get all requirements with pagination."""
-        return db.query(Requirement).order_by(desc(Requirement.created_at)).offset(skip).limit(limit).all()
+    def count_by(db: Session, column) -> Dict[Any, int]:
+        """Count requirements grouped by a column (single GROUP BY query)."""
+        rows = db.query(column, func.count(Requirement.id)).group_by(column).all()
+        return {value: count for value, count in rows}
+    
+    @staticmethod
+    def get_aggregate_totals(db: Session) -> Dict[str, Any]:
+        """Get requirement, child and quality score totals in a single query."""
+        sub_requirement_count = select(func.count(SubRequirement.id)).where(
+            SubRequirement.requirement_id.isnot(None)
+        ).scalar_subquery()
+        checklist_item_count = select(func.count(ChecklistItem.id)).where(
+            ChecklistItem.requirement_id.isnot(None)
+        ).scalar_subquery()
+        
+        row = db.query(
+            func.count(Requirement.id),
+            func.avg(Requirement.quality_score),
+            sub_requirement_count,
+            checklist_item_count,
+        ).one()
+        
+        return {
+            "total_requirements": row[0] or 0,
+            "average_quality_score": float(row[1]) if row[1] is not None else None,
+            "total_sub_requirements": row[2] or 0,
+            "total_checklist_items": row[3] or 0,
+        }
     
     @staticmethod
     def update(db: Session, requirement_id: int, requirement_update: RequirementUpdate) -> Optional[Requirement]:
@@ -37,14 +264,142 @@ class RequirementRepository:
         if not db_requirement:
             return None
         
+        before = AnalyticsSummaryRepository.snapshot(db_requirement)
         update_data = requirement_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_requirement, field, value)
         
+        AnalyticsSummaryRepository.record_requirement_update(db, db_requirement, before)
+        invalidate_cached(db, requirement_id)
         db.commit()
         db.refresh(db_requirement)
         return db_requirement
     
+    @staticmethod
+    def set_quality_score(db: Session, db_requirement: Requirement, quality_score: int) -> Requirement:
+        """Store a new quality score for a requirement."""
+        if db_requirement.quality_score == quality_score:
+            return db_requirement
+        
+        before = AnalyticsSummaryRepository.snapshot(db_requirement)
+        db_requirement.quality_score = quality_score
+        AnalyticsSummaryRepository.record_requirement_update(db, db_requirement, before)
+        invalidate_cached(db, db_requirement.id)
+        db.commit()
+        return db_requirement
+    
+    @staticmethod
+    def _apply_filters(query, project_name: Optional[str] = None, status: Optional[Any] = None,
+                       category: Optional[str] = None, modified_since: Optional[datetime] = None):
+        """Apply bulk operation filters to a query."""
+        if project_name:
+            query = query.filter(Requirement.project_name == project_name)
+        if isinstance(status, (list, tuple, set)):
+            query = query.filter(Requirement.status.in_(list(status)))
+        elif status:
+            query = query.filter(Requirement.status == status)
+        if category:
+            query = query.filter(Requirement.category == category)
+        if modified_since:
+            query = query.filter(func.coalesce(Requirement.updated_at, Requirement.created_at) >= modified_since)
+        return query
+    
+    @staticmethod
+    def _child_count_columns():
+        """Correlated COUNT subqueries for a requirement's sub-requirements and checklist items."""
+        sub_requirement_count = select(func.count(SubRequirement.id)).where(
+            SubRequirement.requirement_id == Requirement.id
+        ).correlate(Requirement).scalar_subquery()
+        checklist_item_count = select(func.count(ChecklistItem.id)).where(
+            ChecklistItem.requirement_id == Requirement.id
+        ).correlate(Requirement).scalar_subquery()
+        return sub_requirement_count, checklist_item_count
+    
+    @staticmethod
+    def get_feature_rows(db: Session, requirement_ids: Optional[List[int]] = None, after_id: int = 0,
+                         limit: Optional[int] = None, **filters) -> List[Any]:
+        """
+        Get ML feature inputs for requirements in one query, ordered by id.
+        Text lengths are computed in SQL so large text columns are never transferred.
+        """
+        sub_requirement_count, checklist_item_count = RequirementRepository._child_count_columns()
+        
+        query = db.query(
+            Requirement.id,
+            func.coalesce(func.length(Requirement.title), 0).label("title_length"),
+            func.coalesce(func.length(Requirement.description), 0).label("description_length"),
+            func.coalesce(func.length(Requirement.success_criteria), 0).label("success_criteria_length"),
+            Requirement.desired_deadline.isnot(None).label("has_deadline"),
+            sub_requirement_count.label("num_sub_requirements"),
+            checklist_item_count.label("num_checklist_items"),
+            Requirement.priority,
+            Requirement.status,
+            Requirement.quality_score,
+        ).filter(Requirement.id > after_id)
+        if requirement_ids is not None:
+            query = query.filter(Requirement.id.in_(requirement_ids))
+        query = RequirementRepository._apply_filters(query, **filters).order_by(Requirement.id)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def count_for_validation(db: Session, after_id: int = 0, **filters) -> int:
+        """Count requirements matching bulk validation filters."""
+        query = db.query(func.count(Requirement.id)).filter(Requirement.id > after_id)
+        return RequirementRepository._apply_filters(query, **filters).scalar()
+    
+    @staticmethod
+    def get_validation_batch(db: Session, after_id: int = 0, limit: int = 500, **filters) -> List[Any]:
+        """
+        Get the next keyset-ordered chunk of rows for bulk validation.
+        Returns the validated columns plus child counts, without loading ORM objects.
+        """
+        sub_requirement_count, checklist_item_count = RequirementRepository._child_count_columns()
+        
+        query = db.query(
+            Requirement.id,
+            Requirement.project_name,
+            Requirement.title,
+            Requirement.description,
+            Requirement.priority,
+            Requirement.status,
+            Requirement.category,
+            Requirement.expected_outcome,
+            Requirement.success_criteria,
+            Requirement.constraints,
+            Requirement.desired_deadline,
+            Requirement.quality_score,
+            sub_requirement_count.label("sub_requirement_count"),
+            checklist_item_count.label("checklist_item_count"),
+        ).filter(Requirement.id > after_id)
+        query = RequirementRepository._apply_filters(query, **filters)
+        return query.order_by(Requirement.id).limit(limit).all()
+    
+    @staticmethod
+    def bulk_update_quality_scores(db: Session, changes: List[Any], scores: Dict[int, int],
+                                   validations: Optional[Dict[int, Dict[str, Any]]] = None) -> int:
+        """
+        Write new quality scores with one executemany UPDATE, and optionally
+        replace the stored validation results, in a single transaction.
+        `changes` are rows/snapshots carrying the old score and bucket columns.
+        Returns the number of requirements whose score changed.
+        """
+        changed = [row for row in changes if scores.get(row.id) != row.quality_score]
+        if changed:
+            db.execute(
+                update(Requirement),
+                [{"id": row.id, "quality_score": scores[row.id]} for row in changed],
+            )
+            AnalyticsSummaryRepository.record_quality_changes(
+                db, [(row, row.quality_score, scores[row.id]) for row in changed]
+            )
+            invalidate_cached(db, *(row.id for row in changed))
+        if validations:
+            RequirementValidationRepository.bulk_save(db, validations)
+        db.commit()
+        return len(changed)
+    
     @staticmethod
     def delete(db: Session, requirement_id: int) -> bool:
         """Delete a requirement."""
@@ -52,7 +407,13 @@ class RequirementRepository:
         if not db_requirement:
             return False
         
+        sub_requirements, checklist_items = AnalyticsSummaryRepository.child_counts(db, requirement_id)
+        AnalyticsSummaryRepository.record_requirement(
+            db, db_requirement, sign=-1,
+            sub_requirements=sub_requirements, checklist_items=checklist_items
+        )
         db.delete(db_requirement)
+        invalidate_cached(db, requirement_id)
         db.commit()
         return True
 
@@ -65,22 +426,142 @@ class SubRequirementRepository:
         """Create a new sub-requirement."""
         db_sub = SubRequirement(**sub_requirement, requirement_id=requirement_id)
         db.add(db_sub)
+        AnalyticsSummaryRepository.record_children(db, requirement_id, sub_requirements=1)
+        invalidate_cached(db, requirement_id)
         db.commit()
         db.refresh(db_sub)
         return db_sub
     
     @staticmethod
-    def get(db: Session, sub_requirement_id: int) -> Optional[SubRequirement]:
+    def create_tree(db: Session, requirement_id: int, sub_requirements: List[Any],
+                    checklist_items: List[Any], chunk_size: int = 500) -> Dict[str, Any]:
+        """
+        Insert a tree of sub-requirements (nodes with `checklist_items` and `children`)
+        plus requirement-level checklist items, without committing.
+        Sub-requirements are inserted one batched statement per depth level, so
+        parent IDs are known before their children; all checklist items follow
+        in one more batch. Returns the created IDs mirroring the tree.
+        """
+        result = {"sub_requirements": [], "checklist_item_ids": []}
+        item_rows = [
+            {**item.dict(), "requirement_id": requirement_id, "sub_requirement_id": None}
+            for item in checklist_items
+        ]
+        item_targets = [result["checklist_item_ids"]] * len(item_rows)
+        
+        sub_requirement_count = 0
+        level = [(node, None) for node in sub_requirements]
+        while level:
+            rows = [
+                {
+                    **node.dict(exclude={"checklist_items", "children"}),
+                    "requirement_id": requirement_id,
+                    "parent_id": parent["id"] if parent else None,
+                }
+                for node, parent in level
+            ]
+            ids = insert_returning_ids(db, SubRequirement, rows, chunk_size)
+            sub_requirement_count += len(ids)
+            
+            next_level = []
+            for (node, parent), sub_requirement_id in zip(level, ids):
+                created = {"id": sub_requirement_id, "checklist_item_ids": [], "children": []}
+                (parent["children"] if parent else result["sub_requirements"]).append(created)
+                for item in node.checklist_items:
+                    item_rows.append({**item.dict(), "requirement_id": None, "sub_requirement_id": sub_requirement_id})
+                    item_targets.append(created["checklist_item_ids"])
+                next_level.extend((child, created) for child in node.children)
+            level = next_level
+        
+        for target, item_id in zip(item_targets, insert_returning_ids(db, ChecklistItem, item_rows, chunk_size)):
+            target.append(item_id)
+        
+        AnalyticsSummaryRepository.record_children(
+            db, requirement_id, sub_requirements=sub_requirement_count, checklist_items=len(checklist_items)
+        )
+        invalidate_cached(db, requirement_id)
+        result["sub_requirements_created"] = sub_requirement_count
+        result["checklist_items_created"] = len(item_rows)
+        return result
+    
+    # Loader options per response shape (see RequirementRepository.LOAD_OPTIONS)
+    LOAD_OPTIONS = {
+        "flat": (),
+        "response": (selectinload(SubRequirement.checklist_items),),
+    }
+    
+    @staticmethod
+    def get(db: Session, sub_requirement_id: int, load: Optional[str] = None,
+            refresh: bool = False) -> Optional[SubRequirement]:
         """Get a sub-requirement by ID."""
-        return db.query(SubRequirement).filter(SubRequirement.id == sub_requirement_id).first()
+        query = db.query(SubRequirement).options(*SubRequirementRepository.LOAD_OPTIONS.get(load, ()))
+        if refresh:
+            query = query.populate_existing()
+        return query.filter(SubRequirement.id == sub_requirement_id).first()
     
     @staticmethod
-    def get_by_requirement(db: Session, requirement_id: int) -> List[SubRequirement]:
+    def get_by_requirement(db: Session, requirement_id: int, load: Optional[str] = None) -> List[SubRequirement]:
         """Get all sub-requirements for a requirement."""
-        return db.query(SubRequirement).filter(
+        return db.query(SubRequirement).options(*SubRequirementRepository.LOAD_OPTIONS.get(load, ())).filter(
             SubRequirement.requirement_id == requirement_id
         ).order_by(SubRequirement.order).all()
     
+    @staticmethod
+    def get_tree_rows(db: Session, requirement_id: int, max_depth: int) -> List[Any]:
+        """
+        Every sub-requirement of a requirement down to `max_depth` levels (walked
+        from the top-level ones with a recursive CTE) and every checklist item
+        attached to them or to the requirement, in one query.
+        Rows have `kind` ("sub_requirement" or "checklist_item") and `parent_id`
+        (the parent sub-requirement; for items, the owning sub-requirement if any).
+        """
+        nodes = select(
+            SubRequirement.id, SubRequirement.parent_id, literal(1, Integer).label("depth")
+        ).where(
+            SubRequirement.requirement_id == requirement_id, SubRequirement.parent_id.is_(None)
+        ).cte("tree_nodes", recursive=True)
+        child = aliased(SubRequirement)
+        nodes = nodes.union_all(
+            select(child.id, child.parent_id, nodes.c.depth + 1)
+            .join(nodes, child.parent_id == nodes.c.id)
+            .where(child.requirement_id == requirement_id, nodes.c.depth < max_depth)
+        )
+        
+        sub_requirements = select(
+            literal("sub_requirement").label("kind"),
+            SubRequirement.id,
+            SubRequirement.requirement_id,
+            SubRequirement.parent_id,
+            SubRequirement.title,
+            SubRequirement.description,
+            SubRequirement.priority,
+            SubRequirement.status,
+            SubRequirement.order,
+            type_coerce(null(), Boolean).label("is_completed"),
+            nodes.c.depth,
+            SubRequirement.created_at,
+            SubRequirement.updated_at,
+        ).join(nodes, SubRequirement.id == nodes.c.id)
+        checklist_items = select(
+            literal("checklist_item"),
+            ChecklistItem.id,
+            ChecklistItem.requirement_id,
+            ChecklistItem.sub_requirement_id,
+            ChecklistItem.title,
+            ChecklistItem.description,
+            null(),
+            null(),
+            ChecklistItem.order,
+            ChecklistItem.is_completed,
+            null(),
+            ChecklistItem.created_at,
+            ChecklistItem.updated_at,
+        ).where(or_(
+            ChecklistItem.sub_requirement_id.in_(select(nodes.c.id)),
+            ChecklistItem.requirement_id == requirement_id,
+        ))
+        return db.execute(sub_requirements.union_all(checklist_items)).all()
+    
     @staticmethod
     def update(db: Session, sub_requirement_id: int, sub_requirement_update: dict) -> Optional[SubRequirement]:
         """Update a sub-requirement."""
@@ -92,6 +573,7 @@ class SubRequirementRepository:
             if value is not None:
                 setattr(db_sub, field, value)
         
+        invalidate_cached(db, db_sub.requirement_id)
         db.commit()
         db.refresh(db_sub)
         return db_sub
@@ -103,7 +585,16 @@ class SubRequirementRepository:
         if not db_sub:
             return False
         
+        # Requirement-level checklist items attached to this sub-requirement are cascaded
+        cascaded_items = db.query(func.count(ChecklistItem.id)).filter(
+            ChecklistItem.sub_requirement_id == sub_requirement_id,
+            ChecklistItem.requirement_id.isnot(None)
+        ).scalar()
+        AnalyticsSummaryRepository.record_children(
+            db, db_sub.requirement_id, sub_requirements=-1, checklist_items=-cascaded_items
+        )
         db.delete(db_sub)
+        invalidate_cached(db, db_sub.requirement_id)
         db.commit()
         return True
 
@@ -118,10 +609,20 @@ class ChecklistItemRepository:
         db_item = ChecklistItem(**checklist_item, requirement_id=requirement_id, 
                                 sub_requirement_id=sub_requirement_id)
         db.add(db_item)
+        AnalyticsSummaryRepository.record_children(db, requirement_id, checklist_items=1)
+        invalidate_cached(db, *ChecklistItemRepository.owner_requirement_ids(db, db_item))
         db.commit()
         db.refresh(db_item)
         return db_item
     
+    @staticmethod
+    def owner_requirement_ids(db: Session, item: ChecklistItem) -> Tuple[Optional[int], Optional[int]]:
+        """Requirements whose responses include a checklist item (directly or via its sub-requirement)."""
+        via_sub_requirement = db.scalar(
+            select(SubRequirement.requirement_id).where(SubRequirement.id == item.sub_requirement_id)
+        ) if item.sub_requirement_id else None
+        return item.requirement_id, via_sub_requirement
+    
     @staticmethod
     def get(db: Session, checklist_item_id: int) -> Optional[ChecklistItem]:
         """Get a checklist item by ID."""
@@ -152,6 +653,7 @@ class ChecklistItemRepository:
             if value is not None:
                 setattr(db_item, field, value)
         
+        invalidate_cached(db, *ChecklistItemRepository.owner_requirement_ids(db, db_item))
         db.commit()
         db.refresh(db_item)
         return db_item
@@ -163,8 +665,44 @@ class ChecklistItemRepository:
         if not db_item:
             return False
         
+        AnalyticsSummaryRepository.record_children(db, db_item.requirement_id, checklist_items=-1)
+        invalidate_cached(db, *ChecklistItemRepository.owner_requirement_ids(db, db_item))
         db.delete(db_item)
         db.commit()
         return True
 
 
+class RequirementValidationRepository:
+    """Repository for stored requirement validation results."""
+    
+    @staticmethod
+    def get(db: Session, requirement_id: int) -> Optional[RequirementValidation]:
+        """Get the stored validation for a requirement."""
+        return db.get(RequirementValidation, requirement_id)
+    
+    @staticmethod
+    def save(db: Session, requirement_id: int, record: Dict[str, Any]) -> RequirementValidation:
+        """Insert or replace the stored validation for a requirement (caller commits)."""
+        db_validation = db.get(RequirementValidation, requirement_id)
+        if db_validation is None:
+            db_validation = RequirementValidation(requirement_id=requirement_id)
+            db.add(db_validation)
+        
+        for field, value in record.items():
+            setattr(db_validation, field, value)
+        return db_validation
+    
+    @staticmethod
+    def bulk_save(db: Session, records: Dict[int, Dict[str, Any]]) -> None:
+        """Replace stored validations for many requirements with executemany statements (caller commits)."""
+        if not records:
+            return
+        
+        db.execute(
+            delete(RequirementValidation).where(RequirementValidation.requirement_id.in_(list(records))),
+            execution_options={"synchronize_session": False},
+        )
+        db.execute(
+            insert(RequirementValidation),
+            [{"requirement_id": requirement_id, **record} for requirement_id, record in records.items()],
+        )
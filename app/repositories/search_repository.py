@@ -0,0 +1,149 @@
+"""
+Repository for full-text requirement search.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.requirement import Requirement, RequirementStatus
+from app.models.search import (
+    FTS_TABLE,
+    FTS_COLUMNS,
+    CREATE_FTS_TABLE,
+    REQUIREMENT_TRIGGERS,
+    ATTACHMENT_TRIGGERS,
+    REBUILD_FTS,
+)
+
+# BM25 column weights, in FTS_COLUMNS order: title matches rank highest
+BM25_WEIGHTS = (10.0, 1.0, 3.0, 1.0, 0.5)
+
+# snippet() arguments: highlight markers, ellipsis and length in tokens
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+
+fts = table(FTS_TABLE, column("rowid"), *(column(name) for name in FTS_COLUMNS))
+
+
+def match_expression(query: str) -> str:
+    """
+    FTS5 query for user input: every word must match. Words are quoted, so
+    punctuation and operators (AND, NEAR, ...) are matched literally; a
+    trailing * keeps prefix matching.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SearchRepository:
+    """Repository for full-text search over requirements and attachment text."""
+
+    @staticmethod
+    def is_supported(db: Session) -> bool:
+        """Whether the database has the FTS5 index (SQLite only)."""
+        return db.get_bind().dialect.name == "sqlite"
+
+    @staticmethod
+    def ensure_index(db: Session) -> bool:
+        """Create and fill the search index if the database predates it. Returns True if built."""
+        if not SearchRepository.is_supported(db):
+            return False
+        exists = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first()
+        if exists:
+            return False
+        for statement in [CREATE_FTS_TABLE] + REQUIREMENT_TRIGGERS + ATTACHMENT_TRIGGERS + REBUILD_FTS:
+            db.execute(text(statement))
+        db.commit()
+        return True
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """Rebuild the search index from the requirements and attachments tables."""
+        for statement in REBUILD_FTS:
+            db.execute(text(statement))
+        db.commit()
+
+    @staticmethod
+    def _filters(project_name: Optional[str], status: Optional[RequirementStatus]) -> List[Any]:
+        filters = []
+        if project_name:
+            filters.append(Requirement.project_name == project_name)
+        if status:
+            filters.append(Requirement.status == status)
+        return filters
+
+    @staticmethod
+    def search(db: Session, query: str, limit: int = 20, offset: int = 0,
+               project_name: Optional[str] = None,
+               status: Optional[RequirementStatus] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Search requirements, best match first (BM25, title weighted highest).
+        Returns (total matches, page of hits with a highlighted snippet).
+        Raises ValueError if the query has no searchable words.
+        """
+        expression = match_expression(query)
+        if not expression:
+            raise ValueError("Empty search query")
+        if not SearchRepository.is_supported(db):
+            return SearchRepository._search_like(db, query, limit, offset, project_name, status)
+
+        fts_table = literal_column(FTS_TABLE)
+        conditions = [fts_table.op("MATCH")(expression)] + SearchRepository._filters(project_name, status)
+        rank = func.bm25(fts_table, *BM25_WEIGHTS)
+        snippet = func.snippet(fts_table, -1, SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS)
+
+        total = db.scalar(
+            select(func.count()).select_from(fts).join(Requirement, Requirement.id == fts.c.rowid).where(*conditions)
+        )
+        rows = db.execute(
+            select(
+                Requirement.id, Requirement.title, Requirement.project_name,
+                Requirement.status, Requirement.priority,
+                rank.label("rank"), snippet.label("snippet"),
+            ).select_from(fts).join(Requirement, Requirement.id == fts.c.rowid)
+            .where(*conditions)
+            .order_by(rank, Requirement.id)
+            .limit(limit).offset(offset)
+        ).all()
+
+        return total, [
+            {
+                "id": row.id,
+                "title": row.title,
+                "project_name": row.project_name,
+                "status": row.status,
+                "priority": row.priority,
+                "score": -row.rank,  # bm25() is lower-is-better
+                "snippet": row.snippet,
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _search_like(db: Session, query: str, limit: int, offset: int,
+                     project_name: Optional[str],
+                     status: Optional[RequirementStatus]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Fallback without FTS5: every word in the title or description, newest first, unranked."""
+        conditions = SearchRepository._filters(project_name, status)
+        for word in query.replace("*", " ").split():
+            pattern = f"%{word}%"
+            conditions.append(or_(Requirement.title.ilike(pattern), Requirement.description.ilike(pattern)))
+
+        total = db.scalar(select(func.count(Requirement.id)).where(*conditions))
+        rows = db.execute(
+            select(
+                Requirement.id, Requirement.title, Requirement.project_name,
+                Requirement.status, Requirement.priority,
+            ).where(*conditions)
+            .order_by(Requirement.created_at.desc(), Requirement.id.desc())
+            .limit(limit).offset(offset)
+        ).all()
+        return total, [{**row._asdict(), "score": None, "snippet": None} for row in rows]
@@ -5,34 +5,70 @@ from app.schemas.requirement import (
     RequirementCreate,
     RequirementUpdate,
     RequirementResponse,
+    RequirementSummary,
+    BulkItemError,
+    BulkCreateResponse,
+    RequirementSearchHit,
+    RequirementSearchResponse,
     SubRequirementCreate,
     SubRequirementUpdate,
     SubRequirementResponse,
     ChecklistItemCreate,
     ChecklistItemUpdate,
     ChecklistItemResponse,
+    SubRequirementTreeNode,
+    RequirementTreeCreate,
+    SubRequirementTreeResult,
+    RequirementTreeResponse,
+    TreeRollup,
+    SubRequirementTree,
+    RequirementTree,
 )
 from app.schemas.attachment import AttachmentCreate, AttachmentResponse
+from app.schemas.job import JobResponse
 from app.schemas.tag import TagCreate, TagResponse
 from app.schemas.user import UserCreate, UserResponse, Token
+from app.schemas.analytics import (
+    RevalidationRequest,
+    RevalidationResponse,
+    PredictionRequest,
+    PredictionResponse,
+)
 
 __all__ = [
     "RequirementCreate",
     "RequirementUpdate",
     "RequirementResponse",
+    "RequirementSummary",
+    "BulkItemError",
+    "BulkCreateResponse",
+    "RequirementSearchHit",
+    "RequirementSearchResponse",
     "SubRequirementCreate",
     "SubRequirementUpdate",
     "SubRequirementResponse",
     "ChecklistItemCreate",
     "ChecklistItemUpdate",
     "ChecklistItemResponse",
+    "SubRequirementTreeNode",
+    "RequirementTreeCreate",
+    "SubRequirementTreeResult",
+    "RequirementTreeResponse",
+    "TreeRollup",
+    "SubRequirementTree",
+    "RequirementTree",
     "AttachmentCreate",
     "AttachmentResponse",
+    "JobResponse",
     "TagCreate",
     "TagResponse",
     "UserCreate",
     "UserResponse",
     "Token",
+    "RevalidationRequest",
+    "RevalidationResponse",
+    "PredictionRequest",
+    "PredictionResponse",
 ]
 
 
@@ -0,0 +1,48 @@
+"""
+Analytics schemas.
+"""
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import datetime
+from app.models.requirement import RequirementStatus
+
+
+class RevalidationRequest(BaseModel):
+    """Schema for a bulk re-validation request."""
+    project_name: Optional[str] = None
+    status: Optional[RequirementStatus] = None
+    modified_since: Optional[datetime] = None
+    chunk_size: int = Field(default=500, ge=1, le=10000)
+    workers: Optional[int] = Field(default=None, ge=0, le=64)  # Default: REVALIDATION_WORKERS
+    resume: bool = False  # Continue the interrupted run recorded in the checkpoint (same filters)
+
+
+class RevalidationResponse(BaseModel):
+    """Schema for a background bulk re-validation and its progress."""
+    id: int
+    status: str  # running, done, failed
+    total: int
+    processed: int
+    updated: int
+    last_id: int
+    percent: float
+    finished: bool
+    error: Optional[str] = None
+
+
+class PredictionRequest(BaseModel):
+    """Schema for a batch success-probability request: explicit IDs and/or filters."""
+    requirement_ids: Optional[List[int]] = Field(default=None, max_length=100000)
+    project_name: Optional[str] = None
+    status: Optional[RequirementStatus] = None
+    category: Optional[str] = None
+
+
+class PredictionResponse(BaseModel):
+    """Schema for batch predictions, keyed by requirement ID."""
+    model_version: Optional[int]
+    count: int
+    predictions: Dict[int, float]
+    
+    class Config:
+        protected_namespaces = ()
@@ -0,0 +1,25 @@
+"""
+Background job schemas.
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.models.job import JobKind, JobStatus
+from app.models.requirement import Priority
+
+
+class JobResponse(BaseModel):
+    """Schema for background job status."""
+    id: int
+    kind: JobKind
+    status: JobStatus
+    priority: Priority
+    attempts: int
+    requirement_id: Optional[int] = None  # Set once the job is done
+    error: Optional[str] = None  # Set if the job failed
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
@@ -1,8 +1,9 @@
 """
 Requirement schemas.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, TYPE_CHECKING
+from functools import lru_cache
+from pydantic import BaseModel, Field, ConfigDict, create_model
+from typing import Any, Dict, Optional, List, Tuple, Type, TYPE_CHECKING
 from datetime import datetime
 from app.models.requirement import Priority, RequirementStatus
 
@@ -63,6 +64,67 @@ class RequirementResponse(RequirementBase):
         from_attributes = True
 
 
+class RequirementSummary(BaseModel):
+    """Lightweight requirement schema for listings (no long text fields or children)."""
+    id: int
+    title: str
+    project_name: str
+    business_owner: str
+    priority: Priority
+    status: RequirementStatus
+    quality_score: Optional[int] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class BulkItemError(BaseModel):
+    """Validation errors of one item of a bulk request."""
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel):
+    """Schema for a bulk create result."""
+    created: int
+    ids: List[int]
+    errors: List[BulkItemError] = []
+
+
+class RequirementSearchHit(BaseModel):
+    """One full-text search result."""
+    id: int
+    title: str
+    project_name: str
+    status: RequirementStatus
+    priority: Priority
+    score: Optional[float] = None  # Relevance (higher is better); None without full-text support
+    snippet: Optional[str] = None  # Best-matching passage, matches wrapped in <mark>
+
+
+class RequirementSearchResponse(BaseModel):
+    """Schema for a page of search results."""
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[RequirementSearchHit] = []
+
+
+@lru_cache(maxsize=128)
+def requirement_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Build (and cache) a response model with only the given RequirementResponse fields."""
+    return create_model(
+        "RequirementProjection",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (RequirementResponse.model_fields[name].annotation, RequirementResponse.model_fields[name])
+            for name in fields
+        },
+    )
+
+
 class SubRequirementBase(BaseModel):
     """Base sub-requirement schema."""
     title: str
@@ -133,6 +195,84 @@ class ChecklistItemResponse(ChecklistItemBase):
         from_attributes = True
 
 
+class SubRequirementTreeNode(BaseModel):
+    """A sub-requirement with its checklist items and nested sub-requirements."""
+    title: str
+    description: Optional[str] = None
+    priority: Priority = Priority.MEDIUM
+    order: int = 0
+    checklist_items: List[ChecklistItemBase] = []
+    children: List["SubRequirementTreeNode"] = []
+
+
+class RequirementTreeCreate(BaseModel):
+    """Schema for creating a whole work breakdown under one requirement."""
+    sub_requirements: List[SubRequirementTreeNode] = []
+    checklist_items: List[ChecklistItemBase] = []  # Requirement-level items
+    
+    def node_count(self) -> int:
+        """Total number of sub-requirements and checklist items in the tree."""
+        count = len(self.checklist_items)
+        stack = list(self.sub_requirements)
+        while stack:
+            node = stack.pop()
+            count += 1 + len(node.checklist_items)
+            stack.extend(node.children)
+        return count
+
+
+class SubRequirementTreeResult(BaseModel):
+    """IDs created for one sub-requirement node, mirroring the request tree."""
+    id: int
+    checklist_item_ids: List[int] = []
+    children: List["SubRequirementTreeResult"] = []
+
+
+class RequirementTreeResponse(BaseModel):
+    """Schema for a tree create result."""
+    requirement_id: int
+    sub_requirements_created: int
+    checklist_items_created: int
+    sub_requirements: List[SubRequirementTreeResult] = []
+    checklist_item_ids: List[int] = []
+
+
+class TreeRollup(BaseModel):
+    """Counts over a node's whole subtree (regardless of the depth returned)."""
+    sub_requirements: int = 0  # Descendant sub-requirements
+    checklist_items: int = 0
+    checklist_items_completed: int = 0
+
+
+class SubRequirementTree(BaseModel):
+    """A sub-requirement with its checklist items, nested children and roll-up counts."""
+    id: int
+    requirement_id: int
+    parent_id: Optional[int] = None
+    depth: int  # 1 for top-level sub-requirements
+    title: str
+    description: Optional[str] = None
+    priority: Priority
+    status: RequirementStatus
+    order: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    checklist_items: List[ChecklistItemResponse] = []
+    children: List["SubRequirementTree"] = []  # Empty beyond the requested depth; see rollup
+    rollup: TreeRollup = TreeRollup()
+
+
+class RequirementTree(BaseModel):
+    """A requirement's whole work breakdown."""
+    requirement_id: int
+    title: str
+    status: RequirementStatus
+    depth: Optional[int] = None  # Depth limit applied, if any
+    checklist_items: List[ChecklistItemResponse] = []  # Requirement-level items
+    sub_requirements: List[SubRequirementTree] = []
+    rollup: TreeRollup = TreeRollup()
+
+
 # Update forward references - import TagResponse before rebuilding
 def _rebuild_models():
     """Rebuild models with all forward references available."""
@@ -0,0 +1,120 @@
+"""
+Compiled matcher for ambiguous requirement language.
+"""
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from app.core.config import settings
+
+# Canonical term -> regex alternatives (without word boundaries)
+DEFAULT_AMBIGUOUS_TERMS = {
+    "asap": [r"asap", r"as\s+soon\s+as\s+possible"],
+    "soon": [r"soon"],
+    "better": [r"better"],
+    "faster": [r"faster"],
+    "improve": [r"improve"],
+    "optimize": [r"optimize"],
+    "some": [r"some"],
+    "few": [r"few"],
+    "many": [r"many"],
+}
+
+
+class AmbiguityMatch(NamedTuple):
+    """A single ambiguous term found in a field."""
+    term: str
+    field: str
+    offset: int
+    text: str
+
+
+def term_to_pattern(term: str) -> str:
+    """Convert a plain configured term or phrase to a regex alternative."""
+    return r"\s+".join(re.escape(word) for word in term.split())
+
+
+class AmbiguityMatcher:
+    """
+    Detect ambiguous terms with one combined, precompiled pattern.
+    Every field is scanned exactly once, whatever the number of terms, and
+    every term is reported where it occurs, even inside another term's match.
+    """
+
+    def __init__(self, terms: Optional[Dict[str, List[str]]] = None):
+        self._terms: Dict[str, List[str]] = {}
+        self._group_terms: Dict[str, str] = {}
+        self._regex: Optional[re.Pattern] = None
+        self._fingerprint = ""
+        self.add_terms(terms or {})
+
+    @property
+    def terms(self) -> List[str]:
+        """Canonical terms known to the matcher."""
+        return list(self._terms)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the terms and their patterns; changes whenever matching could."""
+        return self._fingerprint
+
+    def add_terms(self, terms: Dict[str, List[str]]) -> None:
+        """Add terms (canonical term -> regex alternatives) and recompile once."""
+        for term, patterns in terms.items():
+            existing = self._terms.setdefault(term.lower(), [])
+            existing.extend(p for p in patterns if p not in existing)
+        self._compile()
+
+    def add_plain_terms(self, terms: Iterable[str]) -> None:
+        """Add plain words or phrases, e.g. from configuration."""
+        self.add_terms({
+            term.strip(): [term_to_pattern(term)]
+            for term in terms if term and term.strip()
+        })
+
+    def _compile(self) -> None:
+        bodies = []
+        lookaheads = []
+        self._group_terms = {}
+        for index, (term, patterns) in enumerate(self._terms.items()):
+            group = f"t{index}"
+            self._group_terms[group] = term
+            # Longest alternatives first so phrases win over their prefixes
+            body = "|".join(sorted(patterns, key=len, reverse=True))
+            bodies.append(f"(?:{body})")
+            # Zero-width so terms overlapping another term's match (e.g. 'soon'
+            # inside 'as soon as possible') are still reported
+            lookaheads.append(fr"(?:(?=(?P<{group}>{body})\b))?")
+
+        self._fingerprint = hashlib.sha256(
+            json.dumps(sorted((term, sorted(patterns)) for term, patterns in self._terms.items())).encode("utf-8")
+        ).hexdigest()
+        if bodies:
+            # The leading lookahead only lets positions where some term starts through
+            self._regex = re.compile(
+                r"\b(?=(?:" + "|".join(bodies) + r")\b)" + "".join(lookaheads), re.IGNORECASE
+            )
+        else:
+            self._regex = None
+
+    def find(self, text: Optional[str], field: str) -> List[AmbiguityMatch]:
+        """Find every ambiguous term in a single field."""
+        if not text or self._regex is None:
+            return []
+        return [
+            AmbiguityMatch(term, field, match.start(), match.group(group))
+            for match in self._regex.finditer(text)
+            for group, term in self._group_terms.items()
+            if match.group(group) is not None
+        ]
+
+    def scan(self, fields: Dict[str, Optional[str]]) -> List[AmbiguityMatch]:
+        """Find every ambiguous term across several named fields."""
+        matches = []
+        for field, text in fields.items():
+            matches.extend(self.find(text, field))
+        return matches
+
+
+default_matcher = AmbiguityMatcher(DEFAULT_AMBIGUOUS_TERMS)
+default_matcher.add_plain_terms(settings.AMBIGUOUS_TERMS)
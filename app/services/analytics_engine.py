@@ -1,19 +1,184 @@
 """
 Analytics and AI/ML engine for requirement quality assessment.
 """
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import hashlib
+import json
+import re
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from dataclasses import dataclass
+from functools import cached_property
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.models.requirement import Requirement
-from app.repositories.requirement_repository import RequirementRepository
+from app.repositories.requirement_repository import RequirementRepository, RequirementValidationRepository
+from app.repositories.analytics_repository import AnalyticsSummaryRepository, TOTAL_DIMENSION
+from app.services.ambiguity_matcher import default_matcher
+from app.services.feature_extraction import FEATURE_COLUMNS, FeatureBatch, FeatureExtractor, np
+from app.services.ml_model import model_registry, train_success_model
+
+
+# Bump when validation rules or scoring change so stored results are treated as stale
+RULESET_VERSION = 1
+
+# Days before the deadline at which DeadlineRule starts warning
+DEADLINE_WARNING_DAYS = 7
+
+
+@dataclass(frozen=True)
+class RequirementSnapshot:
+    """
+    Plain, picklable copy of the requirement fields validation reads.
+    Lets rules run without an ORM session, e.g. in worker processes.
+    """
+    id: int
+    project_name: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+    priority: Any
+    status: Any
+    category: Optional[str]
+    expected_outcome: Optional[str]
+    success_criteria: Optional[str]
+    constraints: Optional[str]
+    desired_deadline: Optional[datetime]
+    quality_score: Optional[int]
+    sub_requirement_count: int = 0
+    checklist_item_count: int = 0
+    
+    @classmethod
+    def from_row(cls, row) -> "RequirementSnapshot":
+        """Build a snapshot from a row returned by RequirementRepository.get_validation_batch."""
+        return cls(**row._asdict())
+    
+    @classmethod
+    def from_requirement(cls, requirement: Requirement, sub_requirement_count: int,
+                         checklist_item_count: int) -> "RequirementSnapshot":
+        """Build a snapshot from an ORM requirement and its child counts."""
+        return cls(
+            id=requirement.id,
+            project_name=requirement.project_name,
+            title=requirement.title,
+            description=requirement.description,
+            priority=requirement.priority,
+            status=requirement.status,
+            category=requirement.category,
+            expected_outcome=requirement.expected_outcome,
+            success_criteria=requirement.success_criteria,
+            constraints=requirement.constraints,
+            desired_deadline=requirement.desired_deadline,
+            quality_score=requirement.quality_score,
+            sub_requirement_count=sub_requirement_count,
+            checklist_item_count=checklist_item_count,
+        )
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class AnalysisContext:
+    """
+    Immutable, per-requirement view shared by every validation rule.
+    Text is normalized once here instead of once per rule, and no ORM
+    session is needed to evaluate rules against it.
+    """
+    requirement_id: Optional[int]
+    title: str
+    description: str
+    expected_outcome: Optional[str]
+    success_criteria: Optional[str]
+    constraints: Optional[str]
+    desired_deadline: Optional[datetime]
+    sub_requirement_count: int
+    checklist_item_count: int
+    reference_time: datetime
+    
+    @classmethod
+    def build(cls, requirement, reference_time: Optional[datetime] = None) -> "AnalysisContext":
+        """Build a context from an ORM requirement or a RequirementSnapshot."""
+        if isinstance(requirement, RequirementSnapshot):
+            sub_requirement_count = requirement.sub_requirement_count
+            checklist_item_count = requirement.checklist_item_count
+        else:
+            sub_requirement_count = len(requirement.sub_requirements)
+            checklist_item_count = len(requirement.checklist_items)
+        
+        deadline = requirement.desired_deadline
+        if reference_time is None:
+            reference_time = datetime.now(deadline.tzinfo if deadline else None)
+        
+        return cls(
+            requirement_id=requirement.id,
+            title=(requirement.title or "").strip(),
+            description=(requirement.description or "").strip(),
+            expected_outcome=requirement.expected_outcome,
+            success_criteria=requirement.success_criteria,
+            constraints=requirement.constraints,
+            desired_deadline=deadline,
+            sub_requirement_count=sub_requirement_count,
+            checklist_item_count=checklist_item_count,
+            reference_time=reference_time,
+        )
+    
+    @classmethod
+    def of(cls, requirement) -> "AnalysisContext":
+        """Return the requirement itself if it already is a context, else build one."""
+        if isinstance(requirement, AnalysisContext):
+            return requirement
+        return cls.build(requirement)
+    
+    @property
+    def title_length(self) -> int:
+        return len(self.title)
+    
+    @property
+    def description_length(self) -> int:
+        return len(self.description)
+    
+    @property
+    def text_fields(self) -> Dict[str, str]:
+        """Free-text fields scanned by text rules."""
+        return {"title": self.title, "description": self.description}
+    
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        """Lower-cased word tokens of the title and description, computed on first use."""
+        return tuple(TOKEN_PATTERN.findall(f"{self.title} {self.description}".lower()))
+    
+    @cached_property
+    def content_hash(self) -> str:
+        """Hash everything validation depends on, including the ruleset version and ambiguous terms."""
+        deadline = self.desired_deadline
+        payload = [
+            RULESET_VERSION,
+            ClarityRule.matcher.fingerprint,
+            self.title,
+            self.description,
+            self.expected_outcome,
+            self.success_criteria,
+            self.constraints,
+            deadline.replace(tzinfo=None).isoformat() if deadline else None,
+            self.sub_requirement_count,
+            self.checklist_item_count,
+        ]
+        return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
 
 
 class ValidationRule:
-    """Base class for validation rules."""
+    """
+    Base class for validation rules.
+    Subclasses implement `evaluate` against an AnalysisContext and are
+    registered with `AnalyticsEngine.register_rule`.
+    """
+    
+    @classmethod
+    def validate(cls, requirement) -> Dict[str, Any]:
+        """Validate a requirement, snapshot or context and return warnings/errors."""
+        return cls.evaluate(AnalysisContext.of(requirement))
     
     @staticmethod
-    def validate(requirement: Requirement) -> Dict[str, Any]:
-        """Validate a requirement and return warnings/errors."""
+    def evaluate(context: AnalysisContext) -> Dict[str, Any]:
+        """Evaluate the rule and return warnings/errors."""
         return {"valid": True, "warnings": [], "errors": []}
 
 
@@ -21,26 +186,26 @@ class CompletenessRule(ValidationRule):
     """Check if all critical fields are filled."""
     
     @staticmethod
-    def validate(requirement: Requirement) -> Dict[str, any]:
+    def evaluate(context: AnalysisContext) -> Dict[str, any]:
         warnings = []
         errors = []
         
-        if not requirement.title or len(requirement.title.strip()) < 5:
+        if context.title_length < 5:
             errors.append("Title is too short or missing")
         
-        if not requirement.description or len(requirement.description.strip()) < 20:
+        if context.description_length < 20:
             errors.append("Description is too short (minimum 20 characters)")
         
-        if not requirement.success_criteria:
+        if not context.success_criteria:
             warnings.append("Success criteria is missing")
         
-        if not requirement.expected_outcome:
+        if not context.expected_outcome:
             warnings.append("Expected outcome is missing")
         
-        if not requirement.desired_deadline:
+        if not context.desired_deadline:
             warnings.append("Desired deadline is not specified")
         
-        if not requirement.constraints:
+        if not context.constraints:
             warnings.append("Constraints are not specified")
         
         return {
@@ -53,33 +218,22 @@ class CompletenessRule(ValidationRule):
 class ClarityRule(ValidationRule):
     """Check for ambiguous language and clarity issues."""
     
-    AMBIGUOUS_PATTERNS = [
-        r"\basap\b|\bas\s+soon\s+as\s+possible\b",
-        r"\bsoon\b",
-        r"\bbetter\b",
-        r"\bfaster\b",
-        r"\bimprove\b",
-        r"\boptimize\b",
-        r"\bsome\b",
-        r"\bfew\b",
-        r"\bmany\b",
-    ]
+    matcher = default_matcher
     
     @staticmethod
-    def validate(requirement: Requirement) -> Dict[str, any]:
-        import re
+    def evaluate(context: AnalysisContext) -> Dict[str, any]:
         warnings = []
         
-        text = f"{requirement.title} {requirement.description}".lower()
+        matches = ClarityRule.matcher.scan(context.text_fields)
         
-        for pattern in ClarityRule.AMBIGUOUS_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                warnings.append(f"Ambiguous language detected: '{pattern}' - consider being more specific")
+        for term in dict.fromkeys(match.term for match in matches):
+            warnings.append(f"Ambiguous language detected: '{term}' - consider being more specific")
         
         return {
             "valid": True,
             "warnings": warnings,
-            "errors": []
+            "errors": [],
+            "matches": [match._asdict() for match in matches],
         }
 
 
@@ -87,14 +241,14 @@ class DeadlineRule(ValidationRule):
     """Validate deadline is reasonable."""
     
     @staticmethod
-    def validate(requirement: Requirement) -> Dict[str, any]:
+    def evaluate(context: AnalysisContext) -> Dict[str, any]:
         warnings = []
         errors = []
         
-        if requirement.desired_deadline:
-            if requirement.desired_deadline < datetime.now(requirement.desired_deadline.tzinfo):
+        if context.desired_deadline:
+            if context.desired_deadline < context.reference_time:
                 errors.append("Desired deadline is in the past")
-            elif (requirement.desired_deadline - datetime.now(requirement.desired_deadline.tzinfo)).days < 7:
+            elif (context.desired_deadline - context.reference_time).days < DEADLINE_WARNING_DAYS:
                 warnings.append("Deadline is less than 7 days away - ensure it's realistic")
         
         return {
@@ -108,7 +262,7 @@ class QualityScorer:
     """Calculate quality score for a requirement."""
     
     @staticmethod
-    def calculate_score(requirement: Requirement, validation_results: List[Dict]) -> int:
+    def calculate_score(context: AnalysisContext, validation_results: List[Dict]) -> int:
         """Calculate quality score (0-100) based on completeness and validation."""
         score = 100
         
@@ -118,12 +272,12 @@ class QualityScorer:
             score -= len(result.get("warnings", [])) * 5
         
         # Bonus for having sub-requirements
-        if requirement.sub_requirements:
-            score += min(len(requirement.sub_requirements) * 2, 10)
+        if context.sub_requirement_count:
+            score += min(context.sub_requirement_count * 2, 10)
         
         # Bonus for having checklist items
-        if requirement.checklist_items:
-            score += min(len(requirement.checklist_items) * 1, 5)
+        if context.checklist_item_count:
+            score += min(context.checklist_item_count * 1, 5)
         
         # Ensure score is between 0 and 100
         return max(0, min(100, score))
@@ -132,6 +286,7 @@ class QualityScorer:
 class AnalyticsEngine:
     """Main analytics engine."""
     
+    # Rule registry, evaluated in order; extend with AnalyticsEngine.register_rule
     VALIDATION_RULES = [
         CompletenessRule,
         ClarityRule,
@@ -139,33 +294,99 @@ class AnalyticsEngine:
     ]
     
     @staticmethod
-    def validate_requirement(requirement: Requirement) -> Dict[str, Any]:
-        """Run all validation rules on a requirement."""
+    def register_rule(rule_class):
+        """Register a validation rule class (usable as a class decorator)."""
+        if rule_class not in AnalyticsEngine.VALIDATION_RULES:
+            AnalyticsEngine.VALIDATION_RULES.append(rule_class)
+        return rule_class
+    
+    @staticmethod
+    def validate_requirement(requirement) -> Dict[str, Any]:
+        """Run all validation rules on a requirement, snapshot or analysis context."""
+        context = AnalysisContext.of(requirement)
         all_warnings = []
         all_errors = []
         rule_results = []
         
         for rule_class in AnalyticsEngine.VALIDATION_RULES:
-            result = rule_class.validate(requirement)
+            result = rule_class.evaluate(context)
             rule_results.append(result)
             all_warnings.extend(result.get("warnings", []))
             all_errors.extend(result.get("errors", []))
         
         # Calculate quality score
-        quality_score = QualityScorer.calculate_score(requirement, rule_results)
+        quality_score = QualityScorer.calculate_score(context, rule_results)
         
         return {
             "valid": len(all_errors) == 0,
             "warnings": all_warnings,
             "errors": all_errors,
             "quality_score": quality_score,
-            "rule_results": rule_results
+            "rule_results": rule_results,
+            "sub_requirement_count": context.sub_requirement_count,
+            "checklist_item_count": context.checklist_item_count,
+        }
+    
+    @staticmethod
+    def valid_until(context: AnalysisContext) -> Optional[datetime]:
+        """Get when time-dependent rules (the deadline rule) may change their outcome."""
+        deadline = context.desired_deadline
+        if not deadline:
+            return None
+        
+        for threshold in (deadline - timedelta(days=DEADLINE_WARNING_DAYS), deadline):
+            if threshold > context.reference_time:
+                return threshold
+        return None
+    
+    @staticmethod
+    def build_validation_record(requirement) -> Dict[str, Any]:
+        """Validate a requirement, snapshot or context and build the record to store."""
+        context = AnalysisContext.of(requirement)
+        result = AnalyticsEngine.validate_requirement(context)
+        return {
+            "content_hash": context.content_hash,
+            "quality_score": result["quality_score"],
+            "valid": result["valid"],
+            "result": result,
+            "valid_until": AnalyticsEngine.valid_until(context),
         }
     
     @staticmethod
-    def get_suggestions(requirement: Requirement) -> List[str]:
+    def snapshot(db: Session, requirement: Requirement) -> RequirementSnapshot:
+        """Snapshot a requirement with child counts from COUNT queries instead of lazy loads."""
+        sub_requirement_count, checklist_item_count = AnalyticsSummaryRepository.child_counts(db, requirement.id)
+        return RequirementSnapshot.from_requirement(requirement, sub_requirement_count, checklist_item_count)
+    
+    @staticmethod
+    def refresh_validation(db: Session, requirement: Requirement) -> Dict[str, Any]:
+        """Validate a requirement after a write and store the results and quality score."""
+        record = AnalyticsEngine.build_validation_record(AnalyticsEngine.snapshot(db, requirement))
+        RequirementValidationRepository.save(db, requirement.id, record)
+        RequirementRepository.set_quality_score(db, requirement, record["quality_score"])
+        db.commit()
+        return record["result"]
+    
+    @staticmethod
+    def get_validation(db: Session, requirement: Requirement) -> Dict[str, Any]:
+        """
+        Get validation results for a requirement.
+        Returns the stored results unless they are stale (content hash mismatch or
+        a deadline threshold has passed), in which case they are recomputed without writing.
+        """
+        context = AnalysisContext.build(AnalyticsEngine.snapshot(db, requirement))
+        stored = RequirementValidationRepository.get(db, requirement.id)
+        if stored is not None and stored.content_hash == context.content_hash:
+            if stored.valid_until is None or datetime.now(stored.valid_until.tzinfo) < stored.valid_until:
+                return stored.result
+        
+        return AnalyticsEngine.validate_requirement(context)
+    
+    @staticmethod
+    def get_suggestions(requirement: Requirement, validation_result: Optional[Dict[str, Any]] = None) -> List[str]:
         """Get suggestions to improve requirement quality."""
-        validation_result = AnalyticsEngine.validate_requirement(requirement)
+        if validation_result is None:
+            validation_result = AnalyticsEngine.validate_requirement(requirement)
         suggestions = []
         
         # Suggestions based on validation
@@ -176,10 +397,10 @@ class AnalyticsEngine:
             suggestions.append("Address warnings: " + "; ".join(validation_result["warnings"][:3]))
         
         # Suggestions based on structure
-        if not requirement.sub_requirements:
+        if not validation_result["sub_requirement_count"]:
             suggestions.append("Consider breaking down into smaller sub-requirements for better tracking")
         
-        if not requirement.checklist_items:
+        if not validation_result["checklist_item_count"]:
             suggestions.append("Add checklist items to track progress")
         
         # Suggestions based on quality score
@@ -192,16 +413,63 @@ class AnalyticsEngine:
     
     @staticmethod
     def get_summary_stats(db: Session) -> Dict[str, any]:
-        """Get summary statistics for all requirements."""
-        requirements = RequirementRepository.get_all(db, skip=0, limit=10000)  # Get all
+        """
+        Get summary statistics for all requirements.
+        Reads the materialized analytics summary, so the cost depends on the
+        number of buckets rather than the number of requirements.
+        """
+        rows = AnalyticsSummaryRepository.get_all(db)
+        if not rows:
+            return AnalyticsEngine.compute_summary_stats(db)
+        
+        totals = None
+        by_dimension = {dimension: {} for dimension in AnalyticsSummaryRepository.DIMENSIONS}
+        for row in rows:
+            if row.dimension == TOTAL_DIMENSION:
+                totals = row
+            elif row.dimension in by_dimension and row.requirement_count > 0:
+                by_dimension[row.dimension][row.bucket] = row.requirement_count
+        
+        total = totals.requirement_count if totals else 0
+        if total <= 0:
+            return {
+                "total_requirements": 0,
+                "by_priority": {},
+                "by_status": {},
+                "by_category": {},
+                "by_project": {},
+                "average_sub_requirements": 0,
+                "average_checklist_items": 0,
+                "average_quality_score": 0,
+            }
         
-        total = len(requirements)
+        return {
+            "total_requirements": total,
+            "by_priority": by_dimension["priority"],
+            "by_status": by_dimension["status"],
+            "by_category": by_dimension["category"],
+            "by_project": by_dimension["project"],
+            "average_sub_requirements": round(totals.sub_requirement_count / total, 2),
+            "average_checklist_items": round(totals.checklist_item_count / total, 2),
+            "average_quality_score": round(totals.quality_score_sum / totals.quality_score_count, 2) if totals.quality_score_count > 0 else 0,
+        }
+    
+    @staticmethod
+    def compute_summary_stats(db: Session) -> Dict[str, any]:
+        """
+        Compute summary statistics from the requirement tables.
+        Aggregation happens in SQL, so the number of queries is constant
+        regardless of how many requirements exist.
+        """
+        totals = RequirementRepository.get_aggregate_totals(db)
+        total = totals["total_requirements"]
         if total == 0:
             return {
                 "total_requirements": 0,
                 "by_priority": {},
                 "by_status": {},
                 "by_category": {},
+                "by_project": {},
                 "average_sub_requirements": 0,
                 "average_checklist_items": 0,
                 "average_quality_score": 0,
@@ -209,81 +477,113 @@ class AnalyticsEngine:
         
         # Count by priority
         by_priority = {}
-        for req in requirements:
-            priority = req.priority.value if req.priority else "unknown"
-            by_priority[priority] = by_priority.get(priority, 0) + 1
+        for priority, count in RequirementRepository.count_by(db, Requirement.priority).items():
+            key = priority.value if priority else "unknown"
+            by_priority[key] = by_priority.get(key, 0) + count
         
         # Count by status
         by_status = {}
-        for req in requirements:
-            status_val = req.status.value if req.status else "unknown"
-            by_status[status_val] = by_status.get(status_val, 0) + 1
+        for status_val, count in RequirementRepository.count_by(db, Requirement.status).items():
+            key = status_val.value if status_val else "unknown"
+            by_status[key] = by_status.get(key, 0) + count
         
         # Count by category
         by_category = {}
-        for req in requirements:
-            category = req.category or "uncategorized"
-            by_category[category] = by_category.get(category, 0) + 1
+        for category, count in RequirementRepository.count_by(db, Requirement.category).items():
+            key = category or "uncategorized"
+            by_category[key] = by_category.get(key, 0) + count
         
-        # Calculate averages
-        total_sub_reqs = sum(len(req.sub_requirements) for req in requirements)
-        total_checklist_items = sum(len(req.checklist_items) for req in requirements)
-        total_quality_score = sum(req.quality_score or 0 for req in requirements)
-        quality_scores_count = sum(1 for req in requirements if req.quality_score is not None)
+        by_project = RequirementRepository.count_by(db, Requirement.project_name)
+        
+        average_quality_score = totals["average_quality_score"]
         
         return {
             "total_requirements": total,
             "by_priority": by_priority,
             "by_status": by_status,
             "by_category": by_category,
-            "average_sub_requirements": round(total_sub_reqs / total, 2) if total > 0 else 0,
-            "average_checklist_items": round(total_checklist_items / total, 2) if total > 0 else 0,
-            "average_quality_score": round(total_quality_score / quality_scores_count, 2) if quality_scores_count > 0 else 0,
+            "by_project": by_project,
+            "average_sub_requirements": round(totals["total_sub_requirements"] / total, 2),
+            "average_checklist_items": round(totals["total_checklist_items"] / total, 2),
+            "average_quality_score": round(average_quality_score, 2) if average_quality_score is not None else 0,
         }
 
 
 class MLEngine:
-    """ML/AI engine scaffolding for future model training."""
+    """
+    Success-probability model serving and training.
+    Predictions use the cached model from app.services.ml_model and fall back
+    to a quality-score heuristic until a model has been trained.
+    """
+    
+    @staticmethod
+    def heuristic_probability(quality_score: Optional[int]) -> float:
+        """Fallback probability: quality score / 100, or 0.5 when unscored."""
+        if quality_score is None:
+            return 0.5
+        return quality_score / 100.0
     
     @staticmethod
-    def predict_success_probability(requirement: Requirement) -> float:
+    def predict_success_probability(db: Session, requirement: Requirement) -> float:
         """
-        Placeholder for ML model to predict success probability.
-        Currently returns a dummy value based on quality score.
+        Predict the success probability of a single requirement. Its features
+        come from the batch feature query (one query, children counted in SQL).
         """
-        # This is a placeholder - in production, this would use a trained model
-        if requirement.quality_score is None:
-            return 0.5
+        model = model_registry.get()
+        if model is None:
+            return MLEngine.heuristic_probability(requirement.quality_score)
         
-        # Simple heuristic: quality score / 100
-        return requirement.quality_score / 100.0
+        batch = FeatureExtractor.extract(db, [requirement.id])
+        return float(model.predict_proba(batch.matrix)[0])
     
     @staticmethod
-    def train_model(db: Session, training_data: Optional[List] = None):
+    def predict_batch(batch: FeatureBatch, model: Any = None):
         """
-        Placeholder for training ML model.
-        In production, this would:
-        1. Load historical requirements with outcome labels
-        2. Extract features
-        3. Train model (e.g., logistic regression, random forest)
-        4. Save model
+        Predict success probabilities for a feature batch in one vectorized call.
+        Uses the given model, else the current serving model, else the heuristic.
         """
-        # Placeholder implementation
-        pass
+        model = model or model_registry.get()
+        if model is None:
+            return np.array([MLEngine.heuristic_probability(score) for score in batch.quality_scores],
+                            dtype=np.float64)
+        return model.predict_proba(batch.matrix)
     
     @staticmethod
-    def extract_features(requirement: Requirement) -> Dict[str, any]:
-        """Extract features from requirement for ML model."""
-        return {
-            "title_length": len(requirement.title) if requirement.title else 0,
-            "description_length": len(requirement.description) if requirement.description else 0,
-            "has_success_criteria": bool(requirement.success_criteria),
-            "has_deadline": bool(requirement.desired_deadline),
-            "num_sub_requirements": len(requirement.sub_requirements),
-            "num_checklist_items": len(requirement.checklist_items),
-            "priority_high": 1 if requirement.priority.value == "high" else 0,
-            "priority_medium": 1 if requirement.priority.value == "medium" else 0,
-            "priority_low": 1 if requirement.priority.value == "low" else 0,
-        }
-
-
+    def iter_predictions(db: Session, requirement_ids: Optional[List[int]] = None,
+                         chunk_size: int = 5000, **filters) -> Iterator[Tuple[Any, Any]]:
+        """
+        Stream (ids, probabilities) arrays for matching requirements, one feature
+        query and one model call per chunk. The model is fixed for the whole run.
+        """
+        model = model_registry.get()
+        for batch in FeatureExtractor.iter_batches(db, requirement_ids, chunk_size, **filters):
+            yield batch.ids, MLEngine.predict_batch(batch, model)
+    
+    @staticmethod
+    def train_model(db: Session, full: bool = False, chunk_size: int = 1000) -> Dict[str, Any]:
+        """
+        Train the success model on completed/cancelled requirements and serve it.
+        Incremental by default: only outcomes changed since the last training are learned.
+        """
+        model = train_success_model(db, model_registry.store, full=full, chunk_size=chunk_size)
+        if model is not None:
+            model_registry.swap(model)
+        status = model_registry.status()
+        status["trained"] = model is not None
+        return status
+    
+    @staticmethod
+    def extract_features(db: Session, requirement: Requirement) -> Dict[str, any]:
+        """
+        Extract features from requirement for ML model.
+        Runs the batch feature query for this one requirement, so single and
+        batch extraction produce identical features without loading children.
+        """
+        batch = FeatureExtractor.extract(db, [requirement.id])
+        return dict(zip(FEATURE_COLUMNS, batch.matrix[0].astype(int).tolist()))
+    
+    @staticmethod
+    def extract_feature_matrix(db: Session, requirement_ids: Optional[List[int]] = None,
+                               chunk_size: int = 1000, **filters):
+        """Extract a feature matrix for many requirements (see FeatureExtractor.extract)."""
+        return FeatureExtractor.extract(db, requirement_ids, chunk_size, **filters)
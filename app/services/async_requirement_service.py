@@ -0,0 +1,73 @@
+"""
+Async service layer for requirement business logic.
+Runs RequirementService on the AsyncSession's underlying Session
+(AsyncSession.run_sync). Objects returned for API responses come back with the
+relationships their response schema reads already loaded, because lazy loads
+are not possible once the handler has returned.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.repositories.async_requirement_repository import async_variant
+from app.repositories.requirement_repository import RequirementRepository, SubRequirementRepository
+from app.services.requirement_service import RequirementService
+from app.schemas.requirement import RequirementCreate, RequirementUpdate, SubRequirementCreate
+
+
+class AsyncRequirementService:
+    """Async service for requirement operations (see RequirementService)."""
+    
+    get_requirement = async_variant(RequirementService.get_requirement)
+    get_requirement_response = async_variant(RequirementService.get_requirement_response)
+    get_all_requirements = async_variant(RequirementService.get_all_requirements)
+    get_requirements_page = async_variant(RequirementService.get_requirements_page)
+    search_requirements = async_variant(RequirementService.search_requirements)
+    delete_requirement = async_variant(RequirementService.delete_requirement)
+    get_requirement_tree = async_variant(RequirementService.get_requirement_tree)
+    get_sub_requirements = async_variant(RequirementService.get_sub_requirements)
+    delete_sub_requirement = async_variant(RequirementService.delete_sub_requirement)
+    create_checklist_item = async_variant(RequirementService.create_checklist_item)
+    get_checklist_items = async_variant(RequirementService.get_checklist_items)
+    update_checklist_item = async_variant(RequirementService.update_checklist_item)
+    delete_checklist_item = async_variant(RequirementService.delete_checklist_item)
+    
+    @staticmethod
+    async def create_requirement(db: AsyncSession, requirement: RequirementCreate,
+                                 owner_id: Optional[int] = None, load: Optional[str] = "response"):
+        """Create a requirement with validation; returned with the `load` shape loaded."""
+        def create(session):
+            created = RequirementService.create_requirement(session, requirement, owner_id)
+            return RequirementRepository.get(session, created.id, load=load, refresh=True)
+        return await db.run_sync(create)
+    
+    @staticmethod
+    async def update_requirement(db: AsyncSession, requirement_id: int, requirement_update: RequirementUpdate):
+        """Update a requirement; returned with its response relationships loaded."""
+        def update(session):
+            if not RequirementService.update_requirement(session, requirement_id, requirement_update):
+                return None
+            return RequirementRepository.get(session, requirement_id, load="response", refresh=True)
+        return await db.run_sync(update)
+    
+    @staticmethod
+    async def create_sub_requirement(db: AsyncSession, requirement_id: int, sub_requirement: SubRequirementCreate):
+        """Create a sub-requirement; returned with its checklist items loaded."""
+        def create(session):
+            created = RequirementService.create_sub_requirement(session, requirement_id, sub_requirement)
+            if not created:
+                return None
+            return SubRequirementRepository.get(session, created.id, load="response", refresh=True)
+        return await db.run_sync(create)
+    
+    @staticmethod
+    async def get_sub_requirement(db: AsyncSession, sub_requirement_id: int):
+        """Get a sub-requirement with its checklist items loaded."""
+        return await db.run_sync(SubRequirementRepository.get, sub_requirement_id, "response")
+    
+    @staticmethod
+    async def update_sub_requirement(db: AsyncSession, sub_requirement_id: int, sub_requirement_update: dict):
+        """Update a sub-requirement; returned with its checklist items loaded."""
+        def update(session):
+            if not RequirementService.update_sub_requirement(session, sub_requirement_id, sub_requirement_update):
+                return None
+            return SubRequirementRepository.get(session, sub_requirement_id, load="response", refresh=True)
+        return await db.run_sync(update)
@@ -0,0 +1,238 @@
+"""
+Bulk re-validation of requirement quality scores.
+"""
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.requirement import RequirementStatus
+from app.repositories.requirement_repository import RequirementRepository
+from app.services.analytics_engine import AnalyticsEngine, RequirementSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def score_snapshot(snapshot: RequirementSnapshot) -> Tuple[int, Dict[str, Any]]:
+    """Validate one snapshot and return (requirement_id, validation record). Runs in worker processes."""
+    return snapshot.id, AnalyticsEngine.build_validation_record(snapshot)
+
+
+@dataclass
+class RevalidationFilters:
+    """Filters selecting which requirements to rescore."""
+    project_name: Optional[str] = None
+    status: Optional[RequirementStatus] = None
+    modified_since: Optional[datetime] = None
+
+    def as_kwargs(self) -> Dict:
+        return {
+            "project_name": self.project_name,
+            "status": self.status,
+            "modified_since": self.modified_since,
+        }
+
+    def to_json(self) -> Dict:
+        return {
+            "project_name": self.project_name,
+            "status": self.status.value if self.status else None,
+            "modified_since": self.modified_since.isoformat() if self.modified_since else None,
+        }
+
+
+@dataclass
+class RevalidationProgress:
+    """Progress of a bulk re-validation run; also the checkpoint contents."""
+    total: int = 0
+    processed: int = 0
+    updated: int = 0
+    last_id: int = 0
+    filters: Dict = field(default_factory=dict)
+    finished: bool = False
+
+    @property
+    def percent(self) -> float:
+        return round(100.0 * self.processed / self.total, 1) if self.total else 100.0
+
+
+class BulkRevalidator:
+    """
+    Rescore requirements in keyset-ordered chunks.
+    Rule evaluation can be fanned out across a process pool (workers > 0);
+    scores and validation records are written back with executemany
+    statements, one transaction per chunk.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        chunk_size: int = 500,
+        workers: int = 0,
+        checkpoint_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[RevalidationProgress], None]] = None,
+        start_method: Optional[str] = None,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.progress_callback = progress_callback
+        self.start_method = start_method  # Worker process start method (None: the platform default)
+
+    def load_checkpoint(self, filters: RevalidationFilters) -> Optional[RevalidationProgress]:
+        """Load a checkpoint written by a previous run with the same filters."""
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return None
+
+        data = json.loads(self.checkpoint_path.read_text())
+        if data.get("filters") != filters.to_json():
+            raise ValueError("Checkpoint was written with different filters")
+        return RevalidationProgress(**data)
+
+    def save_checkpoint(self, progress: RevalidationProgress) -> None:
+        """Atomically write the checkpoint file."""
+        if not self.checkpoint_path:
+            return
+
+        tmp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(progress)))
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _score_chunk(self, snapshots: List[RequirementSnapshot],
+                     pool: Optional[ProcessPoolExecutor]) -> Dict[int, Dict[str, Any]]:
+        if pool is None:
+            return dict(score_snapshot(snapshot) for snapshot in snapshots)
+
+        chunksize = max(1, len(snapshots) // (self.workers * 4))
+        return dict(pool.map(score_snapshot, snapshots, chunksize=chunksize))
+
+    def run(self, filters: Optional[RevalidationFilters] = None, resume: bool = False) -> RevalidationProgress:
+        """Rescore every requirement matching the filters."""
+        filters = filters or RevalidationFilters()
+        progress = self.load_checkpoint(filters) if resume else None
+        if progress is None:
+            progress = RevalidationProgress(filters=filters.to_json())
+        if progress.finished:
+            return progress
+
+        progress.total = progress.processed + RequirementRepository.count_for_validation(
+            self.db, after_id=progress.last_id, **filters.as_kwargs()
+        )
+
+        pool = None
+        if self.workers > 0:
+            context = multiprocessing.get_context(self.start_method) if self.start_method else None
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        try:
+            while True:
+                rows = RequirementRepository.get_validation_batch(
+                    self.db, after_id=progress.last_id, limit=self.chunk_size, **filters.as_kwargs()
+                )
+                if not rows:
+                    break
+
+                snapshots = [RequirementSnapshot.from_row(row) for row in rows]
+                records = self._score_chunk(snapshots, pool)
+                scores = {requirement_id: record["quality_score"] for requirement_id, record in records.items()}
+                progress.updated += RequirementRepository.bulk_update_quality_scores(
+                    self.db, snapshots, scores, validations=records
+                )
+                progress.processed += len(snapshots)
+                progress.last_id = snapshots[-1].id
+
+                self.save_checkpoint(progress)
+                if self.progress_callback:
+                    self.progress_callback(progress)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        progress.finished = True
+        self.save_checkpoint(progress)
+        return progress
+
+
+@dataclass
+class RevalidationRun:
+    """A bulk re-validation started in the background, and its latest progress."""
+    id: int
+    progress: RevalidationProgress
+    status: str = "running"  # running, done, failed
+    error: Optional[str] = None
+
+
+class RevalidationRunner:
+    """
+    Runs one bulk re-validation at a time in a background thread, on its own
+    session from `session_factory`, checkpointing to `checkpoint_path` like
+    the CLI. The progress of recent runs is kept for polling (this process).
+    """
+
+    def __init__(self, checkpoint_path: str, session_factory: Callable[[], Session] = SessionLocal,
+                 keep: int = 20):
+        self.checkpoint_path = checkpoint_path
+        self.session_factory = session_factory
+        self.keep = keep  # Finished runs remembered
+        self._runs: "OrderedDict[int, RevalidationRun]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, filters: RevalidationFilters, chunk_size: int = 500, workers: int = 0,
+              resume: bool = False) -> Optional[RevalidationRun]:
+        """Start a run in the background. Returns None if one is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return None
+            run = RevalidationRun(id=next(self._ids), progress=RevalidationProgress(filters=filters.to_json()))
+            self._runs[run.id] = run
+            while len(self._runs) > self.keep:
+                self._runs.popitem(last=False)
+            self._thread = threading.Thread(
+                target=self._run, args=(run, filters, chunk_size, workers, resume),
+                name="revalidation", daemon=True
+            )
+            self._thread.start()
+            return run
+
+    def get(self, run_id: int) -> Optional[RevalidationRun]:
+        """A recent run, or None."""
+        return self._runs.get(run_id)
+
+    def _run(self, run: RevalidationRun, filters: RevalidationFilters, chunk_size: int,
+             workers: int, resume: bool) -> None:
+        def report(progress: RevalidationProgress) -> None:
+            run.progress = replace(progress)  # A copy: the revalidator keeps updating its own
+
+        db = self.session_factory()
+        try:
+            revalidator = BulkRevalidator(
+                db,
+                chunk_size=chunk_size,
+                workers=workers,
+                checkpoint_path=self.checkpoint_path,
+                progress_callback=report,
+                # Forking a threaded server process is unsafe
+                start_method="forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+            )
+            run.progress = revalidator.run(filters, resume=resume)
+            run.status = "done"
+        except Exception as e:
+            logger.exception("Bulk re-validation %d failed", run.id)
+            run.error = str(e)
+            run.status = "failed"
+        finally:
+            db.close()
+
+
+revalidation_runner = RevalidationRunner(settings.REVALIDATION_CHECKPOINT)
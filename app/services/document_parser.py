@@ -1,16 +1,24 @@
 """
 Document parser for special format requirement documents.
 """
+import logging
 import re
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Set
 from pathlib import Path
-import PyPDF2
 from docx import Document
+from app.core.config import settings
+from app.services.parsing_executor import ParsingError
+from app.services.pdf_extraction import iter_pdf_pages
+
+logger = logging.getLogger(__name__)
 
 
 class DocumentParser:
     """Parser for requirement documents in special format."""
     
+    # Bump whenever parse_document output changes (cached parse results are keyed by it)
+    VERSION = "2"
+    
     # Section patterns - extensible and can be improved with ML later
     SECTION_PATTERNS = {
         "business_requirement": [
@@ -48,15 +56,16 @@ class DocumentParser:
     }
     
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> str:
-        """Extract text from PDF file."""
+    def parser_version() -> str:
+        """VERSION plus the PDF reading settings, so changing them invalidates cached parses."""
+        return (f"{DocumentParser.VERSION}-pdf-pages-{settings.PDF_MAX_PAGES}"
+                f"-stop-{int(settings.PDF_STOP_WHEN_SECTIONS_FOUND)}")
+    
+    @staticmethod
+    def extract_text_from_pdf(file_path: str, max_pages: Optional[int] = None) -> str:
+        """Extract text from PDF file (the first `max_pages` pages, if given)."""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return "".join(f"{page.text}\n" for page in iter_pdf_pages(file_path, max_pages))
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
     
@@ -80,10 +89,9 @@ class DocumentParser:
             raise Exception(f"Error reading text file: {str(e)}")
     
     @staticmethod
-    def extract_text(file_path: str) -> str:
-        """Extract text from document based on file extension."""
-        path = Path(file_path)
-        extension = path.suffix.lower()
+    def extract_text(file_path: str, extension: Optional[str] = None) -> str:
+        """Extract text from document based on file extension (the path's, unless given)."""
+        extension = (extension or Path(file_path).suffix).lower()
         
         if extension == '.pdf':
             return DocumentParser.extract_text_from_pdf(file_path)
@@ -94,6 +102,16 @@ class DocumentParser:
         else:
             raise ValueError(f"Unsupported file type: {extension}")
     
+    @staticmethod
+    def sections_mentioned(text: str) -> Set[str]:
+        """Sections with a heading pattern matching some line of the text."""
+        lines = [line.strip().lower() for line in text.split('\n') if line.strip()]
+        return {
+            section_key
+            for section_key, patterns in DocumentParser.SECTION_PATTERNS.items()
+            if any(re.search(pattern, line, re.IGNORECASE) for pattern in patterns for line in lines)
+        }
+    
     @staticmethod
     def detect_sections(text: str) -> Dict[str, Optional[str]]:
         """Detect sections in document text based on headings."""
@@ -139,11 +157,50 @@ class DocumentParser:
         return sections
     
     @staticmethod
-    def parse_document(file_path: str) -> Dict[str, any]:
-        """Parse a requirement document and return structured data."""
-        # Extract text
-        text = DocumentParser.extract_text(file_path)
+    def parse_pdf(file_path: str, executor=None) -> Dict[str, any]:
+        """
+        Parse a requirement PDF page by page, up to settings.PDF_MAX_PAGES.
+        With a ParsingExecutor, page ranges are extracted in its processes.
+        With settings.PDF_STOP_WHEN_SECTIONS_FOUND, reading stops after the
+        page on which the last missing section heading appears (so a final
+        section continuing on later pages is cut short).
+        Per-page extraction times are returned as `page_timings`.
+        """
+        pages = []
+        timings = []
+        found = set()
+        pages_iter = iter_pdf_pages(file_path, settings.PDF_MAX_PAGES, executor)
+        try:
+            for page in pages_iter:
+                pages.append(page.text)
+                timings.append({"page": page.number, "seconds": round(page.seconds, 4)})
+                if settings.PDF_STOP_WHEN_SECTIONS_FOUND:
+                    found |= DocumentParser.sections_mentioned(page.text)
+                    if len(found) == len(DocumentParser.SECTION_PATTERNS):
+                        logger.debug("All sections found on page %d of %s", page.number, file_path)
+                        break
+        except ParsingError:
+            raise  # From the executor, with its own type and message
+        except Exception as e:
+            raise Exception(f"Error extracting text from PDF: {str(e)}")
+        finally:
+            pages_iter.close()
         
+        parsed_data = DocumentParser.parse_text("".join(f"{text}\n" for text in pages))
+        parsed_data["page_timings"] = timings
+        return parsed_data
+    
+    @staticmethod
+    def parse_document(file_path: str, extension: Optional[str] = None) -> Dict[str, any]:
+        """Parse a requirement document and return structured data (by the path's extension, unless given)."""
+        extension = (extension or Path(file_path).suffix).lower()
+        if extension == '.pdf':
+            return DocumentParser.parse_pdf(file_path)
+        return DocumentParser.parse_text(DocumentParser.extract_text(file_path, extension))
+    
+    @staticmethod
+    def parse_text(text: str) -> Dict[str, any]:
+        """Structured data of a requirement document's text."""
         # Detect sections
         sections = DocumentParser.detect_sections(text)
         
@@ -0,0 +1,157 @@
+"""
+Batch feature extraction for the ML engine.
+"""
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.models.requirement import Priority, Requirement
+from app.repositories.requirement_repository import RequirementRepository
+
+# Optional imports - feature matrices need NumPy, data frames need pandas
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+    pd = None
+
+
+# Stable column schema shared by training and serving; append only
+FEATURE_COLUMNS = [
+    "title_length",
+    "description_length",
+    "has_success_criteria",
+    "has_deadline",
+    "num_sub_requirements",
+    "num_checklist_items",
+    "priority_high",
+    "priority_medium",
+    "priority_low",
+]
+
+
+class FeatureInput(NamedTuple):
+    """Raw per-requirement inputs, as returned by RequirementRepository.get_feature_rows."""
+    id: Optional[int]
+    title_length: int
+    description_length: int
+    success_criteria_length: int
+    has_deadline: bool
+    num_sub_requirements: int
+    num_checklist_items: int
+    priority: Any
+    status: Any
+    quality_score: Optional[int] = None
+
+    @classmethod
+    def from_requirement(cls, requirement: Requirement) -> "FeatureInput":
+        """Build inputs from an ORM requirement (same values the SQL query computes)."""
+        return cls(
+            id=requirement.id,
+            title_length=len(requirement.title or ""),
+            description_length=len(requirement.description or ""),
+            success_criteria_length=len(requirement.success_criteria or ""),
+            has_deadline=requirement.desired_deadline is not None,
+            num_sub_requirements=len(requirement.sub_requirements),
+            num_checklist_items=len(requirement.checklist_items),
+            priority=requirement.priority,
+            status=requirement.status,
+            quality_score=requirement.quality_score,
+        )
+
+
+def feature_vector(row) -> List[int]:
+    """Turn one row of inputs into feature values ordered as FEATURE_COLUMNS."""
+    priority = row.priority.value if isinstance(row.priority, Priority) else row.priority
+    return [
+        row.title_length,
+        row.description_length,
+        1 if row.success_criteria_length else 0,
+        1 if row.has_deadline else 0,
+        row.num_sub_requirements,
+        row.num_checklist_items,
+        1 if priority == Priority.HIGH.value else 0,
+        1 if priority == Priority.MEDIUM.value else 0,
+        1 if priority == Priority.LOW.value else 0,
+    ]
+
+
+class FeatureBatch(NamedTuple):
+    """A chunk of extracted features."""
+    ids: Any  # np.ndarray of requirement ids
+    matrix: Any  # np.ndarray, shape (len(ids), len(FEATURE_COLUMNS))
+    statuses: List[Any]
+    quality_scores: List[Optional[int]]
+
+    def to_frame(self):
+        """Return the batch as a pandas DataFrame indexed by requirement id."""
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for data frames. Install with: pip install pandas")
+        return pd.DataFrame(self.matrix, columns=FEATURE_COLUMNS, index=pd.Index(self.ids, name="id"))
+
+
+class FeatureExtractor:
+    """
+    Build feature matrices from the database.
+    Each chunk is one query: columns, text lengths and child counts are
+    computed in SQL, and rows are streamed in id order so memory stays bounded.
+    """
+
+    @staticmethod
+    def rows_to_batch(rows: List[Any]) -> FeatureBatch:
+        """Vectorize raw rows into a feature batch."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for feature extraction. Install with: pip install numpy")
+
+        ids = np.fromiter((row.id or 0 for row in rows), dtype=np.int64, count=len(rows))
+        matrix = np.array([feature_vector(row) for row in rows], dtype=np.float64).reshape(
+            len(rows), len(FEATURE_COLUMNS)
+        )
+        return FeatureBatch(ids, matrix, [row.status for row in rows], [row.quality_score for row in rows])
+
+    @staticmethod
+    def iter_batches(db: Session, requirement_ids: Optional[List[int]] = None, chunk_size: int = 1000,
+                     **filters) -> Iterator[FeatureBatch]:
+        """Stream feature batches of at most chunk_size requirements."""
+        if requirement_ids is not None:
+            unique_ids = sorted(set(requirement_ids))
+            for start in range(0, len(unique_ids), chunk_size):
+                rows = RequirementRepository.get_feature_rows(
+                    db, requirement_ids=unique_ids[start:start + chunk_size], **filters
+                )
+                if rows:
+                    yield FeatureExtractor.rows_to_batch(rows)
+            return
+
+        after_id = 0
+        while True:
+            rows = RequirementRepository.get_feature_rows(db, after_id=after_id, limit=chunk_size, **filters)
+            if not rows:
+                return
+            yield FeatureExtractor.rows_to_batch(rows)
+            after_id = rows[-1].id
+
+    @staticmethod
+    def extract(db: Session, requirement_ids: Optional[List[int]] = None, chunk_size: int = 1000,
+                **filters) -> FeatureBatch:
+        """Extract features for all matching requirements into a single batch."""
+        batches = list(FeatureExtractor.iter_batches(db, requirement_ids, chunk_size, **filters))
+        if not batches:
+            return FeatureExtractor.rows_to_batch([])
+        return FeatureBatch(
+            np.concatenate([batch.ids for batch in batches]),
+            np.vstack([batch.matrix for batch in batches]),
+            [status for batch in batches for status in batch.statuses],
+            [score for batch in batches for score in batch.quality_scores],
+        )
+
+    @staticmethod
+    def extract_one(requirement: Requirement) -> Dict[str, int]:
+        """Extract features for a single ORM requirement as a dict."""
+        return dict(zip(FEATURE_COLUMNS, feature_vector(FeatureInput.from_requirement(requirement))))
@@ -2,6 +2,7 @@
 Image processing and OCR module.
 """
 import os
+from functools import lru_cache
 from typing import Optional, Tuple
 from pathlib import Path
 
@@ -40,6 +41,9 @@ from app.core.config import settings
 class ImageProcessor:
     """Image processing and OCR utilities."""
     
+    # Bump whenever preprocessing or OCR settings change (cached OCR results are keyed by it)
+    OCR_VERSION = "1"
+    
     @staticmethod
     def preprocess_image(image_path: str):
         """Preprocess image for better OCR results."""
@@ -79,6 +83,19 @@ class ImageProcessor:
         
         return image
     
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def ocr_version() -> str:
+        """OCR_VERSION plus the Tesseract version, so upgrading Tesseract invalidates cached results."""
+        if not TESSERACT_AVAILABLE:
+            return ImageProcessor.OCR_VERSION
+        try:
+            if settings.TESSERACT_CMD:
+                pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
+            return f"{ImageProcessor.OCR_VERSION}-tesseract-{pytesseract.get_tesseract_version()}"
+        except Exception:
+            return ImageProcessor.OCR_VERSION
+    
     @staticmethod
     def extract_text_from_image(image_path: str) -> Tuple[str, str]:
         """
@@ -0,0 +1,182 @@
+"""
+In-process background job queue for document parsing and image OCR.
+"""
+import asyncio
+import itertools
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import Job, JobKind
+from app.models.requirement import Priority
+from app.repositories.job_repository import JobRepository, PRIORITY_RANK
+from app.services.upload_processing import ingest_document, ingest_image, stored_upload
+
+logger = logging.getLogger(__name__)
+
+# Processes a (claimed) job in the given session; returns the ID of the created requirement
+JobHandler = Callable[[AsyncSession, Job], Awaitable[Optional[int]]]
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job kind already has the maximum number of jobs waiting."""
+
+
+async def run_document_job(db: AsyncSession, job: Job) -> int:
+    """Parse an uploaded document into a requirement (unless an interrupted attempt already created it)."""
+    if job.requirement_id is not None:
+        return job.requirement_id
+    payload = job.payload
+    requirement = await ingest_document(
+        db, stored_upload(payload), payload["project_name"], payload["business_owner"], job_id=job.id
+    )
+    return requirement.id
+
+
+async def run_image_job(db: AsyncSession, job: Job) -> int:
+    """OCR an uploaded image into a requirement (unless an interrupted attempt already created it)."""
+    if job.requirement_id is not None:
+        return job.requirement_id
+    payload = job.payload
+    requirement = await ingest_image(
+        db, stored_upload(payload), payload["project_name"], payload["business_owner"], job_id=job.id
+    )
+    return requirement.id
+
+
+class JobQueue:
+    """
+    One bounded priority queue and pool of worker tasks per job kind.
+    Jobs are persisted before they are queued, and a worker runs a job only
+    if it claims it in the database, so a job queued in several processes
+    runs once. Running jobs renew a lease; start() and a periodic check
+    queue jobs again whose lease expired (their process died), and start()
+    also picks up jobs left queued.
+    """
+
+    def __init__(self, handlers: Dict[JobKind, JobHandler], workers: Dict[JobKind, int],
+                 max_queued: int, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+                 lease_seconds: float = 60):
+        self.handlers = handlers
+        self.workers = workers
+        self.max_queued = max_queued  # Waiting jobs per kind
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds  # Running jobs not renewed for this long are queued again
+        self._queues: Dict[JobKind, asyncio.PriorityQueue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+        self._sequence = itertools.count()  # First in, first out within a priority
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def start(self) -> None:
+        """Resume unfinished jobs and start the workers."""
+        if self.running:
+            return
+        self._queues = {kind: asyncio.PriorityQueue() for kind in self.handlers}
+        async with self.session_factory() as db:
+            expired = await db.run_sync(JobRepository.requeue_expired, self.lease_seconds)
+            queued = await db.run_sync(JobRepository.get_queued)
+        for job in queued:
+            self._enqueue(job)
+        for kind, count in self.workers.items():
+            self._tasks.extend(asyncio.create_task(self._work(kind)) for _ in range(count))
+        self._tasks.append(asyncio.create_task(self._requeue_expired()))
+        self._running = True
+        if queued:
+            logger.info("Resumed %d queued background jobs (%d interrupted)", len(queued), len(expired))
+
+    async def stop(self) -> None:
+        """Stop the workers. Interrupted and waiting jobs stay in the database for the next start."""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, db: AsyncSession, kind: JobKind, payload: Dict[str, Any],
+                     priority: Priority = Priority.MEDIUM) -> Job:
+        """Persist and queue a job. Raises JobQueueFullError if too many jobs of its kind are waiting."""
+        if not self.running:
+            raise RuntimeError("Job queue is not running")
+        if self._queues[kind].qsize() >= self.max_queued:
+            raise JobQueueFullError(f"Too many {kind.value} jobs waiting")
+        job = await db.run_sync(JobRepository.create, kind, payload, priority)
+        self._enqueue(job)
+        return job
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        for queue in self._queues.values():
+            await queue.join()
+
+    def _enqueue(self, job: Job) -> None:
+        self._queues[job.kind].put_nowait((PRIORITY_RANK[job.priority], next(self._sequence), job.id))
+
+    async def _work(self, kind: JobKind) -> None:
+        queue = self._queues[kind]
+        while True:
+            _, _, job_id = await queue.get()
+            try:
+                await self._run(kind, job_id)
+            except Exception:
+                # Keep the worker alive if recording the outcome fails (the job is resumed at the next start)
+                logger.exception("Could not run job %d", job_id)
+            finally:
+                queue.task_done()
+
+    async def _requeue_expired(self) -> None:
+        """Periodically queue jobs again whose worker stopped renewing their lease."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 2)
+            try:
+                async with self.session_factory() as db:
+                    expired = await db.run_sync(JobRepository.requeue_expired, self.lease_seconds)
+            except Exception:
+                logger.exception("Could not check for expired jobs")
+                continue
+            for job in expired:
+                if job.kind in self._queues:
+                    logger.warning("Job %d lost its worker; queued again", job.id)
+                    self._enqueue(job)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Renew a running job's lease until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.run_sync(JobRepository.heartbeat, job_id)
+            except Exception:
+                logger.exception("Could not renew the lease of job %d", job_id)
+
+    async def _run(self, kind: JobKind, job_id: int) -> None:
+        async with self.session_factory() as db:
+            job = await db.run_sync(JobRepository.claim, job_id)
+            if not job:
+                return  # Claimed by another worker or process, or no longer queued
+            if job.attempts > settings.JOB_MAX_ATTEMPTS:
+                await db.run_sync(JobRepository.mark_failed, job_id, "Interrupted too many times")
+                return
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                requirement_id = await self.handlers[kind](db, job)
+            except Exception as e:
+                logger.exception("Job %d failed", job_id)
+                await db.rollback()
+                await db.run_sync(JobRepository.mark_failed, job_id, str(e))
+            else:
+                await db.run_sync(JobRepository.mark_done, job_id, requirement_id)
+            finally:
+                heartbeat.cancel()
+
+
+job_queue = JobQueue(
+    handlers={JobKind.DOCUMENT: run_document_job, JobKind.IMAGE: run_image_job},
+    workers={JobKind.DOCUMENT: settings.JOB_DOCUMENT_WORKERS, JobKind.IMAGE: settings.JOB_IMAGE_WORKERS},
+    max_queued=settings.JOB_QUEUE_MAX_SIZE,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+)
@@ -0,0 +1,208 @@
+"""
+Success-probability model: incremental training, versioned storage and cached serving.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.requirement import RequirementStatus
+from app.services.feature_extraction import FEATURE_COLUMNS, FeatureExtractor, np
+
+# Optional imports - training and serving need scikit-learn and joblib
+try:
+    import joblib
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.preprocessing import StandardScaler
+    SKLEARN_AVAILABLE = np is not None
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    joblib = None
+    SGDClassifier = None
+    StandardScaler = None
+
+# Requirement outcomes used as training labels
+OUTCOME_LABELS = {
+    RequirementStatus.COMPLETED: 1,
+    RequirementStatus.CANCELLED: 0,
+}
+
+
+class SuccessModel:
+    """
+    Scaler + logistic-loss SGD classifier, both updated with partial_fit
+    so new outcomes can be learned without retraining from scratch.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.feature_columns = list(FEATURE_COLUMNS)
+        self.scaler = StandardScaler()
+        self.classifier = SGDClassifier(loss="log_loss", random_state=0)
+        self.trained_samples = 0
+        self.trained_until: Optional[datetime] = None
+
+    def partial_fit(self, matrix, labels) -> None:
+        """Update the model with one batch of labelled features."""
+        self.scaler.partial_fit(matrix)
+        self.classifier.partial_fit(self.scaler.transform(matrix), labels, classes=np.array([0, 1]))
+        self.trained_samples += len(labels)
+
+    def predict_proba(self, matrix):
+        """Probability of success for each row of a feature matrix."""
+        if len(matrix) == 0:
+            return np.zeros(0)
+        return self.classifier.predict_proba(self.scaler.transform(matrix))[:, 1]
+
+
+class ModelStore:
+    """Versioned model artifacts on disk, with a LATEST pointer file."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def path_for(self, version: int) -> Path:
+        return self.directory / f"success_model_v{version}.joblib"
+
+    def latest_version(self) -> Optional[int]:
+        """Version named by the LATEST pointer, if any."""
+        try:
+            return int((self.directory / "LATEST").read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def load(self, version: int, mmap: bool = True) -> SuccessModel:
+        """Load a model version; memory-mapped (read-only arrays) for serving."""
+        return joblib.load(self.path_for(version), mmap_mode="r" if mmap else None)
+
+    def save(self, model: SuccessModel) -> int:
+        """Save a model as the next version and atomically point LATEST at it."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        model.version = (self.latest_version() or 0) + 1
+
+        path = self.path_for(model.version)
+        tmp_path = path.with_suffix(".tmp")
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+
+        pointer = self.directory / "LATEST.tmp"
+        pointer.write_text(str(model.version))
+        os.replace(pointer, self.directory / "LATEST")
+        return model.version
+
+
+def train_success_model(db: Session, store: ModelStore, full: bool = False,
+                        chunk_size: int = 1000) -> Optional[SuccessModel]:
+    """
+    Train on requirements with an outcome (completed/cancelled).
+    Unless `full`, the latest model is updated with outcomes modified since it was trained.
+    Returns the saved model, or None if there was nothing new to learn.
+    """
+    if not SKLEARN_AVAILABLE:
+        raise ImportError("scikit-learn, joblib and NumPy are required for training. "
+                          "Install with: pip install scikit-learn numpy")
+
+    latest = None if full else store.latest_version()
+    model = store.load(latest, mmap=False) if latest else SuccessModel()
+    if model.feature_columns != FEATURE_COLUMNS:
+        model = SuccessModel()
+
+    # Database clock, minus a second of overlap because timestamps have second resolution
+    started_at = db.scalar(select(func.now())) - timedelta(seconds=1)
+
+    trained_before = model.trained_samples
+    for batch in FeatureExtractor.iter_batches(
+        db, chunk_size=chunk_size, status=list(OUTCOME_LABELS), modified_since=model.trained_until
+    ):
+        labels = np.array([OUTCOME_LABELS[status] for status in batch.statuses])
+        model.partial_fit(batch.matrix, labels)
+
+    if model.trained_samples == trained_before:
+        return None
+
+    model.trained_until = started_at
+    store.save(model)
+    return model
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of the serving model.
+    The model is loaded once and re-checked every MODEL_RELOAD_SECONDS, so a
+    newer version saved by any process is hot-swapped in without a restart.
+    """
+
+    def __init__(self, model_dir: str, reload_seconds: int):
+        self.store = ModelStore(model_dir)
+        self.reload_seconds = reload_seconds
+        self._model: Optional[SuccessModel] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._retrain_thread: Optional[threading.Thread] = None
+        self.last_error: Optional[str] = None
+
+    def get(self) -> Optional[SuccessModel]:
+        """Current serving model, or None if no model has been trained."""
+        if not SKLEARN_AVAILABLE:
+            return None
+        if self._checked_at is None or time.monotonic() - self._checked_at >= self.reload_seconds:
+            self.reload()
+        return self._model
+
+    def reload(self) -> None:
+        """Swap in the latest version from disk if it differs from the cached one."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = self.store.latest_version()
+            if version is None or (self._model is not None and self._model.version == version):
+                return
+            model = self.store.load(version)
+            self._model = model if model.feature_columns == FEATURE_COLUMNS else None
+
+    def swap(self, model: SuccessModel) -> None:
+        """Serve a freshly trained model immediately."""
+        with self._lock:
+            self._model = model
+            self._checked_at = time.monotonic()
+
+    def trigger_retrain(self, session_factory: Callable[[], Session], full: bool = False) -> bool:
+        """Retrain in a background thread and hot-swap the result. Returns False if already running."""
+        with self._lock:
+            if self._retrain_thread is not None and self._retrain_thread.is_alive():
+                return False
+            self._retrain_thread = threading.Thread(
+                target=self._retrain, args=(session_factory, full), name="model-retrain", daemon=True
+            )
+            self._retrain_thread.start()
+            return True
+
+    def _retrain(self, session_factory: Callable[[], Session], full: bool) -> None:
+        db = session_factory()
+        try:
+            model = train_success_model(db, self.store, full=full)
+            if model is not None:
+                self.swap(model)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+        finally:
+            db.close()
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the serving model and any running retrain."""
+        model = self.get()
+        return {
+            "available": model is not None,
+            "version": model.version if model else None,
+            "trained_samples": model.trained_samples if model else 0,
+            "trained_until": model.trained_until.isoformat() if model and model.trained_until else None,
+            "retraining": self._retrain_thread is not None and self._retrain_thread.is_alive(),
+            "last_error": self.last_error,
+        }
+
+
+model_registry = ModelRegistry(settings.MODEL_DIR, settings.MODEL_RELOAD_SECONDS)
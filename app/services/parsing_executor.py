@@ -0,0 +1,187 @@
+"""
+Process pool for CPU-bound document parsing.
+Each task runs in a separate worker process with a timeout and a memory
+cap; a worker that hangs, crashes or runs out of memory is killed and
+replaced without affecting other tasks.
+"""
+import logging
+import multiprocessing
+import threading
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Callable, List, Optional
+
+# Optional import - memory caps are only enforced on Unix
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+    resource = None
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ParsingError(Exception):
+    """Raised when a task fails in (or takes down) its worker process."""
+
+
+class ParsingTimeoutError(ParsingError):
+    """Raised when a task exceeds its timeout (its worker is killed)."""
+
+
+class ParsingMemoryError(ParsingError):
+    """Raised when a task exceeds the worker memory cap (its worker is killed)."""
+
+
+def _worker_main(conn, memory_limit: int) -> None:
+    """Worker process loop: run (function, args) tasks received over `conn` until told to stop."""
+    if memory_limit and RESOURCE_AVAILABLE:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        func, args = task
+        try:
+            reply = ("ok", func(*args))
+        except MemoryError:
+            reply = ("memory", "Parsing exceeded the memory limit")
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send(("error", f"Result could not be returned: {e}"))
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, memory_limit: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def call(self, func: Callable, args: tuple, timeout: Optional[float]) -> Any:
+        """Run a task (blocking), raising ParsingError if it fails."""
+        self.tasks += 1
+        try:
+            self.conn.send((func, args))
+            if not self.conn.poll(timeout):
+                raise ParsingTimeoutError(f"Parsing timed out after {timeout} seconds")
+            status, value = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            raise ParsingError(f"Parser process exited unexpectedly (exit code {self.process.exitcode})")
+        if status == "memory":
+            raise ParsingMemoryError(value)
+        if status == "error":
+            raise ParsingError(value)
+        return value
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def close(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ParsingExecutor:
+    """
+    Pool of up to `workers` parser processes, started on first use.
+    Functions and arguments must be picklable (module-level functions or
+    static methods); results are returned as-is, so return plain data.
+    With `workers=0` tasks run in the threadpool instead (no isolation,
+    timeouts or memory caps).
+    """
+
+    def __init__(self, workers: int, timeout: Optional[float] = None, memory_limit_mb: int = 0,
+                 max_tasks_per_worker: int = 0, start_method: Optional[str] = None):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self.max_tasks_per_worker = max_tasks_per_worker  # Recycle workers after this many tasks (0: never)
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(max(workers, 1))
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._context = None
+
+    def call(self, func: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run `func(*args)` in a worker process (blocking). Raises ParsingError / ParsingTimeoutError."""
+        if self.workers <= 0:
+            return func(*args)
+        timeout = timeout or self.timeout
+        with self._slots:
+            worker = self._checkout()
+            try:
+                result = worker.call(func, args, timeout)
+            except ParsingError as e:
+                if isinstance(e, (ParsingTimeoutError, ParsingMemoryError)) or not worker.process.is_alive():
+                    logger.warning("Recycling parser process %s: %s", worker.process.pid, e)
+                    worker.kill()
+                    worker = None
+                raise
+            finally:
+                self._checkin(worker)
+            return result
+
+    async def run(self, func: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run `func(*args)` in a worker process without blocking the event loop."""
+        return await run_in_threadpool(self.call, func, *args, timeout=timeout)
+
+    def shutdown(self) -> None:
+        """Stop the idle workers; new ones are started on next use."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            if self._context is None:
+                method = self.start_method
+                if method is None:
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._context = multiprocessing.get_context(method)
+                if method == "forkserver":
+                    # Fork workers from a server that has the parser imported, rather than re-importing __main__
+                    self._context.set_forkserver_preload([__name__, "app.services.document_parser"])
+        return _Worker(self._context, self.memory_limit)
+
+    def _checkin(self, worker: Optional[_Worker]) -> None:
+        if worker is None:
+            return
+        if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+            worker.close()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+
+parsing_executor = ParsingExecutor(
+    workers=settings.PARSER_WORKERS,
+    timeout=settings.PARSER_TIMEOUT_SECONDS,
+    memory_limit_mb=settings.PARSER_MEMORY_LIMIT_MB,
+    max_tasks_per_worker=settings.PARSER_MAX_TASKS_PER_WORKER,
+)
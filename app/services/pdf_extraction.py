@@ -0,0 +1,78 @@
+"""
+Page-by-page PDF text extraction.
+Pages are yielded in order as they are extracted, either in-process or as
+page ranges spread across the parser processes.
+"""
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+import PyPDF2
+from app.core.config import settings
+
+
+@dataclass
+class PdfPage:
+    """Text of one PDF page and how long extracting it took."""
+    number: int  # 1-based
+    text: str
+    seconds: float
+
+
+def count_pages(file_path: str) -> int:
+    """Number of pages in a PDF."""
+    return len(PyPDF2.PdfReader(file_path).pages)
+
+
+def extract_pages(file_path: str, start: int, stop: int) -> List[Tuple[int, str, float]]:
+    """(number, text, seconds) of pages `start` to `stop` - 1 (0-based); a parser task."""
+    reader = PyPDF2.PdfReader(file_path)
+    return [_extract_page(reader, index) for index in range(start, stop)]
+
+
+def _extract_page(reader: PyPDF2.PdfReader, index: int) -> Tuple[int, str, float]:
+    started = time.perf_counter()
+    text = reader.pages[index].extract_text() or ""
+    return index + 1, text, time.perf_counter() - started
+
+
+def iter_pdf_pages(file_path: str, max_pages: Optional[int] = None, executor=None,
+                   pages_per_task: Optional[int] = None) -> Iterator[PdfPage]:
+    """
+    Yield the pages of a PDF in order, up to `max_pages` (None or 0: all).
+    Without an executor pages are extracted here, one at a time. With a
+    ParsingExecutor, ranges of `pages_per_task` pages run in its processes,
+    as many at once as it has workers. Closing the iterator early (e.g.
+    breaking out of a loop over it) cancels the ranges not yet started.
+    """
+    if executor is None:
+        reader = PyPDF2.PdfReader(file_path)
+        total = len(reader.pages)
+        for index in range(min(total, max_pages) if max_pages else total):
+            yield PdfPage(*_extract_page(reader, index))
+        return
+
+    total = executor.call(count_pages, file_path)
+    if max_pages:
+        total = min(total, max_pages)
+    step = pages_per_task or settings.PDF_PAGES_PER_TASK
+    ranges = ((start, min(start + step, total)) for start in range(0, total, step))
+    pool = ThreadPoolExecutor(max_workers=max(executor.workers, 1))
+
+    def submit(page_range: Tuple[int, int]):
+        return pool.submit(executor.call, extract_pages, file_path, *page_range)
+
+    try:
+        # Two ranges in flight per worker: results arrive in order without extracting far ahead
+        pending = deque(submit(page_range) for page_range in islice(ranges, max(executor.workers, 1) * 2))
+        while pending:
+            pages = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append(submit(next_range))
+            for page in pages:
+                yield PdfPage(*page)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
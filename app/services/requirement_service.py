@@ -2,17 +2,23 @@
 Service layer for requirement business logic.
 """
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from app.repositories.requirement_repository import (
     RequirementRepository,
     SubRequirementRepository,
     ChecklistItemRepository,
+    LoadSpec,
 )
+from app.repositories.search_repository import SearchRepository
+from app.services.analytics_engine import AnalyticsEngine, RequirementSnapshot
+from app.models.requirement import RequirementStatus
+from app.core.config import settings
 from app.schemas.requirement import (
     RequirementCreate,
     RequirementUpdate,
     SubRequirementCreate,
     ChecklistItemCreate,
+    RequirementTreeCreate,
 )
 
 
@@ -22,22 +28,71 @@ class RequirementService:
     @staticmethod
     def create_requirement(db: Session, requirement: RequirementCreate, owner_id: Optional[int] = None):
         """Create a requirement with validation."""
-        return RequirementRepository.create(db, requirement, owner_id)
+        db_requirement = RequirementRepository.create(db, requirement, owner_id)
+        AnalyticsEngine.refresh_validation(db, db_requirement)
+        return db_requirement
     
     @staticmethod
-    def get_requirement(db: Session, requirement_id: int):
-        """Get a requirement by ID."""
-        return RequirementRepository.get(db, requirement_id)
+    def bulk_create_requirements(db: Session, requirements: List[RequirementCreate],
+                                 owner_id: Optional[int] = None, chunk_size: int = 500) -> List[int]:
+        """
+        Create many requirements in one transaction.
+        Validation records and quality scores are computed in memory before the
+        insert, so nothing is re-read or re-committed per row. Returns the new IDs.
+        """
+        rows = []
+        validations = []
+        for requirement in requirements:
+            values = requirement.dict()
+            values.update(owner_id=owner_id, status=RequirementStatus.DRAFT)
+            snapshot = RequirementSnapshot(
+                id=0,
+                quality_score=None,
+                **{field: values[field] for field in RequirementSnapshot.__dataclass_fields__
+                   if field in values},
+            )
+            record = AnalyticsEngine.build_validation_record(snapshot)
+            values["quality_score"] = record["quality_score"]
+            rows.append(values)
+            validations.append(record)
+        
+        return RequirementRepository.bulk_create(db, rows, validations, chunk_size)
+    
+    @staticmethod
+    def get_requirement(db: Session, requirement_id: int, load: LoadSpec = None):
+        """Get a requirement by ID (see RequirementRepository.LOAD_OPTIONS for `load`)."""
+        return RequirementRepository.get(db, requirement_id, load)
+    
+    @staticmethod
+    def get_requirement_response(db: Session, requirement_id: int):
+        """Get a requirement's API response, served from the response cache when fresh."""
+        return RequirementRepository.get_response(db, requirement_id)
+    
+    @staticmethod
+    def get_all_requirements(db: Session, skip: int = 0, limit: int = 100, load: LoadSpec = None):
+        """Get all requirements (offset pagination)."""
+        return RequirementRepository.get_all(db, skip, limit, load)
     
     @staticmethod
-    def get_all_requirements(db: Session, skip: int = 0, limit: int = 100):
-        """Get all requirements."""
-        return RequirementRepository.get_all(db, skip, limit)
+    def get_requirements_page(db: Session, cursor: Optional[str] = None, limit: int = 100,
+                              load: LoadSpec = None):
+        """Get a page of requirements and the cursor of the next page."""
+        return RequirementRepository.get_page(db, cursor, limit, load)
+    
+    @staticmethod
+    def search_requirements(db: Session, query: str, limit: int = 20, offset: int = 0,
+                            project_name: Optional[str] = None,
+                            status: Optional[RequirementStatus] = None):
+        """Full-text search; returns (total matches, page of ranked hits)."""
+        return SearchRepository.search(db, query, limit, offset, project_name, status)
     
     @staticmethod
     def update_requirement(db: Session, requirement_id: int, requirement_update: RequirementUpdate):
         """Update a requirement."""
-        return RequirementRepository.update(db, requirement_id, requirement_update)
+        db_requirement = RequirementRepository.update(db, requirement_id, requirement_update)
+        if db_requirement:
+            AnalyticsEngine.refresh_validation(db, db_requirement)
+        return db_requirement
     
     @staticmethod
     def delete_requirement(db: Session, requirement_id: int) -> bool:
@@ -52,12 +107,104 @@ class RequirementService:
         if not parent:
             return None
         
-        return SubRequirementRepository.create(db, sub_requirement.dict(), requirement_id)
+        db_sub = SubRequirementRepository.create(db, sub_requirement.dict(), requirement_id)
+        AnalyticsEngine.refresh_validation(db, parent)
+        return db_sub
     
     @staticmethod
-    def get_sub_requirements(db: Session, requirement_id: int) -> List:
+    def create_requirement_tree(db: Session, requirement_id: int, tree: RequirementTreeCreate,
+                                chunk_size: int = 500) -> Optional[dict]:
+        """
+        Create nested sub-requirements and checklist items in one transaction,
+        with a single parent check and one re-validation at the end.
+        """
+        parent = RequirementRepository.get(db, requirement_id)
+        if not parent:
+            return None
+        
+        try:
+            result = SubRequirementRepository.create_tree(
+                db, requirement_id, tree.sub_requirements, tree.checklist_items, chunk_size
+            )
+            AnalyticsEngine.refresh_validation(db, parent)
+        except Exception:
+            db.rollback()
+            raise
+        result["requirement_id"] = requirement_id
+        return result
+    
+    @staticmethod
+    def get_requirement_tree(db: Session, requirement_id: int,
+                             depth: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        A requirement's whole hierarchy: nested sub-requirements with their
+        checklist items and per-node roll-up counts. Levels below `depth` are
+        left out of `children` but still counted in the roll-ups.
+        Returns None if the requirement does not exist.
+        """
+        header = RequirementRepository.get(db, requirement_id, load=["title", "status"])
+        if not header:
+            return None
+        
+        nodes = {}
+        items = []
+        for row in SubRequirementRepository.get_tree_rows(db, requirement_id, settings.TREE_MAX_DEPTH):
+            if row.kind == "sub_requirement":
+                nodes[row.id] = {**row._asdict(), "checklist_items": [], "children": []}
+            else:
+                items.append(row)
+        
+        tree = {
+            "requirement_id": requirement_id,
+            "title": header.title,
+            "status": header.status,
+            "depth": depth,
+            "checklist_items": [],
+            "sub_requirements": [],
+        }
+        for item in items:
+            owner = nodes.get(item.parent_id, tree)
+            owner["checklist_items"].append({
+                "id": item.id,
+                "requirement_id": item.requirement_id,
+                "sub_requirement_id": item.parent_id,
+                "title": item.title,
+                "description": item.description,
+                "is_completed": item.is_completed,
+                "order": item.order,
+                "created_at": item.created_at,
+                "updated_at": item.updated_at,
+            })
+        for node in nodes.values():
+            parent = nodes.get(node["parent_id"], tree)
+            parent["children" if parent is not tree else "sub_requirements"].append(node)
+        
+        display_order = lambda child: (child["order"], child["id"])
+        
+        def finish(node: Dict[str, Any], children: List[Dict[str, Any]]) -> Dict[str, int]:
+            # Sort and roll up bottom-up, then cut the children off below the requested depth
+            node["checklist_items"].sort(key=display_order)
+            children.sort(key=display_order)
+            rollup = {
+                "sub_requirements": len(children),
+                "checklist_items": len(node["checklist_items"]),
+                "checklist_items_completed": sum(item["is_completed"] for item in node["checklist_items"]),
+            }
+            for child in children:
+                for key, count in finish(child, child["children"]).items():
+                    rollup[key] += count
+                if depth is not None and child["depth"] >= depth:
+                    child["children"] = []
+            node["rollup"] = rollup
+            return rollup
+        
+        finish(tree, tree["sub_requirements"])
+        return tree
+    
+    @staticmethod
+    def get_sub_requirements(db: Session, requirement_id: int, load: Optional[str] = None) -> List:
         """Get all sub-requirements for a requirement."""
-        return SubRequirementRepository.get_by_requirement(db, requirement_id)
+        return SubRequirementRepository.get_by_requirement(db, requirement_id, load)
     
     @staticmethod
     def update_sub_requirement(db: Session, sub_requirement_id: int, sub_requirement_update: dict):
@@ -67,7 +214,14 @@ class RequirementService:
     @staticmethod
     def delete_sub_requirement(db: Session, sub_requirement_id: int) -> bool:
         """Delete a sub-requirement."""
-        return SubRequirementRepository.delete(db, sub_requirement_id)
+        db_sub = SubRequirementRepository.get(db, sub_requirement_id)
+        if not db_sub:
+            return False
+        
+        requirement_id = db_sub.requirement_id
+        SubRequirementRepository.delete(db, sub_requirement_id)
+        RequirementService._refresh_parent_validation(db, requirement_id)
+        return True
     
     @staticmethod
     def create_checklist_item(db: Session, requirement_id: Optional[int], 
@@ -88,12 +242,14 @@ class RequirementService:
         else:
             return None
         
-        return ChecklistItemRepository.create(
+        db_item = ChecklistItemRepository.create(
             db, 
             checklist_item.dict(exclude={"sub_requirement_id"}), 
             requirement_id, 
             sub_req_id
         )
+        RequirementService._refresh_parent_validation(db, requirement_id)
+        return db_item
     
     @staticmethod
     def get_checklist_items(db: Session, requirement_id: Optional[int] = None, 
@@ -113,6 +269,22 @@ class RequirementService:
     @staticmethod
     def delete_checklist_item(db: Session, checklist_item_id: int) -> bool:
         """Delete a checklist item."""
-        return ChecklistItemRepository.delete(db, checklist_item_id)
+        db_item = ChecklistItemRepository.get(db, checklist_item_id)
+        if not db_item:
+            return False
+        
+        requirement_id = db_item.requirement_id
+        ChecklistItemRepository.delete(db, checklist_item_id)
+        RequirementService._refresh_parent_validation(db, requirement_id)
+        return True
+    
+    @staticmethod
+    def _refresh_parent_validation(db: Session, requirement_id: Optional[int]) -> None:
+        """Re-validate a requirement after its children changed."""
+        if not requirement_id:
+            return
+        requirement = RequirementRepository.get(db, requirement_id)
+        if requirement:
+            AnalyticsEngine.refresh_validation(db, requirement)
 
 
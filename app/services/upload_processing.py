@@ -0,0 +1,185 @@
+"""
+Turning stored uploads into requirements (document parsing and image OCR).
+Used inline by the upload endpoints and by background jobs.
+"""
+import logging
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.models.attachment import Attachment
+from app.repositories.blob_repository import BlobRepository, ProcessingResultRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.requirement_repository import RequirementRepository
+from app.schemas.requirement import RequirementCreate
+from app.services.analytics_engine import AnalyticsEngine
+from app.services.document_parser import DocumentParser
+from app.services.image_processor import ImageProcessor
+from app.services.parsing_executor import parsing_executor
+from app.services.upload_storage import StoredUpload
+
+logger = logging.getLogger(__name__)
+
+
+def upload_payload(stored: StoredUpload, project_name: str, business_owner: str) -> Dict[str, Any]:
+    """JSON-serializable description of a stored upload and its form fields (job payload)."""
+    return {
+        "path": str(stored.path),
+        "filename": stored.filename,
+        "size": stored.size,
+        "sha256": stored.sha256,
+        "content_type": stored.content_type,
+        "project_name": project_name,
+        "business_owner": business_owner,
+    }
+
+
+def stored_upload(payload: Dict[str, Any]) -> StoredUpload:
+    """The stored upload described by a job payload."""
+    return StoredUpload(
+        path=Path(payload["path"]),
+        filename=payload["filename"],
+        size=payload["size"],
+        sha256=payload["sha256"],
+        content_type=payload.get("content_type"),
+    )
+
+
+# OCR outcomes that depend only on the image (others, e.g. a missing Tesseract, are retried next time)
+CACHEABLE_OCR_STATUSES = {"processed", "no_text_detected"}
+
+
+async def cached_result(db: AsyncSession, stored: StoredUpload, processor: str, version: str,
+                        compute: Callable[[], Awaitable[Any]],
+                        cacheable: Callable[[Any], bool] = lambda result: True) -> Any:
+    """A processor's result for the upload's content: from the cache, else computed and cached."""
+    result = await db.run_sync(ProcessingResultRepository.get, stored.sha256, processor, version)
+    if result is None:
+        result = await compute()
+        if cacheable(result):
+            await db.run_sync(ProcessingResultRepository.save, stored.sha256, processor, version, result)
+    return result
+
+
+def upload_extension(stored: StoredUpload) -> str:
+    """File type of an upload, from its client filename (blobs have no extension)."""
+    return Path(stored.filename).suffix.lower()
+
+
+def parse_upload(path: str, extension: str) -> Dict[str, Any]:
+    """Parse a stored document in the parser processes (blocking); PDF pages are spread across them."""
+    if extension == ".pdf":
+        return DocumentParser.parse_pdf(path, executor=parsing_executor)
+    return parsing_executor.call(DocumentParser.parse_document, path, extension)
+
+
+async def parse_stored(stored: StoredUpload) -> Dict[str, Any]:
+    """Parse a stored document; PDF page timings are logged rather than returned (they are not cacheable)."""
+    parsed_data = await run_in_threadpool(parse_upload, str(stored.path), upload_extension(stored))
+    timings = parsed_data.pop("page_timings", None)
+    if timings:
+        slowest = max(timings, key=lambda timing: timing["seconds"])
+        logger.info(
+            "Extracted %d PDF pages of %s in %.2fs (slowest: page %d, %.2fs)",
+            len(timings), stored.sha256, sum(timing["seconds"] for timing in timings),
+            slowest["page"], slowest["seconds"],
+        )
+    return parsed_data
+
+
+def new_attachment(db: Session, stored: StoredUpload, requirement_id: int, **fields: Any) -> Attachment:
+    """Attachment of a stored upload to a requirement (added to the session, not committed)."""
+    attachment = Attachment(
+        requirement_id=requirement_id,
+        filename=stored.filename,
+        file_path=str(stored.path),
+        file_type=upload_extension(stored)[1:],  # Remove dot
+        file_size=stored.size,
+        mime_type=stored.content_type,
+        content_hash=stored.sha256,
+        **fields
+    )
+    db.add(attachment)
+    return attachment
+
+
+def create_upload_requirement(db: Session, requirement: RequirementCreate, stored: StoredUpload,
+                              job_id: Optional[int], **attachment_fields: Any):
+    """
+    Create a requirement with the upload attached in one transaction, which
+    also records it as the job's result (so a retried job does not create it
+    again), then store its validation. Returned with its response relationships loaded.
+    """
+    BlobRepository.ensure(db, stored.sha256, str(stored.path), stored.size)
+    db_requirement = RequirementRepository.create(db, requirement, commit=False)
+    new_attachment(db, stored, db_requirement.id, **attachment_fields)
+    if job_id is not None:
+        JobRepository.set_requirement(db, job_id, db_requirement.id)
+    db.commit()
+    AnalyticsEngine.refresh_validation(db, db_requirement)
+    return RequirementRepository.get(db, db_requirement.id, load="response", refresh=True)
+
+
+async def ingest_document(db: AsyncSession, stored: StoredUpload, project_name: str, business_owner: str,
+                          job_id: Optional[int] = None):
+    """
+    Parse a stored document into a new requirement with the file attached
+    (recorded on the job `job_id`, if given).
+    Content parsed before (by the same parser version and PDF settings) is not parsed again.
+    Raises ValueError if the document cannot be parsed (the unreferenced
+    file is left to garbage collection).
+    """
+    try:
+        parsed_data = await cached_result(
+            db, stored, f"document_parser{upload_extension(stored)}", DocumentParser.parser_version(),
+            lambda: parse_stored(stored),
+        )
+        requirement_data = DocumentParser.map_to_requirement_create(
+            parsed_data, project_name, business_owner
+        )
+    except Exception as e:
+        raise ValueError(f"Error parsing document: {str(e)}") from e
+
+    requirement_create = RequirementCreate(**requirement_data)
+    return await db.run_sync(
+        create_upload_requirement, requirement_create, stored, job_id,
+        is_image="False", processing_status="processed"
+    )
+
+
+async def ingest_image(db: AsyncSession, stored: StoredUpload, project_name: str, business_owner: str,
+                       job_id: Optional[int] = None):
+    """
+    OCR a stored image into a new requirement with the image attached (also
+    when OCR fails), recorded on the job `job_id`, if given.
+    Content recognized before (by the same OCR version) is not processed again.
+    """
+    ocr_version = await run_in_threadpool(ImageProcessor.ocr_version)  # Asks Tesseract once per process
+    processing_result = await cached_result(
+        db, stored, "ocr", ocr_version,
+        lambda: run_in_threadpool(ImageProcessor.process_image_upload, str(stored.path)),
+        lambda result: result.get("processing_status") in CACHEABLE_OCR_STATUSES,
+    )
+    extracted_text = processing_result.get("extracted_text", "")
+    processing_status = processing_result.get("processing_status", "unknown")
+
+    if not extracted_text:
+        # Still create requirement but with note about OCR failure
+        description = f"[OCR processing failed: {processing_status}] Please review the uploaded image manually."
+    else:
+        description = f"Extracted from image via OCR:\n\n{extracted_text}"
+
+    requirement_data = {
+        "project_name": project_name,
+        "business_owner": business_owner,
+        "title": extracted_text[:100] if extracted_text else "Requirement from Image",
+        "description": description,
+        "category": "image_import",
+    }
+
+    requirement_create = RequirementCreate(**requirement_data)
+    return await db.run_sync(
+        create_upload_requirement, requirement_create, stored, job_id,
+        is_image="True", extracted_text=extracted_text, processing_status=processing_status
+    )
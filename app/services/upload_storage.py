@@ -0,0 +1,156 @@
+"""
+Streaming, content-addressed storage for uploaded files.
+Files are stored once per SHA-256 as `<upload dir>/blobs/<first 2 hex digits>/<sha256>`.
+"""
+import hashlib
+import os
+import time
+import uuid
+import aiofiles
+import aiofiles.os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.repositories.blob_repository import BlobRepository
+from app.repositories.job_repository import JobRepository
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the size limit (nothing is kept on disk)."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds the maximum upload size of {max_size} bytes")
+        self.max_size = max_size
+
+
+BLOB_DIR = "blobs"
+
+
+@dataclass
+class StoredUpload:
+    """An uploaded file in the blob store."""
+    path: Path
+    filename: str  # Client filename, without any directory part
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+    deduplicated: bool = False  # The content was already stored
+
+
+def safe_filename(filename: Optional[str]) -> str:
+    """Client filename reduced to its last path component."""
+    name = Path((filename or "").replace("\\", "/")).name
+    return name or "upload"
+
+
+def blob_directory(directory: Path, sha256: str) -> Path:
+    """Directory of the blobs whose hash starts like `sha256`."""
+    return directory / BLOB_DIR / sha256[:2]
+
+
+def blob_path(directory: Path, sha256: str) -> Path:
+    """Where the file with this content is stored (without an extension: one file serves every upload name)."""
+    return blob_directory(directory, sha256) / sha256
+
+
+def touch_blob(path: Path) -> bool:
+    """Mark a stored file as recently used, so garbage collection leaves it alone for a grace period (blocking)."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False  # Never stored, or collected meanwhile
+    return True
+
+
+async def store_upload(file: UploadFile, directory: Path, max_size: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> StoredUpload:
+    """
+    Stream an upload into the blob store under `directory`.
+    Chunks are written asynchronously to a temporary file and hashed on the
+    way. New content is then renamed into place, so readers never see a
+    partial file; content that is already stored is reused and the
+    temporary file removed.
+    Raises UploadTooLargeError as soon as more than `max_size` bytes are read.
+    """
+    max_size = settings.MAX_UPLOAD_SIZE if max_size is None else max_size
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLargeError(max_size)
+
+    filename = safe_filename(file.filename)
+    temp_path = directory / f".{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "xb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                await out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        path = blob_path(directory, sha256)
+        deduplicated = await run_in_threadpool(touch_blob, path)
+        if deduplicated:
+            await aiofiles.os.remove(temp_path)
+        else:
+            await aiofiles.os.makedirs(path.parent, exist_ok=True)
+            await aiofiles.os.replace(temp_path, path)
+    except BaseException:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
+        raise
+
+    return StoredUpload(
+        path=path,
+        filename=filename,
+        size=size,
+        sha256=sha256,
+        content_type=file.content_type,
+        deduplicated=deduplicated,
+    )
+
+
+def collect_garbage(db: Session, directory: Path, grace_seconds: float) -> Dict[str, int]:
+    """
+    Delete stored files no attachment references (blocking).
+    Reference counts are recomputed first. Blobs needed by unfinished jobs,
+    and files touched within the grace period (uploads in progress), are
+    kept. Blob files without a row and abandoned temporary files are
+    removed too.
+    """
+    BlobRepository.recount(db)
+    cutoff = time.time() - grace_seconds
+    in_use = {job.payload.get("sha256") for job in JobRepository.get_unfinished(db)}
+
+    def expired(path: Path) -> bool:
+        try:
+            return path.stat().st_mtime < cutoff
+        except FileNotFoundError:
+            return False
+
+    blobs_removed = 0
+    for blob in BlobRepository.get_unreferenced(db):
+        path = Path(blob.path)
+        if blob.sha256 in in_use or (path.exists() and not expired(path)):
+            continue
+        path.unlink(missing_ok=True)
+        BlobRepository.delete(db, blob)
+        blobs_removed += 1
+
+    # Files that never got a row (failed parses, interrupted requests)
+    keep = BlobRepository.get_hashes(db) | in_use
+    files_removed = 0
+    for path in [*(directory / BLOB_DIR).glob("*/*"), *directory.glob(".*.part")]:
+        if path.name[:64] not in keep and expired(path):
+            path.unlink(missing_ok=True)
+            files_removed += 1
+
+    return {"blobs_removed": blobs_removed, "files_removed": files_removed}
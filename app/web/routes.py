@@ -4,11 +4,13 @@ Web UI routes for forms and views.
 from fastapi import APIRouter, Request, Depends, Form, File, UploadFile
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
-from app.core.database import get_db
-from app.services.requirement_service import RequirementService
+from app.core.database import get_async_db
+from app.services.async_requirement_service import AsyncRequirementService
+from app.repositories.requirement_repository import ChecklistItemRepository
 from app.services.document_parser import DocumentParser
 from app.services.image_processor import ImageProcessor
 from app.schemas.requirement import RequirementCreate, SubRequirementCreate, ChecklistItemCreate
@@ -19,10 +21,20 @@ templates = Jinja2Templates(directory="app/templates")
 
 
 @web_router.get("/", response_class=HTMLResponse)
-async def home(request: Request, db: Session = Depends(get_db)):
+async def home(request: Request, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """Home page with list of requirements."""
-    requirements = RequirementService.get_all_requirements(db, skip=0, limit=50)
-    return templates.TemplateResponse("home.html", {"request": request, "requirements": requirements})
+    try:
+        requirements, next_cursor = await AsyncRequirementService.get_requirements_page(
+            db, cursor, limit=50, load="summary"
+        )
+    except ValueError:
+        return RedirectResponse(url="/", status_code=303)
+    return templates.TemplateResponse("home.html", {
+        "request": request,
+        "requirements": requirements,
+        "next_cursor": next_cursor,
+        "is_first_page": not cursor,
+    })
 
 
 @web_router.get("/requirements/new", response_class=HTMLResponse)
@@ -50,7 +62,7 @@ async def create_requirement(
     dependencies: Optional[str] = Form(None),
     desired_deadline: Optional[str] = Form(None),
     category: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new requirement from form submission."""
     deadline = None
@@ -75,37 +87,36 @@ async def create_requirement(
         category=category
     )
     
-    requirement = RequirementService.create_requirement(db, requirement_data)
+    requirement = await AsyncRequirementService.create_requirement(db, requirement_data, load="flat")
     
     # Redirect to requirement detail page
     return RedirectResponse(url=f"/requirements/{requirement.id}", status_code=303)
 
 
 @web_router.get("/requirements/{requirement_id}", response_class=HTMLResponse)
-async def view_requirement(request: Request, requirement_id: int, db: Session = Depends(get_db)):
+async def view_requirement(request: Request, requirement_id: int, db: AsyncSession = Depends(get_async_db)):
     """View a requirement detail page."""
-    requirement = RequirementService.get_requirement(db, requirement_id)
+    # Cached response: the requirement with its sub-requirements and checklist items
+    requirement = await AsyncRequirementService.get_requirement_response(db, requirement_id)
     if not requirement:
         return templates.TemplateResponse("error.html", {
             "request": request,
             "error": "Requirement not found"
         }, status_code=404)
     
-    sub_requirements = RequirementService.get_sub_requirements(db, requirement_id)
-    checklist_items = RequirementService.get_checklist_items(db, requirement_id=requirement_id)
-    
+    display_order = lambda child: (child.order, child.id)
     return templates.TemplateResponse("requirement_detail.html", {
         "request": request,
         "requirement": requirement,
-        "sub_requirements": sub_requirements,
-        "checklist_items": checklist_items
+        "sub_requirements": sorted(requirement.sub_requirements, key=display_order),
+        "checklist_items": sorted(requirement.checklist_items, key=display_order)
     })
 
 
 @web_router.get("/requirements/{requirement_id}/sub-requirements/new", response_class=HTMLResponse)
-async def new_sub_requirement_form(request: Request, requirement_id: int, db: Session = Depends(get_db)):
+async def new_sub_requirement_form(request: Request, requirement_id: int, db: AsyncSession = Depends(get_async_db)):
     """Form to create a new sub-requirement."""
-    requirement = RequirementService.get_requirement(db, requirement_id)
+    requirement = await AsyncRequirementService.get_requirement_response(db, requirement_id)
     if not requirement:
         return templates.TemplateResponse("error.html", {
             "request": request,
@@ -127,7 +138,7 @@ async def create_sub_requirement(
     description: Optional[str] = Form(None),
     priority: str = Form(...),
     order: int = Form(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new sub-requirement from form."""
     sub_req_data = SubRequirementCreate(
@@ -137,7 +148,7 @@ async def create_sub_requirement(
         order=order
     )
     
-    result = RequirementService.create_sub_requirement(db, requirement_id, sub_req_data)
+    result = await AsyncRequirementService.create_sub_requirement(db, requirement_id, sub_req_data)
     if not result:
         return templates.TemplateResponse("error.html", {
             "request": request,
@@ -154,7 +165,7 @@ async def create_checklist_item(
     title: str = Form(...),
     description: Optional[str] = Form(None),
     order: int = Form(0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new checklist item."""
     checklist_data = ChecklistItemCreate(
@@ -163,7 +174,7 @@ async def create_checklist_item(
         order=order
     )
     
-    result = RequirementService.create_checklist_item(db, requirement_id, checklist_data)
+    result = await AsyncRequirementService.create_checklist_item(db, requirement_id, checklist_data)
     if not result:
         return templates.TemplateResponse("error.html", {
             "request": request,
@@ -173,24 +184,30 @@ async def create_checklist_item(
     return RedirectResponse(url=f"/requirements/{requirement_id}", status_code=303)
 
 
+def toggle_item(db: Session, checklist_item_id: int):
+    """Flip a checklist item's completion. Returns (found, owning requirement ID)."""
+    item = ChecklistItemRepository.get(db, checklist_item_id)
+    if not item:
+        return False, None
+    
+    ChecklistItemRepository.update(db, checklist_item_id, {"is_completed": not item.is_completed})
+    return True, item.requirement_id or (item.sub_requirement.requirement_id if item.sub_requirement else None)
+
+
 @web_router.post("/checklist/{checklist_item_id}/toggle", response_class=HTMLResponse)
 async def toggle_checklist_item(
     request: Request,
     checklist_item_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toggle checklist item completion status."""
-    from app.repositories.requirement_repository import ChecklistItemRepository
-    item = ChecklistItemRepository.get(db, checklist_item_id)
-    if not item:
+    found, requirement_id = await db.run_sync(toggle_item, checklist_item_id)
+    if not found:
         return templates.TemplateResponse("error.html", {
             "request": request,
             "error": "Checklist item not found"
         }, status_code=404)
     
-    ChecklistItemRepository.update(db, checklist_item_id, {"is_completed": not item.is_completed})
-    
-    requirement_id = item.requirement_id or (item.sub_requirement.requirement_id if item.sub_requirement else None)
     if requirement_id:
         return RedirectResponse(url=f"/requirements/{requirement_id}", status_code=303)
     return RedirectResponse(url="/", status_code=303)
@@ -203,10 +220,10 @@ async def upload_form(request: Request):
 
 
 @web_router.get("/analytics", response_class=HTMLResponse)
-async def analytics_dashboard(request: Request, db: Session = Depends(get_db)):
+async def analytics_dashboard(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Analytics dashboard."""
     from app.services.analytics_engine import AnalyticsEngine
-    stats = AnalyticsEngine.get_summary_stats(db)
+    stats = await db.run_sync(AnalyticsEngine.get_summary_stats)
     return templates.TemplateResponse("analytics.html", {
         "request": request,
         "stats": stats
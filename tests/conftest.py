@@ -3,24 +3,36 @@ Pytest configuration and fixtures.
 """
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_async_db, configure_engine
 from app.main import app
+from app.repositories.requirement_repository import requirement_cache
+from app.services.bulk_validation import revalidation_runner
+from app.services.job_queue import job_queue
 from app.models.requirement import Priority
 from app.schemas.requirement import RequirementCreate
 
 
 # Test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = configure_engine(create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}))
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database, for the async API and web handlers
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+configure_engine(async_engine.sync_engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db():
     """Create a test database session."""
     Base.metadata.create_all(bind=engine)
+    requirement_cache.clear()  # IDs are reused across tests
     db = TestingSessionLocal()
     try:
         yield db
@@ -38,7 +50,14 @@ def client(db):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    job_queue.session_factory = TestingAsyncSessionLocal  # Background workers use the test database
+    revalidation_runner.session_factory = TestingSessionLocal
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
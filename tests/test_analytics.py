@@ -58,3 +58,424 @@ def test_analytics_summary(db, sample_requirement_data):
     assert "by_status" in stats
 
 
+
+
+def test_analytics_summary_aggregates(db, sample_requirement_data):
+    """Test summary statistics are aggregated in SQL with children and scores."""
+    from app.services.requirement_service import RequirementService
+    from app.schemas.requirement import SubRequirementCreate, ChecklistItemCreate
+    
+    first = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    data = sample_requirement_data.copy()
+    data["priority"] = Priority.HIGH
+    data["category"] = None
+    second = RequirementService.create_requirement(db, RequirementCreate(**data))
+    
+    RequirementService.create_sub_requirement(db, first.id, SubRequirementCreate(title="Sub 1"))
+    RequirementService.create_sub_requirement(db, first.id, SubRequirementCreate(title="Sub 2"))
+    RequirementService.create_checklist_item(db, second.id, ChecklistItemCreate(title="Item 1"))
+    
+    from app.repositories.requirement_repository import RequirementRepository
+    RequirementRepository.set_quality_score(db, first, 80)
+    RequirementRepository.set_quality_score(db, second, 60)
+    
+    stats = AnalyticsEngine.get_summary_stats(db)
+    assert stats["total_requirements"] == 2
+    assert stats["by_priority"] == {"medium": 1, "high": 1}
+    assert stats["by_status"] == {"draft": 2}
+    assert stats["by_category"] == {"testing": 1, "uncategorized": 1}
+    assert stats["average_sub_requirements"] == 1.0
+    assert stats["average_checklist_items"] == 0.5
+    assert stats["average_quality_score"] == 70.0
+    assert stats == AnalyticsEngine.compute_summary_stats(db)
+
+
+def test_analytics_summary_incremental_maintenance(db, sample_requirement_data):
+    """Test the materialized summary stays in sync across writes and can be rebuilt."""
+    from app.services.requirement_service import RequirementService
+    from app.schemas.requirement import RequirementUpdate, SubRequirementCreate, ChecklistItemCreate
+    from app.repositories.analytics_repository import AnalyticsSummaryRepository
+    from app.models.analytics import AnalyticsSummary
+    
+    first = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    second = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    sub = RequirementService.create_sub_requirement(db, first.id, SubRequirementCreate(title="Sub"))
+    item = RequirementService.create_checklist_item(db, first.id, ChecklistItemCreate(title="Item"))
+    RequirementService.create_checklist_item(db, None, ChecklistItemCreate(title="Sub item"), sub.id)
+    
+    RequirementService.update_requirement(
+        db, first.id, RequirementUpdate(status=RequirementStatus.APPROVED, category="ops")
+    )
+    assert AnalyticsSummaryRepository.check_drift(db) == []
+    
+    RequirementService.delete_checklist_item(db, item.id)
+    RequirementService.delete_sub_requirement(db, sub.id)
+    RequirementService.delete_requirement(db, second.id)
+    assert AnalyticsSummaryRepository.check_drift(db) == []
+    
+    stats = AnalyticsEngine.get_summary_stats(db)
+    assert stats["total_requirements"] == 1
+    assert stats["by_status"] == {"approved": 1}
+    assert stats["by_category"] == {"ops": 1}
+    
+    # Corrupt a counter, detect the drift and rebuild
+    row = db.get(AnalyticsSummary, ("total", "all"))
+    row.requirement_count = 42
+    db.commit()
+    assert AnalyticsSummaryRepository.check_drift(db)
+    AnalyticsSummaryRepository.rebuild(db)
+    assert AnalyticsSummaryRepository.check_drift(db) == []
+
+
+def test_analytics_summary_concurrent_adjustments(db):
+    """Test counter adjustments from overlapping sessions add up instead of overwriting each other."""
+    from app.models.analytics import AnalyticsSummary
+    from app.repositories.analytics_repository import AnalyticsSummaryRepository
+    from tests.conftest import TestingSessionLocal
+    
+    buckets = {"total": "all"}
+    AnalyticsSummaryRepository.adjust(db, buckets, requirement_count=1)
+    db.commit()
+    
+    first, second = TestingSessionLocal(), TestingSessionLocal()
+    try:
+        # Both sessions have read the row before either writes
+        assert first.get(AnalyticsSummary, ("total", "all")).requirement_count == 1
+        assert second.get(AnalyticsSummary, ("total", "all")).requirement_count == 1
+        for session in (first, second):
+            AnalyticsSummaryRepository.adjust(session, buckets, requirement_count=1)
+            session.commit()
+    finally:
+        first.close()
+        second.close()
+    
+    db.expire_all()
+    assert db.get(AnalyticsSummary, ("total", "all")).requirement_count == 3
+
+
+def test_clarity_rule_single_pass_matches():
+    """Test the clarity rule reports each ambiguous term with field and offset."""
+    from app.services.analytics_engine import ClarityRule
+    from app.services.ambiguity_matcher import AmbiguityMatcher, DEFAULT_AMBIGUOUS_TERMS
+    
+    req = Requirement(
+        title="Improve search ASAP",
+        description="Make the search faster for many users, as soon as possible.",
+    )
+    result = ClarityRule.validate(req)
+    
+    terms = [(m["term"], m["field"], m["offset"]) for m in result["matches"]]
+    assert ("improve", "title", 0) in terms
+    assert ("asap", "title", 15) in terms
+    assert ("faster", "description", 16) in terms
+    assert ("asap", "description", 39) in terms
+    # Overlapping terms are reported too, as the per-term searches did
+    assert ("soon", "description", 42) in terms
+    assert len(result["warnings"]) == 5  # improve, asap, faster, many, soon
+    
+    matcher = AmbiguityMatcher(DEFAULT_AMBIGUOUS_TERMS)
+    matcher.add_plain_terms(["user friendly"])
+    matches = matcher.find("A user  friendly UI", "description")
+    assert [(m.term, m.offset) for m in matches] == [("user friendly", 2)]
+    
+    matcher.add_plain_terms(["user"])
+    matches = matcher.find("A user  friendly UI", "description")
+    assert [(m.term, m.offset) for m in matches] == [("user friendly", 2), ("user", 2)]
+
+
+def test_bulk_revalidation(db, sample_requirement_data, tmp_path):
+    """Test bulk rescoring matches per-requirement validation and can resume."""
+    from app.services.requirement_service import RequirementService
+    from app.services.bulk_validation import BulkRevalidator, RevalidationFilters
+    from app.repositories.analytics_repository import AnalyticsSummaryRepository
+    
+    created = []
+    for i in range(5):
+        data = sample_requirement_data.copy()
+        data["project_name"] = "Alpha" if i % 2 == 0 else "Beta"
+        created.append(RequirementService.create_requirement(db, RequirementCreate(**data)))
+    
+    # Simulate scores that are out of date after a rule change
+    from app.repositories.requirement_repository import RequirementRepository
+    for requirement in created:
+        RequirementRepository.set_quality_score(db, requirement, 0)
+    
+    checkpoint = tmp_path / "revalidate.json"
+    progress = BulkRevalidator(db, chunk_size=2, checkpoint_path=str(checkpoint)).run(
+        RevalidationFilters(project_name="Alpha")
+    )
+    assert progress.total == 3
+    assert progress.processed == 3
+    assert progress.finished
+    
+    db.expire_all()
+    for requirement in created:
+        if requirement.project_name == "Alpha":
+            expected = AnalyticsEngine.validate_requirement(requirement)["quality_score"]
+            assert requirement.quality_score == expected
+        else:
+            assert requirement.quality_score == 0
+    assert AnalyticsSummaryRepository.check_drift(db) == []
+    
+    # A finished checkpoint is a no-op on resume
+    resumed = BulkRevalidator(db, chunk_size=2, checkpoint_path=str(checkpoint)).run(
+        RevalidationFilters(project_name="Alpha"), resume=True
+    )
+    assert resumed.finished and resumed.processed == 3
+    
+    # Scoring in worker processes gives the same scores for the whole corpus
+    progress = BulkRevalidator(db, chunk_size=2, workers=2).run()
+    assert progress.processed == 5
+    assert progress.updated == 2
+
+
+def test_revalidation_endpoint_runs_in_background(client, db, sample_requirement_data, tmp_path, monkeypatch):
+    """Test the re-validation endpoint returns 202 at once and reports progress until done."""
+    import time
+    from app.repositories.requirement_repository import RequirementRepository
+    from app.services.bulk_validation import revalidation_runner
+    from app.services.requirement_service import RequirementService
+    
+    monkeypatch.setattr(revalidation_runner, "checkpoint_path", str(tmp_path / "revalidate.json"))
+    created = [RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+               for _ in range(3)]
+    for requirement in created:
+        RequirementRepository.set_quality_score(db, requirement, 0)
+    
+    response = client.post("/api/v1/analytics/revalidate", json={"chunk_size": 2, "workers": 0})
+    assert response.status_code == 202
+    run = response.json()
+    assert response.headers["location"] == f"/api/v1/analytics/revalidate/{run['id']}"
+    
+    deadline = time.monotonic() + 10
+    while run["status"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.02)
+        run = client.get(f"/api/v1/analytics/revalidate/{run['id']}").json()
+    assert (run["status"], run["finished"], run["processed"], run["percent"]) == ("done", True, 3, 100.0)
+    assert (tmp_path / "revalidate.json").exists()
+    
+    db.expire_all()
+    expected = AnalyticsEngine.validate_requirement(created[0])["quality_score"]
+    assert [requirement.quality_score for requirement in created] == [expected] * 3
+    assert client.get("/api/v1/analytics/revalidate/9999").status_code == 404
+
+
+def test_validation_stored_on_write(client, db, sample_requirement_data):
+    """Test validation runs on write and suggestion reads are pure lookups."""
+    from app.models.requirement import RequirementValidation
+    
+    response = client.post("/api/v1/requirements/", json=sample_requirement_data)
+    requirement_id = response.json()["id"]
+    assert response.json()["quality_score"] is not None
+    
+    stored = db.get(RequirementValidation, requirement_id)
+    assert stored is not None
+    initial_hash = stored.content_hash
+    
+    response = client.get(f"/api/v1/analytics/suggestions/{requirement_id}")
+    assert response.status_code == 200
+    assert response.json()["quality_score"] == stored.quality_score
+    assert "Add checklist items to track progress" in response.json()["suggestions"]
+    
+    # Adding a child re-validates and changes the stored hash
+    client.post(f"/api/v1/requirements/{requirement_id}/checklist", json={"title": "Item"})
+    db.expire_all()
+    stored = db.get(RequirementValidation, requirement_id)
+    assert stored.content_hash != initial_hash
+    assert stored.result["checklist_item_count"] == 1
+    
+    response = client.get(f"/api/v1/analytics/suggestions/{requirement_id}")
+    assert "Add checklist items to track progress" not in response.json()["suggestions"]
+
+
+def test_analysis_context_and_rule_registry():
+    """Test rules evaluate against a shared context built without a session."""
+    from datetime import datetime, timedelta
+    from app.services.analytics_engine import (
+        AnalysisContext, RequirementSnapshot, ValidationRule, DeadlineRule,
+    )
+    
+    reference_time = datetime(2030, 1, 1)
+    snapshot = RequirementSnapshot(
+        id=1, project_name="P", title="  Export reports  ", description="Allow exporting many reports to CSV.",
+        priority=Priority.MEDIUM, status=RequirementStatus.DRAFT, category=None,
+        expected_outcome=None, success_criteria=None, constraints=None,
+        desired_deadline=reference_time + timedelta(days=3), quality_score=None,
+        sub_requirement_count=2, checklist_item_count=0,
+    )
+    context = AnalysisContext.build(snapshot, reference_time=reference_time)
+    assert context.title == "Export reports"
+    assert context.title_length == 14
+    assert "csv" in context.tokens
+    assert DeadlineRule.evaluate(context)["warnings"]
+    
+    class NoCsvRule(ValidationRule):
+        @staticmethod
+        def evaluate(context):
+            warnings = ["Mention the CSV schema"] if "csv" in context.tokens else []
+            return {"valid": True, "warnings": warnings, "errors": []}
+    
+    AnalyticsEngine.register_rule(NoCsvRule)
+    try:
+        result = AnalyticsEngine.validate_requirement(context)
+    finally:
+        AnalyticsEngine.VALIDATION_RULES.remove(NoCsvRule)
+    
+    assert "Mention the CSV schema" in result["warnings"]
+    assert result["sub_requirement_count"] == 2
+
+
+def test_content_hash_tracks_ambiguous_terms(monkeypatch):
+    """Test changing the ambiguous term list changes validation content hashes."""
+    from app.services.analytics_engine import AnalysisContext, ClarityRule, RequirementSnapshot
+    from app.services.ambiguity_matcher import AmbiguityMatcher, DEFAULT_AMBIGUOUS_TERMS
+    
+    snapshot = RequirementSnapshot(
+        id=1, project_name="P", title="Export reports", description="Allow exporting reports to CSV.",
+        priority=Priority.MEDIUM, status=RequirementStatus.DRAFT, category=None,
+        expected_outcome=None, success_criteria=None, constraints=None,
+        desired_deadline=None, quality_score=None, sub_requirement_count=0, checklist_item_count=0,
+    )
+    before = AnalysisContext.build(snapshot).content_hash
+    assert AnalysisContext.build(snapshot).content_hash == before
+    
+    matcher = AmbiguityMatcher(DEFAULT_AMBIGUOUS_TERMS)
+    matcher.add_plain_terms(["reports"])
+    monkeypatch.setattr(ClarityRule, "matcher", matcher)
+    assert AnalysisContext.build(snapshot).content_hash != before
+
+
+def test_batch_feature_extraction_matches_single(db, sample_requirement_data):
+    """Test batch feature extraction matches the per-requirement dict API."""
+    from app.services.analytics_engine import MLEngine
+    from app.core.query_counter import count_queries
+    from app.services.feature_extraction import FeatureExtractor, FEATURE_COLUMNS
+    from app.services.requirement_service import RequirementService
+    from app.schemas.requirement import SubRequirementCreate
+    
+    created = []
+    for i in range(5):
+        data = sample_requirement_data.copy()
+        data["priority"] = [Priority.HIGH, Priority.MEDIUM, Priority.LOW][i % 3]
+        data["success_criteria"] = None if i % 2 else "Measured"
+        created.append(RequirementService.create_requirement(db, RequirementCreate(**data)))
+    RequirementService.create_sub_requirement(db, created[0].id, SubRequirementCreate(title="Sub"))
+    db.expire_all()
+    
+    batch = MLEngine.extract_feature_matrix(db, chunk_size=2)
+    assert batch.matrix.shape == (5, len(FEATURE_COLUMNS))
+    assert list(batch.ids) == [r.id for r in created]
+    
+    for row, requirement in zip(batch.matrix, created):
+        with count_queries() as counter:
+            single = MLEngine.extract_features(db, requirement)
+        assert counter.count == 1  # Children are counted in SQL, not lazy-loaded
+        assert list(single) == FEATURE_COLUMNS
+        assert list(row) == [single[column] for column in FEATURE_COLUMNS]
+        assert FeatureExtractor.extract_one(requirement) == single
+    
+    subset = FeatureExtractor.extract(db, requirement_ids=[created[3].id, created[1].id])
+    assert list(subset.ids) == [created[1].id, created[3].id]
+
+
+def test_incremental_model_training_and_serving(db, sample_requirement_data, tmp_path, monkeypatch):
+    """Test model training is incremental, versioned and served from the registry."""
+    from app.services import analytics_engine
+    from app.services.analytics_engine import MLEngine
+    from app.core.query_counter import count_queries
+    from app.services.ml_model import ModelRegistry
+    from app.services.requirement_service import RequirementService
+    from app.schemas.requirement import RequirementUpdate
+    from app.models.requirement import RequirementStatus
+    
+    registry = ModelRegistry(str(tmp_path), reload_seconds=0)
+    monkeypatch.setattr(analytics_engine, "model_registry", registry)
+    
+    created = []
+    for i in range(6):
+        data = sample_requirement_data.copy()
+        data["success_criteria"] = None if i % 2 else "Measured"
+        created.append(RequirementService.create_requirement(db, RequirementCreate(**data)))
+    
+    # No model yet: heuristic fallback
+    assert MLEngine.predict_success_probability(db, created[0]) == created[0].quality_score / 100.0
+    assert MLEngine.train_model(db)["trained"] is False
+    
+    for i, requirement in enumerate(created[:4]):
+        outcome = RequirementStatus.CANCELLED if i % 2 else RequirementStatus.COMPLETED
+        RequirementService.update_requirement(db, requirement.id, RequirementUpdate(status=outcome))
+    
+    result = MLEngine.train_model(db)
+    assert result["trained"] is True
+    assert result["version"] == 1
+    assert result["trained_samples"] == 4
+    
+    batch = MLEngine.extract_feature_matrix(db)
+    probabilities = MLEngine.predict_batch(batch)
+    assert probabilities.shape == (6,)
+    assert all(0.0 <= p <= 1.0 for p in probabilities)
+    db.refresh(created[0])
+    with count_queries() as counter:
+        assert MLEngine.predict_success_probability(db, created[0]) == pytest.approx(probabilities[0])
+    assert counter.count == 1
+    
+    # New outcome: incremental run updates the saved model into a new version
+    RequirementService.update_requirement(db, created[4].id, RequirementUpdate(status=RequirementStatus.COMPLETED))
+    result = MLEngine.train_model(db)
+    assert result["version"] == 2
+    assert result["trained_samples"] > 4
+    
+    # Full retrain starts over; other processes pick the new version up from disk
+    result = MLEngine.train_model(db, full=True)
+    assert result["version"] == 3
+    assert result["trained_samples"] == 5
+    fresh = ModelRegistry(str(tmp_path), reload_seconds=0)
+    assert fresh.status()["version"] == 3
+
+
+def test_batch_prediction_endpoint(client, db, sample_requirement_data):
+    """Test batch success-probability prediction by IDs, filters and as NDJSON."""
+    import json
+    from app.services.requirement_service import RequirementService
+    
+    created = []
+    for i in range(4):
+        data = sample_requirement_data.copy()
+        data["project_name"] = "Alpha" if i < 3 else "Beta"
+        created.append(RequirementService.create_requirement(db, RequirementCreate(**data)))
+    
+    response = client.post("/api/v1/analytics/predict", json={"project_name": "Alpha"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 3
+    assert set(body["predictions"]) == {str(r.id) for r in created[:3]}
+    assert all(0.0 <= p <= 1.0 for p in body["predictions"].values())
+    
+    response = client.post("/api/v1/analytics/predict", json={"requirement_ids": [created[3].id, 9999]})
+    assert list(response.json()["predictions"]) == [str(created[3].id)]
+    
+    response = client.post(
+        "/api/v1/analytics/predict", json={}, headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [r.id for r in created]
+
+
+def test_query_count_guard_counts_streamed_bodies(client, db, sample_requirement_data, monkeypatch, caplog):
+    """Test statements run while an NDJSON body is streamed count towards the request's budget."""
+    import logging
+    from app.core.config import settings
+    from app.services.requirement_service import RequirementService
+    
+    RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    monkeypatch.setattr(settings, "QUERY_COUNT_WARNING", 0)
+    
+    with caplog.at_level(logging.WARNING, logger="app.main"):
+        response = client.post(
+            "/api/v1/analytics/predict", json={}, headers={"Accept": "application/x-ndjson"}
+        )
+    assert len(response.text.splitlines()) == 1
+    (record,) = [r for r in caplog.records if r.name == "app.main"]
+    assert record.args[:2] == ("POST", "/api/v1/analytics/predict")
+    assert record.args[2] >= 2  # The feature query of the chunk and the empty one ending the stream
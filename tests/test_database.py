@@ -0,0 +1,100 @@
+"""
+Tests for the database profile.
+"""
+from sqlalchemy import create_engine, event, text
+from app.core.database import configure_engine, sqlite_pragmas
+from app.models.requirement import Requirement
+from app.repositories.requirement_repository import (
+    RequirementRepository,
+    SubRequirementRepository,
+    ChecklistItemRepository,
+)
+from app.schemas.requirement import RequirementCreate, SubRequirementCreate, ChecklistItemCreate
+from app.services.requirement_service import RequirementService
+from tests.conftest import engine
+
+
+def test_sqlite_pragmas_applied(db):
+    """Test new connections get the WAL/pragma profile."""
+    with engine.connect() as connection:
+        pragma = lambda name: connection.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("foreign_keys") == 1
+        assert pragma("busy_timeout") == sqlite_pragmas()["busy_timeout"]
+        assert pragma("cache_size") == sqlite_pragmas()["cache_size"]
+
+
+def test_reads_do_not_block_on_open_write(db, tmp_path):
+    """Test a reader sees the last committed data while a write transaction is open (WAL)."""
+    writer_engine = configure_engine(create_engine(f"sqlite:///{tmp_path / 'wal.db'}"))
+    reader_engine = configure_engine(create_engine(f"sqlite:///{tmp_path / 'wal.db'}"))
+    with writer_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO items (id) VALUES (1)"))
+    
+    with writer_engine.connect() as writer:
+        writer.execute(text("BEGIN EXCLUSIVE"))
+        writer.execute(text("INSERT INTO items (id) VALUES (2)"))
+        with reader_engine.connect() as reader:
+            assert reader.execute(text("SELECT count(*) FROM items")).scalar() == 1
+        writer.commit()
+    
+    writer_engine.dispose()
+    reader_engine.dispose()
+
+
+def explain_repository_queries(db, run):
+    """Run `run(db)` and return (statement, query plan lines) for each SELECT it executes."""
+    executed = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            executed.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    connection = db.connection()
+    return [
+        (statement, [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+        for statement, parameters in executed
+    ]
+
+
+def test_repository_queries_use_indexes(db, sample_requirement_data):
+    """Test hot repository queries are answered from indexes (no full scans or sorts)."""
+    requirements = [
+        RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+        for _ in range(3)
+    ]
+    requirement_id = requirements[0].id
+    sub_requirement = RequirementService.create_sub_requirement(
+        db, requirement_id, SubRequirementCreate(title="Child")
+    )
+    RequirementService.create_checklist_item(db, requirement_id, ChecklistItemCreate(title="Item"))
+    RequirementService.create_checklist_item(
+        db, None, ChecklistItemCreate(title="Sub item"), sub_requirement.id
+    )
+    
+    def run(db):
+        SubRequirementRepository.get_by_requirement(db, requirement_id, load="response")
+        ChecklistItemRepository.get_by_requirement(db, requirement_id)
+        ChecklistItemRepository.get_by_sub_requirement(db, sub_requirement.id)
+        _, cursor = RequirementRepository.get_page(db, None, limit=2, load="response")
+        RequirementRepository.get_page(db, cursor, limit=2)
+        RequirementRepository.get_all(db, 0, 2)
+        SubRequirementRepository.get_tree_rows(db, requirement_id, max_depth=5)
+        for column in (Requirement.status, Requirement.priority, Requirement.category, Requirement.owner_id):
+            RequirementRepository.count_by(db, column)
+    
+    plans = explain_repository_queries(db, run)
+    assert plans
+    for statement, plan in plans:
+        for line in plan:
+            # The recursive CTE's own working table is necessarily scanned
+            assert not (line.startswith("SCAN") and "INDEX" not in line and line != "SCAN tree_nodes"), (statement, plan)
+            assert "TEMP B-TREE" not in line, (statement, plan)
@@ -50,3 +50,119 @@ def test_map_to_requirement_create():
     assert result["success_criteria"] == "All tests pass"
 
 
+
+
+def test_parsing_executor_isolates_tasks(tmp_path):
+    """Test parsing in worker processes, and that hung, crashing or oversized tasks are recycled."""
+    import time
+    from app.services.parsing_executor import (
+        ParsingExecutor, ParsingError, ParsingTimeoutError, ParsingMemoryError, RESOURCE_AVAILABLE
+    )
+    
+    document = tmp_path / "spec.txt"
+    document.write_text("Business Requirement\nCustomers can export invoices.")
+    executor = ParsingExecutor(workers=1, timeout=30, memory_limit_mb=512)
+    try:
+        assert executor.call(DocumentParser.parse_document, str(document)) == DocumentParser.parse_document(str(document))
+        first_pid = executor.call(os.getpid)
+        assert first_pid != os.getpid()
+        
+        with pytest.raises(ParsingTimeoutError):
+            executor.call(time.sleep, 30, timeout=0.5)
+        second_pid = executor.call(os.getpid)
+        assert second_pid != first_pid
+        
+        if RESOURCE_AVAILABLE:
+            with pytest.raises(ParsingMemoryError):
+                executor.call(bytearray, 2 * 1024 ** 3)
+        with pytest.raises(ParsingError, match="exited unexpectedly"):
+            executor.call(os._exit, 3)
+        
+        # Ordinary errors are reported and keep the worker
+        third_pid = executor.call(os.getpid)
+        with pytest.raises(ParsingError, match="Error extracting text"):
+            executor.call(DocumentParser.parse_document, str(tmp_path / "missing.pdf"))
+        assert executor.call(os.getpid) == third_pid
+    finally:
+        executor.shutdown()
+
+
+def write_pdf(path, pages):
+    """Write a minimal PDF with one line of text per page."""
+    count = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count)), count
+        ),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode()
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+    return str(path)
+
+
+def test_pdf_pages_stream_in_order(tmp_path):
+    """Test PDF pages are extracted in order, in-process or across parser processes, with caps and timings."""
+    from app.services.parsing_executor import ParsingExecutor
+    from app.services.pdf_extraction import iter_pdf_pages
+    
+    texts = [f"Page {n} text" for n in range(1, 8)]
+    pdf = write_pdf(tmp_path / "spec.pdf", texts)
+    
+    pages = list(iter_pdf_pages(pdf))
+    assert [(p.number, p.text.strip()) for p in pages] == list(enumerate(texts, 1))
+    assert all(p.seconds >= 0 for p in pages)
+    assert [p.number for p in iter_pdf_pages(pdf, max_pages=3)] == [1, 2, 3]
+    assert DocumentParser.extract_text_from_pdf(pdf) == "".join(f"{p.text}\n" for p in pages)
+    
+    executor = ParsingExecutor(workers=2, timeout=30)
+    try:
+        parallel = list(iter_pdf_pages(pdf, executor=executor, pages_per_task=2))
+        assert [(p.number, p.text) for p in parallel] == [(p.number, p.text) for p in pages]
+        assert [p.number for p in iter_pdf_pages(pdf, max_pages=5, executor=executor, pages_per_task=2)] == [1, 2, 3, 4, 5]
+        
+        # Stopping early leaves the executor usable
+        first = iter_pdf_pages(pdf, executor=executor, pages_per_task=1)
+        assert next(first).number == 1
+        first.close()
+        assert executor.call(os.getpid) != os.getpid()
+    finally:
+        executor.shutdown()
+    
+    parsed = DocumentParser.parse_document(pdf)
+    assert [t["page"] for t in parsed["page_timings"]] == list(range(1, 8))
+    assert "Page 7 text" in parsed["raw_text"]
+
+
+def test_parse_pdf_stops_when_sections_found(tmp_path, monkeypatch):
+    """Test PDF reading stops after the page on which the last section heading appears."""
+    from app.core.config import settings
+    
+    headings = ["Business Requirement", "In Scope", "Out of Scope", "Assumptions",
+                "Constraints", "Dependencies", "Success Metrics", "Appendix", "Glossary"]
+    pdf = write_pdf(tmp_path / "spec.pdf", headings)
+    
+    assert len(DocumentParser.parse_pdf(pdf)["page_timings"]) == 9
+    monkeypatch.setattr(settings, "PDF_STOP_WHEN_SECTIONS_FOUND", True)
+    parsed = DocumentParser.parse_pdf(pdf)
+    assert len(parsed["page_timings"]) == 7
+    assert "Appendix" not in parsed["raw_text"]
+    monkeypatch.setattr(settings, "PDF_MAX_PAGES", 2)
+    assert len(DocumentParser.parse_pdf(pdf)["page_timings"]) == 2
@@ -98,3 +98,378 @@ def test_requirements_api(client, sample_requirement_data):
     assert response.status_code == 404
 
 
+
+
+def test_requirements_cursor_pagination(client, db, sample_requirement_data):
+    """Test keyset pagination walks every requirement once, newest first."""
+    created = [
+        RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data)).id
+        for _ in range(5)
+    ]
+    
+    seen = []
+    response = client.get("/api/v1/requirements/", params={"limit": 2})
+    seen += [item["id"] for item in response.json()]
+    
+    # Rows written while paging do not shift later pages
+    RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    
+    while "x-next-cursor" in response.headers:
+        response = client.get(
+            "/api/v1/requirements/", params={"limit": 2, "cursor": response.headers["x-next-cursor"]}
+        )
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+    
+    assert seen == sorted(created, reverse=True)
+    
+    # Legacy offset pagination still works
+    response = client.get("/api/v1/requirements/", params={"skip": 1, "limit": 2})
+    assert len(response.json()) == 2
+    
+    response = client.get("/api/v1/requirements/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_requirement_list_query_count_is_constant(client, db, sample_requirement_data):
+    """Test listing does not issue per-requirement or per-child queries (no N+1)."""
+    from app.schemas.requirement import SubRequirementCreate, ChecklistItemCreate
+    
+    def create_with_children(children):
+        requirement = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+        for i in range(children):
+            sub = RequirementService.create_sub_requirement(db, requirement.id, SubRequirementCreate(title=f"Sub {i}"))
+            RequirementService.create_checklist_item(db, None, ChecklistItemCreate(title="Item"), sub.id)
+            RequirementService.create_checklist_item(db, requirement.id, ChecklistItemCreate(title="Item"))
+    
+    def list_query_count():
+        db.expire_all()
+        response = client.get("/api/v1/requirements/")
+        assert response.status_code == 200
+        return int(response.headers["x-query-count"]), response.json()
+    
+    create_with_children(1)
+    small_count, _ = list_query_count()
+    
+    for _ in range(4):
+        create_with_children(3)
+    large_count, body = list_query_count()
+    
+    assert 0 < large_count == small_count
+    assert len(body) == 5
+    assert len(body[0]["sub_requirements"]) == 3
+    assert len(body[0]["sub_requirements"][0]["checklist_items"]) == 1
+
+
+def test_requirement_list_projection(client, db, sample_requirement_data):
+    """Test summary and field projections of the requirement list."""
+    from app.schemas.requirement import SubRequirementCreate
+    
+    requirement = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    RequirementService.create_sub_requirement(db, requirement.id, SubRequirementCreate(title="Sub"))
+    RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    db.expire_all()
+    
+    response = client.get("/api/v1/requirements/", params={"fields": "summary", "limit": 1})
+    assert response.status_code == 200
+    assert "x-next-cursor" in response.headers
+    item = response.json()[0]
+    assert set(item) == {
+        "id", "title", "project_name", "business_owner", "priority", "status", "quality_score", "created_at"
+    }
+    
+    response = client.get("/api/v1/requirements/", params={"fields": "title,sub_requirements"})
+    items = response.json()
+    assert set(items[1]) == {"id", "title", "sub_requirements"}
+    assert [sub["title"] for sub in items[1]["sub_requirements"]] == ["Sub"]
+    
+    response = client.get("/api/v1/requirements/", params={"fields": "title,secret"})
+    assert response.status_code == 400
+
+
+def test_bulk_create_requirements(client, db, sample_requirement_data):
+    """Test bulk creation as JSON and NDJSON, atomic and per-row error reporting."""
+    import json
+    from app.repositories.analytics_repository import AnalyticsSummaryRepository
+    from app.repositories.requirement_repository import RequirementValidationRepository
+    
+    item = {**sample_requirement_data, "priority": "high"}
+    response = client.post("/api/v1/requirements/bulk", json=[item, {**item, "title": "Second"}])
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 2
+    assert body["errors"] == []
+    
+    first = RequirementService.get_requirement(db, body["ids"][0])
+    assert first.title == item["title"]
+    assert first.quality_score is not None
+    assert RequirementValidationRepository.get(db, first.id).quality_score == first.quality_score
+    assert RequirementService.get_requirement(db, body["ids"][1]).title == "Second"
+    
+    # All-or-nothing by default: one invalid item rejects the request
+    response = client.post("/api/v1/requirements/bulk", json=[item, {"title": "Missing fields"}])
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 1
+    
+    # Per-row reporting: valid rows are created, invalid ones listed
+    lines = "\n".join([json.dumps(item), "{not json", json.dumps({"title": "x"}), json.dumps(item)])
+    response = client.post(
+        "/api/v1/requirements/bulk?atomic=false",
+        content=lines,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 2
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    
+    db.expire_all()
+    assert AnalyticsSummaryRepository.check_drift(db) == []
+
+
+def test_bulk_create_runs_off_the_event_loop(client, sample_requirement_data, monkeypatch):
+    """Test validating and scoring a bulk request does not run on the event loop thread."""
+    import asyncio
+    
+    calls = []
+    original = RequirementService.bulk_create_requirements
+    
+    def bulk_create(db, requirements, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            calls.append("event loop")
+        except RuntimeError:
+            calls.append("threadpool")
+        return original(db, requirements, **kwargs)
+    
+    monkeypatch.setattr(RequirementService, "bulk_create_requirements", staticmethod(bulk_create))
+    response = client.post("/api/v1/requirements/bulk", json=[sample_requirement_data])
+    assert response.status_code == 201
+    assert calls == ["threadpool"]
+
+
+def test_create_requirement_tree(client, db, sample_requirement_data):
+    """Test creating nested sub-requirements and checklist items in one request."""
+    from app.models.requirement import SubRequirement
+    from app.repositories.analytics_repository import AnalyticsSummaryRepository
+    from app.repositories.requirement_repository import RequirementValidationRepository
+    
+    requirement = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    tree = {
+        "checklist_items": [{"title": "Sign-off"}],
+        "sub_requirements": [
+            {
+                "title": "Backend",
+                "checklist_items": [{"title": "API"}, {"title": "DB"}],
+                "children": [{"title": "Auth", "children": [{"title": "Tokens"}]}],
+            },
+            {"title": "Frontend", "order": 1},
+        ],
+    }
+    
+    response = client.post(f"/api/v1/requirements/{requirement.id}/tree", json=tree)
+    assert response.status_code == 201
+    body = response.json()
+    assert body["sub_requirements_created"] == 4
+    assert body["checklist_items_created"] == 3
+    assert len(body["checklist_item_ids"]) == 1
+    
+    backend = body["sub_requirements"][0]
+    assert len(backend["checklist_item_ids"]) == 2
+    auth = backend["children"][0]
+    tokens = db.get(SubRequirement, auth["children"][0]["id"])
+    assert tokens.title == "Tokens"
+    assert tokens.parent_id == auth["id"]
+    assert db.get(SubRequirement, auth["id"]).parent_id == backend["id"]
+    
+    response = client.get(f"/api/v1/requirements/{requirement.id}")
+    assert len(response.json()["sub_requirements"]) == 4
+    
+    db.expire_all()
+    validation = RequirementValidationRepository.get(db, requirement.id)
+    assert validation.result["sub_requirement_count"] == 4
+    assert AnalyticsSummaryRepository.check_drift(db) == []
+    
+    response = client.post("/api/v1/requirements/9999/tree", json=tree)
+    assert response.status_code == 404
+
+
+def test_get_requirement_tree(client, db, sample_requirement_data):
+    """Test reading a nested hierarchy with roll-ups, depth limits and a fixed query count."""
+    from app.core.query_counter import count_queries
+    
+    requirement = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    url = f"/api/v1/requirements/{requirement.id}/tree"
+    created = client.post(url, json={
+        "checklist_items": [{"title": "Sign-off"}],
+        "sub_requirements": [
+            {"title": "Frontend", "order": 1},
+            {
+                "title": "Backend",
+                "checklist_items": [{"title": "DB", "order": 1}, {"title": "API"}],
+                "children": [{"title": "Auth", "children": [{"title": "Tokens", "checklist_items": [{"title": "JWT"}]}]}],
+            },
+        ],
+    }).json()
+    jwt_id = created["sub_requirements"][1]["children"][0]["children"][0]["checklist_item_ids"][0]
+    client.put(f"/api/v1/requirements/checklist/{jwt_id}", json={"is_completed": True})
+    
+    with count_queries() as counter:
+        response = client.get(url)
+    assert response.status_code == 200
+    tree = response.json()
+    assert [item["title"] for item in tree["checklist_items"]] == ["Sign-off"]
+    assert [node["title"] for node in tree["sub_requirements"]] == ["Backend", "Frontend"]
+    assert tree["rollup"] == {"sub_requirements": 4, "checklist_items": 4, "checklist_items_completed": 1}
+    
+    backend = tree["sub_requirements"][0]
+    assert [item["title"] for item in backend["checklist_items"]] == ["API", "DB"]
+    assert backend["rollup"] == {"sub_requirements": 2, "checklist_items": 3, "checklist_items_completed": 1}
+    tokens = backend["children"][0]["children"][0]
+    assert (tokens["title"], tokens["depth"]) == ("Tokens", 3)
+    assert tokens["checklist_items"][0]["is_completed"] is True
+    assert tokens["checklist_items"][0]["sub_requirement_id"] == tokens["id"]
+    
+    # Depth limits drop deeper levels but keep their counts
+    shallow = client.get(url, params={"depth": 1}).json()
+    assert shallow["depth"] == 1
+    assert shallow["sub_requirements"][0]["children"] == []
+    assert shallow["sub_requirements"][0]["rollup"] == backend["rollup"]
+    assert client.get(url, params={"depth": 0}).status_code == 422
+    
+    # One query for the requirement plus one for the whole hierarchy, however large
+    client.post(url, json={"sub_requirements": [
+        {"title": f"Node {i}", "checklist_items": [{"title": "Item"}], "children": [{"title": "Leaf"}]}
+        for i in range(20)
+    ]})
+    with count_queries() as larger:
+        assert client.get(url).json()["rollup"]["sub_requirements"] == 44
+    assert larger.count == counter.count
+    
+    assert client.get("/api/v1/requirements/9999/tree").status_code == 404
+
+
+def test_async_requirement_service(db, sample_requirement_data):
+    """Test the async service returns response-ready objects from an AsyncSession."""
+    import asyncio
+    from app.services.async_requirement_service import AsyncRequirementService
+    from app.schemas.requirement import RequirementResponse, SubRequirementCreate
+    from tests.conftest import TestingAsyncSessionLocal
+    
+    async def scenario():
+        async with TestingAsyncSessionLocal() as async_db:
+            created = await AsyncRequirementService.create_requirement(
+                async_db, RequirementCreate(**sample_requirement_data)
+            )
+            await AsyncRequirementService.create_sub_requirement(
+                async_db, created.id, SubRequirementCreate(title="Async child")
+            )
+            updated = await AsyncRequirementService.update_requirement(
+                async_db, created.id, RequirementUpdate(title="Async title")
+            )
+        # Serialized after the session is closed: relationships must already be loaded
+        return RequirementResponse.model_validate(updated)
+    
+    response = asyncio.run(scenario())
+    assert response.title == "Async title"
+    assert [sub.title for sub in response.sub_requirements] == ["Async child"]
+    assert RequirementService.get_requirement(db, response.id).title == "Async title"
+
+
+def test_search_requirements(client, db, sample_requirement_data):
+    """Test full-text search ranking, snippets, pagination and index sync."""
+    from app.models.attachment import Attachment
+    
+    def create(title, description):
+        data = {**sample_requirement_data, "title": title, "description": description}
+        return RequirementService.create_requirement(db, RequirementCreate(**data))
+    
+    in_title = create("Invoice export", "Generate monthly files for finance.")
+    in_description = create("Monthly reporting", "Include every invoice in the summary.")
+    create("Unrelated", "Nothing to see here.")
+    with_attachment = create("Scanned form", "See attachment.")
+    db.add(Attachment(
+        requirement_id=with_attachment.id, filename="scan.png", file_path="scan.png",
+        file_type="png", file_size=1, extracted_text="Warehouse barcode scanning"
+    ))
+    db.commit()
+    
+    response = client.get("/api/v1/requirements/search", params={"q": "invoice"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert [hit["id"] for hit in body["results"]] == [in_title.id, in_description.id]
+    assert "<mark>" in body["results"][0]["snippet"]
+    
+    page = client.get("/api/v1/requirements/search", params={"q": "invoice", "limit": 1, "offset": 1}).json()
+    assert [hit["id"] for hit in page["results"]] == [in_description.id]
+    
+    # Stemming, prefixes and attachment text
+    assert client.get("/api/v1/requirements/search", params={"q": "invoices"}).json()["total"] == 2
+    hits = client.get("/api/v1/requirements/search", params={"q": "barc*"}).json()["results"]
+    assert [hit["id"] for hit in hits] == [with_attachment.id]
+    
+    # Updates and deletes keep the index in sync
+    RequirementService.update_requirement(db, in_title.id, RequirementUpdate(title="Payment export"))
+    RequirementService.delete_requirement(db, in_description.id)
+    assert client.get("/api/v1/requirements/search", params={"q": "invoice"}).json()["total"] == 0
+    assert client.get("/api/v1/requirements/search", params={"q": "payment"}).json()["total"] == 1
+    
+    # Operators and punctuation are matched literally instead of failing
+    assert client.get("/api/v1/requirements/search", params={"q": 'AND "('}).status_code == 200
+    assert client.get("/api/v1/requirements/search", params={"q": "*"}).status_code == 400
+
+
+def test_requirement_response_cache(client, db, sample_requirement_data):
+    """Test requirement reads are cached and invalidated by parent and child writes."""
+    from app.core.query_counter import count_queries
+    from app.repositories.requirement_repository import requirement_cache
+    
+    requirement = RequirementService.create_requirement(db, RequirementCreate(**sample_requirement_data))
+    url = f"/api/v1/requirements/{requirement.id}"
+    assert client.get(url).status_code == 200
+    with count_queries() as counter:
+        assert client.get(url).status_code == 200
+    assert counter.count == 0
+    assert requirement_cache.stats()["hits"] == 1
+    
+    # A checklist item on a sub-requirement changes the parent's nested response
+    sub_requirement = client.post(f"{url}/sub-requirements", json={"title": "Child"}).json()
+    item = client.post(
+        f"/api/v1/requirements/sub-requirements/{sub_requirement['id']}/checklist", json={"title": "Step"}
+    ).json()
+    client.put(f"/api/v1/requirements/checklist/{item['id']}", json={"is_completed": True})
+    children = client.get(url).json()["sub_requirements"]
+    assert children[0]["checklist_items"][0]["is_completed"] is True
+    
+    client.put(url, json={"title": "Renamed"})
+    assert client.get(url).json()["title"] == "Renamed"
+    client.delete(url)
+    assert client.get(url).status_code == 404
+
+
+def test_ttl_cache_expiry_and_eviction():
+    """Test TTLCache expires entries after the TTL and evicts least recently used ones."""
+    from app.core.cache import TTLCache
+    
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get_or_load("a", lambda: 99) == 1
+    
+    now[0] = 11
+    assert cache.get_or_load("a", lambda: 4) == 4
+    
+    # A load that overlaps an invalidation is returned but not stored
+    def load_during_write():
+        cache.invalidate(["c"])
+        return 5
+    assert cache.get_or_load("d", load_during_write) == 5
+    assert cache.get("d") is None
+    
+    stats = cache.stats()
+    assert (stats["evictions"], stats["expirations"]) == (1, 1)
@@ -0,0 +1,295 @@
+"""
+Tests for file uploads.
+"""
+import asyncio
+import hashlib
+import time
+import pytest
+from app.api.v1 import uploads
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.models.job import Job
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Store uploads in a temporary directory."""
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path)
+    return tmp_path
+
+
+def upload_document(client, content: bytes, filename: str = "spec.txt", **fields):
+    return client.post(
+        "/api/v1/upload/document",
+        files={"file": (filename, content, "text/plain")},
+        data={"project_name": "Test Project", "business_owner": "Test Owner", **fields},
+    )
+
+
+def wait_for_job(client, job_id: int, timeout: float = 10):
+    """Poll a job's status until it finishes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish: {job}")
+
+
+def stored_files(upload_dir):
+    """Files in the blob store."""
+    return sorted(p for p in upload_dir.rglob("*") if p.is_file())
+
+
+def test_upload_document_streams_to_blob_store(client, db, upload_dir, monkeypatch):
+    """Test uploads are stored under their content hash with their size."""
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 16)
+    first = b"Business Requirement\nCustomers can export invoices as PDF files.\n"
+    second = b"Business Requirement\nAdmins can archive closed projects.\n"
+
+    assert upload_document(client, first).status_code == 201
+    assert upload_document(client, second).status_code == 201
+
+    attachments = db.query(Attachment).order_by(Attachment.id).all()
+    assert [a.filename for a in attachments] == ["spec.txt", "spec.txt"]
+    assert attachments[0].file_path != attachments[1].file_path
+    for attachment, content in zip(attachments, (first, second)):
+        assert attachment.file_size == len(content)
+        assert attachment.content_hash == hashlib.sha256(content).hexdigest()
+        with open(attachment.file_path, "rb") as f:
+            assert f.read() == content
+        assert attachment.file_path.endswith(f"/blobs/{attachment.content_hash[:2]}/{attachment.content_hash}")
+    assert len(stored_files(upload_dir)) == 2
+
+
+def test_upload_size_limit_and_filename(client, db, upload_dir, monkeypatch):
+    """Test oversized uploads are rejected without leaving files, and paths are stripped from names."""
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 64)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 16)
+
+    response = upload_document(client, b"x" * 65)
+    assert response.status_code == 413
+    assert stored_files(upload_dir) == []
+    assert db.query(Attachment).count() == 0
+
+    response = upload_document(client, b"Business Requirement\nFits the limit.", filename="../../etc/spec.txt")
+    assert response.status_code == 201
+    (stored,) = stored_files(upload_dir)
+    assert stored.parent.parent == upload_dir / "blobs"
+    assert db.query(Attachment).one().filename == "spec.txt"
+
+
+def test_store_upload_aborts_mid_stream(tmp_path):
+    """Test a stream of unknown size is cut off once it passes the limit."""
+    import io
+    from fastapi import UploadFile
+    from app.services.upload_storage import UploadTooLargeError, store_upload
+
+    class CountingStream(io.BytesIO):
+        reads = 0
+
+        def read(self, size=-1):
+            CountingStream.reads += 1
+            return super().read(size)
+
+    stream = CountingStream(b"x" * 1000)
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(store_upload(UploadFile(stream, filename="big.txt"), tmp_path, max_size=100, chunk_size=10))
+    assert CountingStream.reads == 11
+    assert stored_files(tmp_path) == []
+
+    stored = asyncio.run(store_upload(UploadFile(io.BytesIO(b"small"), filename="a.txt"), tmp_path, max_size=100))
+    assert (stored.size, stored.sha256) == (5, hashlib.sha256(b"small").hexdigest())
+    assert stored_files(tmp_path) == [stored.path]
+
+
+def test_duplicate_uploads_share_blob_and_parse(client, db, upload_dir, monkeypatch):
+    """Test identical content is stored once, parsed once and reference counted."""
+    from app.models.blob import Blob, ProcessingResult
+    from app.services import upload_processing
+
+    calls = []
+    parse_upload = upload_processing.parse_upload
+
+    def counting_parse(path, extension):
+        calls.append(path)
+        return parse_upload(path, extension)
+
+    monkeypatch.setattr(upload_processing, "parse_upload", counting_parse)
+    content = b"Business Requirement\nCustomers can export invoices as PDF files.\n"
+    first = upload_document(client, content, filename="spec.txt")
+    second = upload_document(client, content, filename="copy.txt")
+    assert (first.status_code, second.status_code) == (201, 201)
+    assert first.json()["description"] == second.json()["description"]
+
+    assert len(calls) == 1
+    assert db.query(ProcessingResult).one().processor == "document_parser.txt"
+    (stored,) = stored_files(upload_dir)
+    attachments = db.query(Attachment).order_by(Attachment.id).all()
+    assert [a.filename for a in attachments] == ["spec.txt", "copy.txt"]
+    assert {a.file_path for a in attachments} == {str(stored)}
+    assert db.query(Blob).one().ref_count == 2
+
+    # Results are keyed by the parse settings too
+    monkeypatch.setattr(settings, "PDF_MAX_PAGES", 5)
+    assert upload_document(client, content).status_code == 201
+    assert len(calls) == 2
+    assert db.query(ProcessingResult).count() == 2
+
+    # The same bytes under another extension get that extension's parser; PDF page timings are not cached
+    from app.services.document_parser import DocumentParser
+    from tests.test_document_parser import write_pdf
+    pdf = write_pdf(upload_dir / "source.pdf", ["Business Requirement", "Customers can export invoices."])
+    with open(pdf, "rb") as f:
+        pdf_content = f.read()
+    as_text = upload_document(client, pdf_content, filename="spec.txt")
+    as_pdf = upload_document(client, pdf_content, filename="spec.pdf")
+    assert (as_text.status_code, as_pdf.status_code) == (201, 201)
+    assert "endobj" in as_text.json()["description"]
+    assert "endobj" not in as_pdf.json()["description"]
+    assert "export invoices" in as_pdf.json()["description"]
+    assert db.query(Blob).filter(Blob.sha256 == hashlib.sha256(pdf_content).hexdigest()).one().ref_count == 2
+    result = db.get(ProcessingResult, (hashlib.sha256(pdf_content).hexdigest(), "document_parser.pdf",
+                                       DocumentParser.parser_version()))
+    assert "page_timings" not in result.result
+
+
+def test_garbage_collection(client, db, upload_dir):
+    """Test collection removes blobs once no attachment references them, after the grace period."""
+    from app.models.blob import Blob
+    from app.services.upload_storage import collect_garbage
+
+    kept = upload_document(client, b"Business Requirement\nKept.").json()
+    removed = upload_document(client, b"Business Requirement\nRemoved.").json()
+    (upload_dir / ".abandoned.part").write_bytes(b"partial")
+    assert client.delete(f"/api/v1/requirements/{removed['id']}").status_code == 204
+
+    # Files touched within the grace period are kept
+    assert collect_garbage(db, upload_dir, settings.UPLOAD_GC_GRACE_SECONDS) == {"blobs_removed": 0, "files_removed": 0}
+    assert len(stored_files(upload_dir)) == 3
+
+    assert collect_garbage(db, upload_dir, 0) == {"blobs_removed": 1, "files_removed": 1}
+    assert client.post("/api/v1/upload/gc").status_code in (404, 405)  # Maintenance command only
+    (stored,) = stored_files(upload_dir)
+    db.expire_all()
+    blob = db.query(Blob).one()
+    assert (blob.path, blob.ref_count) == (str(stored), 1)
+    assert db.query(Attachment).one().requirement_id == kept["id"]
+
+
+def test_background_document_upload(client, db, upload_dir):
+    """Test a queued upload returns 202 with a job that reports the created requirement."""
+    content = b"Business Requirement\nCustomers can export invoices as PDF files.\n"
+    response = upload_document(client, content, background="true", priority="high")
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["kind"], job["priority"]) == ("document", "high")
+    assert response.headers["location"] == f"/api/v1/jobs/{job['id']}"
+
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "done"
+    assert job["attempts"] == 1
+    requirement = client.get(f"/api/v1/requirements/{job['requirement_id']}").json()
+    assert "export invoices" in requirement["description"]
+    assert db.query(Attachment).one().requirement_id == job["requirement_id"]
+
+    # Parse errors are reported on the job
+    response = upload_document(client, b"\xff\xfe\x00broken", filename="spec.docx", background="true")
+    job = wait_for_job(client, response.json()["id"])
+    assert job["status"] == "failed"
+    assert job["error"].startswith("Error parsing document")
+    assert job["requirement_id"] is None
+
+    assert client.get("/api/v1/jobs/9999").status_code == 404
+
+
+def test_job_queue_priorities_bounds_and_resume(db):
+    """Test jobs run by priority, waiting jobs are bounded, and jobs resume once their lease expires."""
+    from datetime import datetime, timedelta, timezone
+    from app.models.job import JobKind, JobStatus
+    from app.models.requirement import Priority
+    from app.repositories.job_repository import JobRepository
+    from app.services.job_queue import JobQueue, JobQueueFullError
+    from tests.conftest import TestingAsyncSessionLocal
+
+    ran = []
+
+    async def handler(async_db, job):
+        ran.append(job.payload["name"])
+        return None
+
+    def make_queue():
+        return JobQueue({JobKind.DOCUMENT: handler}, {JobKind.DOCUMENT: 1}, max_queued=2,
+                        session_factory=TestingAsyncSessionLocal)
+
+    # Left behind: one queued, one running under a live lease (e.g. in another process)
+    interrupted = JobRepository.create(db, JobKind.DOCUMENT, {"name": "interrupted"}, Priority.LOW)
+    assert JobRepository.claim(db, interrupted.id).status == JobStatus.RUNNING
+    assert JobRepository.claim(db, interrupted.id) is None  # Claimed once only
+    JobRepository.create(db, JobKind.DOCUMENT, {"name": "waiting"}, Priority.MEDIUM)
+
+    async def scenario():
+        queue = make_queue()
+        await queue.start()
+        await queue.join()
+        await queue.stop()
+
+        # Without workers, submitted jobs wait in priority order up to the bound
+        queue = make_queue()
+        queue.workers = {JobKind.DOCUMENT: 0}
+        await queue.start()
+        async with TestingAsyncSessionLocal() as async_db:
+            await queue.submit(async_db, JobKind.DOCUMENT, {"name": "low"}, Priority.LOW)
+            await queue.submit(async_db, JobKind.DOCUMENT, {"name": "high"}, Priority.HIGH)
+            with pytest.raises(JobQueueFullError):
+                await queue.submit(async_db, JobKind.DOCUMENT, {"name": "rejected"})
+        await queue.stop()
+
+        # The interrupted job's lease expires: it is queued again
+        db.query(Job).filter(Job.id == interrupted.id).update(
+            {"heartbeat_at": datetime.now(timezone.utc) - timedelta(minutes=5)}
+        )
+        db.commit()
+        queue = make_queue()
+        await queue.start()
+        await queue.join()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert ran == ["waiting", "high", "interrupted", "low"]
+    db.expire_all()
+    jobs = {job.payload["name"]: job for job in db.query(Job).all()}
+    assert {job.status for job in jobs.values()} == {JobStatus.DONE}
+    assert jobs["interrupted"].attempts == 2
+
+
+def test_retried_job_does_not_duplicate_requirement(db, tmp_path):
+    """Test the requirement is recorded on its job when created, so a retried job does not create another."""
+    import io
+    from fastapi import UploadFile
+    from app.models.job import JobKind
+    from app.models.requirement import Requirement
+    from app.repositories.job_repository import JobRepository
+    from app.services.job_queue import run_document_job
+    from app.services.upload_processing import upload_payload
+    from app.services.upload_storage import store_upload
+    from tests.conftest import TestingAsyncSessionLocal
+
+    upload = UploadFile(io.BytesIO(b"Business Requirement\nCustomers can export invoices.\n"), filename="spec.txt")
+    stored = asyncio.run(store_upload(upload, tmp_path))
+    job = JobRepository.create(db, JobKind.DOCUMENT, upload_payload(stored, "Test Project", "Test Owner"))
+    JobRepository.claim(db, job.id)
+
+    async def run_job():
+        async with TestingAsyncSessionLocal() as async_db:
+            return await run_document_job(async_db, JobRepository.get(db, job.id))
+
+    # The worker dies after creating the requirement, before marking the job done
+    requirement_id = asyncio.run(run_job())
+    db.expire_all()
+    assert JobRepository.get(db, job.id).requirement_id == requirement_id
+
+    assert asyncio.run(run_job()) == requirement_id
+    assert db.query(Requirement).count() == 1
+    assert db.query(Attachment).one().requirement_id == requirement_id